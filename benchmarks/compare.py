@@ -0,0 +1,192 @@
+"""
+Benchmarks: Regression Gate
+Compara una ejecución nueva contra el baseline guardado en el repositorio
+
+Uso:
+    python -m benchmarks.compare                       # ejecutar y comparar
+    python -m benchmarks.compare --results bench.json  # comparar resultados existentes
+    python -m benchmarks.compare --update-baseline     # registrar nuevo baseline
+"""
+import os
+import sys
+import json
+import argparse
+from typing import Any, Dict, List, Optional, Tuple
+
+from .run import run_benchmarks, write_results, DEFAULT_CASE_TIMEOUT
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+DEFAULT_TOLERANCE = {
+    "throughput_drop_pct": 15.0,   # Caída máxima de páginas/s
+    "peak_rss_growth_pct": 20.0,   # Crecimiento máximo del pico de memoria
+    "min_seconds": 0.05            # Casos más rápidos son ruido: no se compara su velocidad
+}
+
+# Métricas que se guardan en el baseline por caso
+BASELINE_FIELDS = ("pages_per_sec", "mb_per_sec", "peak_rss_bytes", "seconds")
+
+
+def load_json(path: str) -> Dict[str, Any]:
+    """Leer un archivo JSON"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def get_tolerance(baseline: Dict[str, Any], name: str) -> Dict[str, float]:
+    """Banda de tolerancia de un caso (por defecto + ajustes por caso)"""
+    tolerances = baseline.get("tolerances", {})
+    tolerance = dict(DEFAULT_TOLERANCE)
+    tolerance.update(tolerances.get("default", {}))
+    tolerance.update(tolerances.get("cases", {}).get(name, {}))
+    return tolerance
+
+
+def compare_results(baseline: Dict[str, Any],
+                    current: Dict[str, Any]) -> Tuple[List[str], List[str], List[str], List[str]]:
+    """Comparar resultados; devuelve (regresiones, casos sin baseline, avisos, líneas de detalle)"""
+    regressions: List[str] = []
+    missing: List[str] = []
+    warnings: List[str] = []
+    details: List[str] = []
+
+    base_results = baseline.get("results", {})
+    current_results = current.get("results", {})
+
+    for name in sorted(set(base_results) | set(current_results)):
+        base = base_results.get(name)
+        result = current_results.get(name)
+
+        if result is None:
+            warnings.append(f"{name}: está en el baseline pero no se ejecutó")
+            continue
+        if "error" in result:
+            regressions.append(f"{name}: falló ({result['error']})")
+            continue
+        if base is None:
+            missing.append(name)
+            continue
+
+        tolerance = get_tolerance(baseline, name)
+        status = "✅"
+
+        base_rate = base.get("pages_per_sec")
+        rate = result.get("pages_per_sec")
+        rate_change = None
+        if base_rate and rate is not None:
+            rate_change = (rate - base_rate) / base_rate * 100
+            measurable = (base.get("seconds") or 0) >= tolerance["min_seconds"]
+            if measurable and rate_change < -tolerance["throughput_drop_pct"]:
+                status = "❌"
+                regressions.append(
+                    f"{name}: velocidad {rate:.2f} pág/s vs baseline {base_rate:.2f} "
+                    f"({rate_change:+.1f}%, tolerancia -{tolerance['throughput_drop_pct']:.0f}%)")
+
+        base_peak = base.get("peak_rss_bytes")
+        peak = result.get("peak_rss_bytes")
+        peak_change = None
+        if base_peak and peak is not None:
+            peak_change = (peak - base_peak) / base_peak * 100
+            if peak_change > tolerance["peak_rss_growth_pct"]:
+                status = "❌"
+                regressions.append(
+                    f"{name}: pico de memoria {peak / 2**20:.0f} MB vs baseline {base_peak / 2**20:.0f} MB "
+                    f"({peak_change:+.1f}%, tolerancia +{tolerance['peak_rss_growth_pct']:.0f}%)")
+
+        rate_text = f"{rate_change:+6.1f}%" if rate_change is not None else "   n/a"
+        peak_text = f"{peak_change:+6.1f}%" if peak_change is not None else "   n/a"
+        details.append(f"{status} {name}: velocidad {rate_text} • memoria {peak_text}")
+
+    return regressions, missing, warnings, details
+
+
+def update_baseline(baseline_path: str, current: Dict[str, Any]):
+    """Registrar los resultados actuales como nuevo baseline (conserva las tolerancias)"""
+    baseline = load_json(baseline_path) if os.path.exists(baseline_path) else {}
+
+    baseline["schema_version"] = current["schema_version"]
+    baseline["corpus"] = current["corpus"]
+    baseline["environment"] = current["environment"]
+    baseline.setdefault("tolerances", {"default": dict(DEFAULT_TOLERANCE), "cases": {}})
+    baseline["results"] = {
+        name: {field: result.get(field) for field in BASELINE_FIELDS}
+        for name, result in current["results"].items()
+        if "error" not in result
+    }
+
+    write_results(baseline, baseline_path)
+    print(f"📌 Baseline actualizado: {baseline_path} ({len(baseline['results'])} casos)")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada: 0 = sin regresiones, 1 = regresión, 2 = error de configuración"""
+    parser = argparse.ArgumentParser(description="Control de regresiones de rendimiento")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--results", help="Resultados de benchmarks.run (si no, se ejecutan ahora)")
+    parser.add_argument("--repeat", type=int, default=3, help="Ejecuciones por caso al medir")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_CASE_TIMEOUT,
+                        help="Segundos máximos por ejecución de un caso al medir")
+    parser.add_argument("--output", help="Guardar también los resultados nuevos en este archivo")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Sustituir el baseline por los resultados actuales")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.baseline) and not args.update_baseline:
+        print(f"❌ No existe el baseline: {args.baseline}")
+        return 2
+
+    baseline = load_json(args.baseline) if os.path.exists(args.baseline) else {}
+    corpus = baseline.get("corpus", {})
+
+    # Sin medidas de referencia no hay nada contra lo que comparar: no se ejecuta nada
+    if not baseline.get("results") and not args.update_baseline:
+        print("❌ El baseline no tiene resultados: ejecuta con --update-baseline en la máquina de referencia")
+        return 2
+
+    if args.results:
+        current = load_json(args.results)
+    else:
+        run_kwargs = {"repeat": max(1, args.repeat), "timeout": args.timeout}
+        if corpus.get("profile"):
+            run_kwargs["profile"] = corpus["profile"]
+        if corpus.get("seed") is not None:
+            run_kwargs["seed"] = corpus["seed"]
+        current = run_benchmarks(**run_kwargs)
+
+    if args.output:
+        write_results(current, args.output)
+
+    if args.update_baseline:
+        update_baseline(args.baseline, current)
+        return 0
+
+    if corpus and corpus != current.get("corpus"):
+        print(f"❌ El corpus no coincide con el baseline: {current.get('corpus')} vs {corpus}")
+        return 2
+
+    regressions, missing, warnings, details = compare_results(baseline, current)
+
+    print("\n".join(details))
+    for warning in warnings:
+        print(f"⚠️ {warning}")
+
+    if missing:
+        # Un caso sin referencia no puede pasar el control: el baseline está desactualizado
+        print(f"❌ {len(missing)} caso(s) sin baseline: {', '.join(missing)}")
+        print("   Actualiza el baseline con --update-baseline en la máquina de referencia")
+        return 2
+
+    if regressions:
+        print("\n" + "=" * 70)
+        print(f"❌ REGRESIÓN DE RENDIMIENTO: {len(regressions)} caso(s) fuera de tolerancia")
+        print("=" * 70)
+        for regression in regressions:
+            print(f"   • {regression}")
+        return 1
+
+    print("\n✅ Sin regresiones de rendimiento")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""
+Benchmarks: Synthetic Corpus
+Genera un corpus local y determinista para medir el rendimiento
+"""
+import io
+import os
+import json
+import random
+import hashlib
+from datetime import datetime
+from typing import Any, Dict, List
+
+from PIL import Image, ImageDraw
+
+try:
+    import fitz  # PyMuPDF
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
+try:
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.pagesizes import letter
+    REPORTLAB_AVAILABLE = True
+except ImportError:
+    REPORTLAB_AVAILABLE = False
+
+CORPUS_VERSION = 1
+DEFAULT_SEED = 20240501
+
+# Tamaños del corpus por perfil
+CORPUS_PROFILES: Dict[str, Dict[str, Any]] = {
+    "quick": {
+        "text_pages": 10,
+        "scanned_pages": 3,
+        "scan_size": (1275, 1650),      # Carta a 150 DPI
+        "photo_size": (2000, 1500),     # 3 MP
+        "long_pages": 200
+    },
+    "full": {
+        "text_pages": 100,
+        "scanned_pages": 20,
+        "scan_size": (2550, 3300),      # Carta a 300 DPI
+        "photo_size": (6000, 4000),     # 24 MP
+        "long_pages": 600
+    }
+}
+
+WORDS = ("factura cliente envío pedido total fecha cantidad producto servicio "
+         "importe referencia descripción entrega almacén proveedor unidad "
+         "documento página anexo resumen contrato firma registro").split()
+
+# Fecha fija para que los metadatos no cambien entre ejecuciones
+FIXED_DATE = datetime(2024, 1, 1)
+
+
+def _text_lines(rng: random.Random, count: int) -> List[str]:
+    """Generar líneas de texto pseudoaleatorias"""
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 12))) for _ in range(count)]
+
+
+def _write_text_pdf(path: str, pages: int, rng: random.Random):
+    """PDF de texto vectorial con encabezados en color en algunas páginas"""
+    if PYMUPDF_AVAILABLE:
+        doc = fitz.open()
+        for page_num in range(pages):
+            page = doc.new_page(width=612, height=792)
+            color = (0.8, 0.1, 0.1) if page_num % 3 == 0 else (0, 0, 0)
+            page.insert_text((72, 72), f"Documento de prueba — página {page_num + 1}",
+                             fontsize=16, color=color)
+            y = 110
+            for line in _text_lines(rng, 40):
+                page.insert_text((72, y), line, fontsize=10)
+                y += 15
+        doc.set_metadata({"producer": "benchmarks", "creationDate": "D:20240101000000",
+                          "modDate": "D:20240101000000"})
+        doc.save(path, no_new_id=True)
+        doc.close()
+    elif REPORTLAB_AVAILABLE:
+        c = canvas.Canvas(path, pagesize=letter, invariant=1)
+        for page_num in range(pages):
+            c.setFillColorRGB(0.8, 0.1, 0.1) if page_num % 3 == 0 else c.setFillColorRGB(0, 0, 0)
+            c.setFont("Helvetica", 16)
+            c.drawString(72, 720, f"Documento de prueba - pagina {page_num + 1}")
+            c.setFillColorRGB(0, 0, 0)
+            c.setFont("Helvetica", 10)
+            y = 690
+            for line in _text_lines(rng, 40):
+                c.drawString(72, y, line)
+                y -= 15
+            c.showPage()
+        c.save()
+    else:
+        raise RuntimeError("Se necesita PyMuPDF o reportlab para generar PDFs de texto")
+
+
+def _draw_scene(size, rng: random.Random, mode: str = "RGB") -> Image.Image:
+    """Dibujar una imagen sintética con degradado, formas y texto"""
+    width, height = size
+    base_color = tuple(rng.randint(180, 255) for _ in range(3))
+    image = Image.new("RGB", size, base_color)
+    draw = ImageDraw.Draw(image)
+
+    # Degradado horizontal en franjas
+    stripe = max(1, height // 64)
+    for y in range(0, height, stripe):
+        shade = int(255 * y / height)
+        draw.rectangle([0, y, width, y + stripe], fill=(shade, 255 - shade // 2, (shade * 3) % 256))
+
+    for _ in range(60):
+        x0, y0 = rng.randint(0, width), rng.randint(0, height)
+        x1, y1 = x0 + rng.randint(20, width // 4), y0 + rng.randint(20, height // 4)
+        color = tuple(rng.randint(0, 255) for _ in range(3))
+        if rng.random() < 0.5:
+            draw.ellipse([x0, y0, x1, y1], fill=color)
+        else:
+            draw.rectangle([x0, y0, x1, y1], outline=color, width=max(1, width // 400))
+
+    for line_num, line in enumerate(_text_lines(rng, 30)):
+        draw.text((width // 20, height // 20 + line_num * max(12, height // 40)), line, fill=(20, 20, 20))
+
+    return image.convert(mode)
+
+
+def _write_scanned_pdf(path: str, pages: int, size, rng: random.Random):
+    """PDF de páginas escaneadas (una imagen por página)"""
+    if PYMUPDF_AVAILABLE:
+        # Página a página, sin mantener todas las imágenes en memoria
+        doc = fitz.open()
+        for _ in range(pages):
+            buffer = io.BytesIO()
+            _draw_scene(size, rng).save(buffer, "JPEG", quality=85)
+            page = doc.new_page(width=612, height=792)
+            page.insert_image(page.rect, stream=buffer.getvalue())
+        doc.set_metadata({"producer": "benchmarks", "creationDate": "D:20240101000000",
+                          "modDate": "D:20240101000000"})
+        doc.save(path, no_new_id=True)
+        doc.close()
+        return
+
+    frames = (_draw_scene(size, rng) for _ in range(pages))
+    first = next(frames)
+    first.save(path, "PDF", resolution=150.0, save_all=True, append_images=list(frames),
+               creationDate=FIXED_DATE, modDate=FIXED_DATE)
+
+
+def _write_photo(path: str, size, rng: random.Random):
+    """Foto grande en JPEG"""
+    _draw_scene(size, rng).save(path, "JPEG", quality=90)
+
+
+def _sha256(path: str) -> str:
+    """Hash del contenido de un archivo"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def generate_corpus(directory: str, profile: str = "quick", seed: int = DEFAULT_SEED,
+                    force: bool = False) -> Dict[str, Dict[str, Any]]:
+    """Generar (o reutilizar) el corpus y devolver su manifiesto por nombre de elemento"""
+    if profile not in CORPUS_PROFILES:
+        raise ValueError(f"Perfil de corpus desconocido: {profile}")
+
+    os.makedirs(directory, exist_ok=True)
+    manifest_path = os.path.join(directory, "manifest.json")
+    spec = CORPUS_PROFILES[profile]
+
+    if not force and os.path.exists(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        same_corpus = (manifest.get("version") == CORPUS_VERSION and manifest.get("seed") == seed
+                       and manifest.get("profile") == profile)
+        if same_corpus and all(os.path.exists(item["path"]) for item in manifest["items"].values()):
+            return manifest["items"]
+
+    items = {
+        "text_pdf": {"kind": "pdf", "pages": spec["text_pages"], "file": "text.pdf"},
+        "scanned_pdf": {"kind": "pdf", "pages": spec["scanned_pages"], "file": "scanned.pdf"},
+        "long_pdf": {"kind": "pdf", "pages": spec["long_pages"], "file": "long.pdf"},
+        "large_photo": {"kind": "image", "pages": 1, "file": "photo.jpg"}
+    }
+
+    for name, item in items.items():
+        # Un generador por elemento: cada archivo es estable aunque cambie el resto
+        rng = random.Random(f"{seed}:{name}")
+        path = os.path.join(directory, item.pop("file"))
+
+        if name == "scanned_pdf":
+            _write_scanned_pdf(path, item["pages"], spec["scan_size"], rng)
+        elif name == "large_photo":
+            _write_photo(path, spec["photo_size"], rng)
+        else:
+            _write_text_pdf(path, item["pages"], rng)
+
+        item["path"] = path
+        item["bytes"] = os.path.getsize(path)
+        item["sha256"] = _sha256(path)
+        print(f"📦 Corpus: {name} ({item['pages']} pág., {item['bytes'] / 1024:.0f} KB)")
+
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump({"version": CORPUS_VERSION, "seed": seed, "profile": profile, "items": items},
+                  f, indent=2, sort_keys=True)
+
+    return items
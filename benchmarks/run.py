@@ -0,0 +1,281 @@
+"""
+Benchmarks: Runner
+Mide el rendimiento de las conversiones sobre el corpus sintético
+
+Uso:
+    python -m benchmarks.run --profile quick --output bench_results.json
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import queue as queue_module
+import multiprocessing
+from typing import Any, Dict, List, Optional
+
+from .corpus import generate_corpus, DEFAULT_SEED, CORPUS_PROFILES, CORPUS_VERSION
+
+RESULTS_SCHEMA_VERSION = 1
+
+PDF_ITEMS = ["text_pdf", "scanned_pdf", "long_pdf"]
+# El filtro sepia es píxel a píxel: el documento largo solo se mide en B&N
+SEPIA_PDF_ITEMS = ["text_pdf", "scanned_pdf"]
+MERGE_ITEMS = ["text_pdf", "scanned_pdf", "long_pdf"]
+COMBINED_ITEMS = ["text_pdf", "scanned_pdf", "large_photo"]
+
+# Tiempo máximo por ejecución de un caso antes de darlo por colgado
+DEFAULT_CASE_TIMEOUT = 900.0
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Pico de memoria residente del proceso actual"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reporta KB, macOS bytes
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        pass
+
+    try:
+        import psutil
+        return psutil.Process().memory_info().peak_wset
+    except Exception:
+        return None
+
+
+def case_id(case: Dict[str, Any]) -> str:
+    """Identificador estable de un caso"""
+    return f"{case['operation']}[{case['backend']}]/{'+'.join(case['inputs'])}"
+
+
+def build_cases(pdf_backends: List[str]) -> List[Dict[str, Any]]:
+    """Construir la lista de casos para los backends indicados"""
+    cases = []
+
+    for backend in pdf_backends:
+        for item in PDF_ITEMS:
+            cases.append({"operation": "convert_pdf_to_bw", "backend": backend, "inputs": [item]})
+        for item in SEPIA_PDF_ITEMS:
+            cases.append({"operation": "convert_pdf_to_sepia", "backend": backend, "inputs": [item]})
+
+    for operation in ("convert_image_to_bw", "convert_image_to_sepia"):
+        cases.append({"operation": operation, "backend": "pil", "inputs": ["large_photo"]})
+
+    cases.append({"operation": "merge_pdfs", "backend": "pypdf2", "inputs": MERGE_ITEMS})
+
+    for backend in pdf_backends:
+        for conversion_type in ("bw", "sepia"):
+            cases.append({"operation": f"both_operations_{conversion_type}", "backend": backend,
+                          "inputs": COMBINED_ITEMS})
+
+    return cases
+
+
+def _execute_case(case: Dict[str, Any], corpus: Dict[str, Dict[str, Any]], work_dir: str) -> float:
+    """Ejecutar un caso y devolver los segundos empleados"""
+    from src.models.converter_operations import ConverterOperations
+    from src.controllers.modular_app_controller import ModularAppController
+
+    inputs = [corpus[name]["path"] for name in case["inputs"]]
+    operation = case["operation"]
+
+    if operation.startswith("both_operations_"):
+        controller = ModularAppController()
+        controller.converter.pdf_backend = case["backend"]
+        params = {
+            "files": inputs,
+            "output_dir": work_dir,
+            "output_name": "combined.pdf",
+            "conversion_type": operation.rsplit("_", 1)[1],
+            "open_output": False
+        }
+        start = time.perf_counter()
+        controller._process_both_operations(params)
+        elapsed = time.perf_counter() - start
+        if not os.path.exists(os.path.join(work_dir, "combined.pdf")):
+            raise RuntimeError("El flujo combinado no generó salida")
+        return elapsed
+
+    converter = ConverterOperations()
+    converter.pdf_backend = case["backend"]
+
+    if operation == "merge_pdfs":
+        start = time.perf_counter()
+        success, message = converter.merge_pdfs(inputs, os.path.join(work_dir, "merged.pdf"))
+    else:
+        source = inputs[0]
+        output_path = os.path.join(work_dir, "out" + os.path.splitext(source)[1])
+        start = time.perf_counter()
+        success, message = getattr(converter, operation)(source, output_path)
+
+    elapsed = time.perf_counter() - start
+    if not success:
+        raise RuntimeError(message)
+    return elapsed
+
+
+def _case_worker(case: Dict[str, Any], corpus: Dict[str, Dict[str, Any]], work_dir: str, queue):
+    """Proceso hijo: ejecutar un caso aislado para medir su pico de memoria"""
+    # Historial de rendimiento y métricas del trabajo fuera de los datos del usuario
+    os.environ["PDF_CONVERTER_DATA_DIR"] = os.path.join(work_dir, "app_data")
+    try:
+        seconds = _execute_case(case, corpus, work_dir)
+        queue.put({"seconds": seconds, "peak_rss_bytes": peak_rss_bytes()})
+    except Exception as e:
+        queue.put({"error": f"{type(e).__name__}: {e}"})
+
+
+def _wait_for_outcome(process, queue, timeout: float) -> Dict[str, Any]:
+    """Esperar el resultado del proceso hijo sin quedarse bloqueado si muere o se cuelga"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return queue.get(timeout=1.0)
+        except queue_module.Empty:
+            pass
+
+        if not process.is_alive():
+            # El resultado puede llegar por la tubería justo después de que el hijo termine
+            try:
+                return queue.get(timeout=1.0)
+            except queue_module.Empty:
+                return {"error": f"El proceso del caso terminó sin resultado (código de salida {process.exitcode})"}
+
+        if time.monotonic() > deadline:
+            process.terminate()
+            return {"error": f"Tiempo agotado: el caso superó {timeout:.0f}s"}
+
+
+def run_case(case: Dict[str, Any], corpus: Dict[str, Dict[str, Any]], repeat: int,
+             timeout: float = DEFAULT_CASE_TIMEOUT) -> Dict[str, Any]:
+    """Ejecutar un caso varias veces (cada una en un proceso nuevo) y resumir"""
+    context = multiprocessing.get_context("spawn")
+    runs = []
+    peaks = []
+
+    for _ in range(repeat):
+        work_dir = tempfile.mkdtemp(prefix="pdf_converter_bench_")
+        try:
+            queue = context.Queue()
+            process = context.Process(target=_case_worker, args=(case, corpus, work_dir, queue))
+            process.start()
+            outcome = _wait_for_outcome(process, queue, timeout)
+            process.join(timeout=10)
+            if process.is_alive():
+                process.kill()
+                process.join()
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        if "error" in outcome:
+            return {"error": outcome["error"]}
+        runs.append(outcome["seconds"])
+        if outcome["peak_rss_bytes"] is not None:
+            peaks.append(outcome["peak_rss_bytes"])
+
+    pages = sum(corpus[name]["pages"] for name in case["inputs"])
+    bytes_in = sum(corpus[name]["bytes"] for name in case["inputs"])
+    seconds = sorted(runs)[len(runs) // 2]  # Mediana
+
+    return {
+        "operation": case["operation"],
+        "backend": case["backend"],
+        "inputs": case["inputs"],
+        "pages": pages,
+        "bytes_in": bytes_in,
+        "seconds": round(seconds, 6),
+        "runs": [round(run, 6) for run in runs],
+        "pages_per_sec": round(pages / seconds, 3) if seconds > 0 else None,
+        "mb_per_sec": round(bytes_in / (1024 * 1024) / seconds, 3) if seconds > 0 else None,
+        "peak_rss_bytes": max(peaks) if peaks else None
+    }
+
+
+def _environment() -> Dict[str, Any]:
+    """Descripción del entorno de medición"""
+    from src.models.converter_operations import ConverterOperations
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "tools": ConverterOperations().get_available_tools()
+    }
+
+
+def run_benchmarks(profile: str = "quick", seed: int = DEFAULT_SEED, corpus_dir: Optional[str] = None,
+                   repeat: int = 1, backends: Optional[List[str]] = None,
+                   name_filter: Optional[str] = None,
+                   timeout: float = DEFAULT_CASE_TIMEOUT) -> Dict[str, Any]:
+    """Generar el corpus, ejecutar todos los casos y devolver los resultados"""
+    from src.models.converter_operations import ConverterOperations
+
+    corpus_dir = corpus_dir or os.path.join(tempfile.gettempdir(), f"pdf_converter_bench_corpus_{profile}")
+    corpus = generate_corpus(corpus_dir, profile, seed)
+
+    available = ConverterOperations().get_available_pdf_backends()
+    pdf_backends = [b for b in (backends or available) if b in available]
+
+    results = {}
+    for case in build_cases(pdf_backends):
+        name = case_id(case)
+        if name_filter and name_filter not in name:
+            continue
+
+        print(f"⏱️ {name} ...", flush=True)
+        result = run_case(case, corpus, repeat, timeout)
+        results[name] = result
+
+        if "error" in result:
+            print(f"   ❌ {result['error']}")
+        else:
+            peak_mb = (result["peak_rss_bytes"] or 0) / (1024 * 1024)
+            print(f"   {result['seconds']:.3f}s • {result['pages_per_sec']} pág/s • "
+                  f"{result['mb_per_sec']} MB/s • pico {peak_mb:.0f} MB")
+
+    return {
+        "schema_version": RESULTS_SCHEMA_VERSION,
+        "corpus": {"profile": profile, "seed": seed, "version": CORPUS_VERSION},
+        "repeat": repeat,
+        "environment": _environment(),
+        "results": results
+    }
+
+
+def write_results(results: Dict[str, Any], output_path: str):
+    """Guardar resultados en JSON con formato estable"""
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Benchmarks del convertidor PDF/Imagen")
+    parser.add_argument("--profile", choices=sorted(CORPUS_PROFILES), default="quick")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--corpus-dir", default=None, help="Directorio del corpus (se reutiliza si existe)")
+    parser.add_argument("--repeat", type=int, default=1, help="Ejecuciones por caso (se reporta la mediana)")
+    parser.add_argument("--backend", action="append", dest="backends",
+                        help="Limitar a un backend de PDF (repetible)")
+    parser.add_argument("--filter", dest="name_filter", help="Ejecutar solo casos cuyo nombre contenga este texto")
+    parser.add_argument("--timeout", type=float, default=DEFAULT_CASE_TIMEOUT,
+                        help="Segundos máximos por ejecución de un caso")
+    parser.add_argument("--output", default="bench_results.json")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.profile, args.seed, args.corpus_dir, max(1, args.repeat),
+                             args.backends, args.name_filter, args.timeout)
+    write_results(results, args.output)
+    print(f"📊 Resultados guardados en: {args.output}")
+
+    return 1 if any("error" in r for r in results["results"].values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
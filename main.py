@@ -4,6 +4,8 @@ Punto de entrada principal con arquitectura MVC
 """
 import sys
 import os
+import argparse
+import multiprocessing
 import tkinter as tk
 from tkinter import messagebox
 
@@ -12,6 +14,16 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 # Verificar dependencias primero
 from src.utils.dependency_checker import DependencyChecker
+from src.utils.profiler import enable_profiling, is_profiling_enabled, PROFILE_ENV_VAR
+
+def parse_arguments():
+    """Leer opciones de línea de comandos"""
+    parser = argparse.ArgumentParser(description="Convertidor PDF/Imagen")
+    parser.add_argument("--profile", action="store_true",
+                        help=f"Perfilar cada proceso con cProfile y tracemalloc "
+                             f"(equivale a {PROFILE_ENV_VAR}=1)")
+    args, _ = parser.parse_known_args()
+    return args
 
 def check_dependencies():
     """Verificar dependencias antes de iniciar"""
@@ -39,6 +51,10 @@ def check_dependencies():
 
 def main():
     """Función principal de la aplicación"""
+    args = parse_arguments()
+    if args.profile:
+        enable_profiling()
+    
     # Verificar dependencias
     if not check_dependencies():
         sys.exit(1)
@@ -64,9 +80,11 @@ def main():
         
         # Mostrar aplicación
         print("✅ Aplicación modular iniciada correctamente!")
-        print("🎯 3 módulos disponibles: Conversión, Unión PDFs, Ambos")
+        print("🎯 4 módulos disponibles: Conversión, Unión PDFs, Ambos, División PDFs")
         print("�️ Arrastra y suelta archivos para cambiar orden")
         print("👁️ Click en vista previa para ver archivos")
+        if is_profiling_enabled():
+            print("🔬 Modo de perfilado activo: se guardarán reportes junto a cada salida")
         
         # Aplicar configuraciones guardadas
         settings = controller.get_settings()
@@ -103,4 +121,6 @@ def on_closing(root, controller):
         root.destroy()
 
 if __name__ == "__main__":
+    # Necesario para los procesos de la división de PDFs en ejecutables congelados
+    multiprocessing.freeze_support()
     main()
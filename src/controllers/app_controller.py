@@ -61,8 +61,8 @@ class AppController:
     
     def get_file_info(self, index: int) -> Optional[Dict[str, Any]]:
         """Obtener información de archivo por índice"""
-        if 0 <= index < len(self.file_manager.selected_files):
-            file_path = self.file_manager.selected_files[index]
+        if 0 <= index < len(self.file_manager.files):
+            file_path = self.file_manager.files[index].path
             return self.file_manager.get_file_info(file_path)
         return None
     
@@ -81,7 +81,7 @@ class AppController:
             return
         
         # Confirmar operación
-        count = len(self.file_manager.selected_files)
+        count = len(self.file_manager.files)
         type_name = "blanco y negro" if conversion_type == "bw" else "sepia"
         
         if self.view and not self.view.confirm_operation(
@@ -6,16 +6,27 @@ import os
 import threading
 import tempfile
 import shutil
+from contextlib import nullcontext
 from typing import List, Optional, Dict, Any
 from ..models.file_manager import FileManager
-from ..models.converter_operations import ConverterOperations
+from ..models.converter_operations import ConverterOperations, DEFAULT_RENDER_SETTINGS
+from ..models.size_planner import SizePlanner
+from ..utils.progress_tracker import ProgressTracker, ThroughputHistory
+from ..utils.instrumentation import JobMetrics
+from ..utils.profiler import profiled_workflow
+from ..utils.image_decode import get_output_profile
 
 class ModularAppController:
     def __init__(self):
         self.file_manager = FileManager()
         self.converter = ConverterOperations()
+        self.throughput_history = ThroughputHistory()
         self.view = None
         
+        # Presupuesto de memoria para renderizar páginas grandes por franjas
+        self.converter.render_memory_budget_mb = self.file_manager.settings.get(
+            "render_memory_budget_mb", self.converter.render_memory_budget_mb)
+        
         # Estado de procesamiento
         self.is_processing_flag = False
         self.current_process_thread = None
@@ -62,6 +73,7 @@ class ModularAppController:
         )
         self.current_process_thread.start()
         
+    @profiled_workflow("color_conversion")
     def _process_color_conversion(self, params: Dict[str, Any]):
         """Procesar conversión de colores en hilo separado"""
         try:
@@ -75,11 +87,16 @@ class ModularAppController:
             
             total_files = len(files)
             processed_files = []
+            metrics = self._start_job_metrics("color_conversion", params)
+            
+            # Pre-conteo de páginas para medir el progreso por página
+            with metrics.stage("count_pages"):
+                tracker = self._create_progress_tracker(files, conversion_type)
             
             for i, file_path in enumerate(files):
-                if self.view:
-                    progress = (i / total_files) * 100
-                    self.view.update_progress(progress, f"Procesando: {os.path.basename(file_path)}")
+                self._begin_file_progress(tracker, i, f"Procesando: {os.path.basename(file_path)}", 0, 100)
+                metrics.begin_file(file_path)
+                output_path, success = None, False
                 
                 try:
                     # Generar path de salida
@@ -117,6 +134,11 @@ class ModularAppController:
                                 
                 except Exception as e:
                     print(f"Error procesando {file_path}: {e}")
+                finally:
+                    tracker.end_file()
+                    metrics.end_file(output_path, success)
+            
+            tracker.finish()
                     
             # Proceso completado
             if self.view:
@@ -140,6 +162,8 @@ class ModularAppController:
             if self.view:
                 self.view.show_completion_message("Error", f"Error durante la conversión:\\n{str(e)}", True)
         finally:
+            self.converter.page_callback = None
+            self._finish_job_metrics()
             self.is_processing_flag = False
             
     # ==================== MÓDULO DE UNIÓN DE PDFs ====================
@@ -182,6 +206,7 @@ class ModularAppController:
         )
         self.current_process_thread.start()
         
+    @profiled_workflow("pdf_merge")
     def _process_pdf_merge(self, params: Dict[str, Any]):
         """Procesar unión de PDFs en hilo separado"""
         try:
@@ -193,14 +218,23 @@ class ModularAppController:
             delete_originals = params.get("delete_originals", False)
             open_output = params.get("open_output", True)
             
+            metrics = self._start_job_metrics("pdf_merge", params)
+            
             if self.view:
                 self.view.update_progress(20, "Iniciando unión de PDFs...")
             
             # Crear archivo de salida
             output_path = os.path.join(output_dir, output_name)
             
-            # Unir PDFs
-            success = self.converter.merge_pdfs(files, output_path)
+            # Unir PDFs (en volúmenes si hay límites)
+            max_pages, max_bytes = self._volume_limits(params)
+            with metrics.stage("merge"):
+                success, merge_message = self.converter.merge_pdfs(files, output_path, max_pages, max_bytes)
+            if not success:
+                print(merge_message)
+            outputs = self.converter.last_merge_outputs
+            for path in outputs:
+                metrics.record_output(path)
             
             if success:
                 if self.view:
@@ -221,7 +255,7 @@ class ModularAppController:
                     
                     message = f"✅ PDFs unidos exitosamente\\n\\n"
                     message += f"Archivos unidos: {len(files)}\\n"
-                    message += f"Archivo creado: {output_name}\\n"
+                    message += self._format_outputs_line(outputs, output_name)
                     message += f"Ubicación: {output_dir}"
                     
                     if delete_originals and deleted_count > 0:
@@ -240,6 +274,101 @@ class ModularAppController:
             if self.view:
                 self.view.show_completion_message("Error", f"Error durante la unión:\\n{str(e)}", True)
         finally:
+            self._finish_job_metrics()
+            self.is_processing_flag = False
+            
+    # ==================== MÓDULO DE DIVISIÓN DE PDFs ====================
+    
+    def start_pdf_split_module(self, params: Dict[str, Any]):
+        """Iniciar proceso de división de PDFs por rangos de páginas"""
+        if self.is_processing_flag:
+            if self.view:
+                self.view.show_completion_message("Procesando", "Ya hay un proceso en curso", True)
+            return
+            
+        if not params.get("files"):
+            if self.view:
+                self.view.show_completion_message("Error", "No hay PDFs seleccionados", True)
+            return
+            
+        if not params.get("output_dir"):
+            if self.view:
+                self.view.show_completion_message("Error", "No se ha seleccionado directorio de salida", True)
+            return
+            
+        if any(not f.lower().endswith('.pdf') for f in params["files"]):
+            if self.view:
+                self.view.show_completion_message("Error", "Solo se pueden dividir archivos PDF", True)
+            return
+            
+        if not params.get("ranges", "").strip():
+            if self.view:
+                self.view.show_completion_message("Error", "Indica los rangos de páginas a extraer", True)
+            return
+            
+        # Iniciar en hilo separado
+        self.current_process_thread = threading.Thread(
+            target=self._process_pdf_split,
+            args=(params,),
+            daemon=True
+        )
+        self.current_process_thread.start()
+        
+    @profiled_workflow("pdf_split")
+    def _process_pdf_split(self, params: Dict[str, Any]):
+        """Procesar división de PDFs en hilo separado"""
+        try:
+            self.is_processing_flag = True
+            
+            files = params["files"]
+            output_dir = params["output_dir"]
+            ranges = params["ranges"]
+            open_output = params.get("open_output", True)
+            
+            metrics = self._start_job_metrics("pdf_split", params)
+            tracker = self._create_progress_tracker(files, "split")
+            
+            outputs = []
+            errors = []
+            for i, file_path in enumerate(files):
+                self._begin_file_progress(tracker, i, "Dividiendo", 0, 95)
+                with metrics.stage("split"):
+                    success, message = self.converter.split_pdf(file_path, ranges, output_dir)
+                if success:
+                    outputs.extend(self.converter.last_split_outputs)
+                else:
+                    errors.append(f"{os.path.basename(file_path)}: {message}")
+                    print(message)
+                tracker.end_file()
+            tracker.finish()
+            
+            for path in outputs:
+                metrics.record_output(path)
+            
+            if self.view:
+                self.view.update_progress(100, "Proceso completado")
+                
+                if outputs:
+                    message = f"✅ División completada\\n\\n"
+                    message += f"PDFs divididos: {len(files) - len(errors)} de {len(files)}\\n"
+                    message += f"Archivos creados: {len(outputs)}\\n"
+                    message += f"Ubicación: {output_dir}"
+                    if errors:
+                        message += "\\n\\n❌ Errores:\\n" + "\\n".join(errors[:5])
+                    self.view.show_completion_message("División Completada", message)
+                    
+                    if open_output:
+                        self._open_folder(output_dir)
+                else:
+                    self.view.show_completion_message("Error", "No se pudo dividir ningún PDF:\\n" +
+                                                      "\\n".join(errors[:5]), True)
+                    
+        except Exception as e:
+            if self.view:
+                self.view.show_completion_message("Error", f"Error durante la división:\\n{str(e)}", True)
+        finally:
+            self.converter.page_callback = None
+            self._finish_job_metrics()
             self.is_processing_flag = False
             
     # ==================== MÓDULO COMBINADO ====================
@@ -270,6 +399,7 @@ class ModularAppController:
         )
         self.current_process_thread.start()
         
+    @profiled_workflow("both_operations")
     def _process_both_operations(self, params: Dict[str, Any]):
         """Procesar conversión + unión en hilo separado"""
         temp_dir = None
@@ -287,74 +417,91 @@ class ModularAppController:
             # Crear directorio temporal
             temp_dir = tempfile.mkdtemp(prefix="pdf_converter_")
             
+            # Las imágenes terminan en páginas PDF: decodificarlas a la resolución de salida
+            self.converter.output_profile = get_output_profile(
+                self.file_manager.settings.get("color_conversion_quality", "high"))
+            # Los PDFs intermedios no se optimizan: solo el PDF final unido
+            self.converter.optimize_outputs = False
+            
             if self.view:
                 self.view.update_progress(5, "Iniciando proceso combinado...")
             
             # FASE 1: Convertir todos los archivos
             converted_files = []
             total_files = len(files)
+            metrics = self._start_job_metrics("both_operations", params)
+            
+            # Pre-conteo de páginas: la conversión ocupa del 10% al 70%
+            with metrics.stage("count_pages"):
+                tracker = self._create_progress_tracker(files, conversion_type)
+            
+            # Modo tamaño objetivo: elegir DPI/calidad JPEG con páginas de muestra antes del lote
+            target_size_mb = params.get("target_size_mb")
+            target_bytes = int(target_size_mb * 1024 * 1024) if target_size_mb else None
+            planner, plan_step = None, 0
+            if target_bytes:
+                planner = SizePlanner(
+                    self.converter,
+                    lambda path, directory: self._convert_file_for_merge(path, directory, conversion_type),
+                    self.file_manager.settings.get("color_conversion_quality", "high"))
+                if self.view:
+                    self.view.update_progress(8, "Estimando tamaño con páginas de muestra...")
+                with metrics.stage("size_plan"):
+                    plan_step, _ = planner.choose_step(files, target_bytes, os.path.join(temp_dir, "size_plan"))
+                planner.apply_step(plan_step)
+                print(f"📏 Calidad elegida para {target_size_mb:g} MB: {planner.describe_step(plan_step)}")
             
+            converted_sources = []
             for i, file_path in enumerate(files):
-                base_progress = 10 + (i / total_files) * 60  # 10% a 70%
-                
-                if self.view:
-                    self.view.update_progress(base_progress, f"Convirtiendo: {os.path.basename(file_path)}")
+                self._begin_file_progress(tracker, i, f"Convirtiendo: {os.path.basename(file_path)}", 10, 60)
+                metrics.begin_file(file_path)
+                converted_count = len(converted_files)
                 
                 try:
-                    ext = os.path.splitext(file_path)[1].lower()
-                    base_name = os.path.splitext(os.path.basename(file_path))[0]
-                    
-                    if ext == '.pdf':
-                        # Convertir PDF
-                        if conversion_type == "sepia":
-                            output_path = os.path.join(temp_dir, f"{base_name}_sepia.pdf")
-                            success, message = self.converter.convert_pdf_to_sepia(file_path, output_path)
-                        else:
-                            output_path = os.path.join(temp_dir, f"{base_name}_bw.pdf")
-                            success, message = self.converter.convert_pdf_to_bw(file_path, output_path)
-                            
-                        if success:
-                            converted_files.append(output_path)
-                        else:
-                            print(f"Error convirtiendo PDF {file_path}: {message}")
-                            # Usar original si falla la conversión
-                            converted_files.append(file_path)
-                            
-                    elif ext in ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.gif']:
-                        # Convertir imagen
-                        if conversion_type == "sepia":
-                            img_output = os.path.join(temp_dir, f"{base_name}_sepia{ext}")
-                            success, message = self.converter.convert_image_to_sepia(file_path, img_output)
-                        else:
-                            img_output = os.path.join(temp_dir, f"{base_name}_bw{ext}")
-                            success, message = self.converter.convert_image_to_bw(file_path, img_output)
-                            
-                        if success:
-                            # Convertir imagen a PDF
-                            pdf_path = os.path.join(temp_dir, f"{base_name}_converted.pdf")
-                            if self._create_pdf_from_image(img_output, pdf_path):
-                                converted_files.append(pdf_path)
-                            else:
-                                print(f"Error creando PDF de imagen {file_path}")
-                        else:
-                            print(f"Error convirtiendo imagen {file_path}: {message}")
-                            # Intentar crear PDF con imagen original
-                            pdf_path = os.path.join(temp_dir, f"{base_name}_original.pdf")
-                            if self._create_pdf_from_image(file_path, pdf_path):
-                                converted_files.append(pdf_path)
-                    else:
-                        print(f"Tipo de archivo no soportado: {file_path}")
+                    converted_path = self._convert_file_for_merge(file_path, temp_dir, conversion_type)
+                    if converted_path:
+                        converted_files.append(converted_path)
+                        converted_sources.append(file_path)
                         
                 except Exception as e:
                     print(f"Error procesando {file_path}: {e}")
+                finally:
+                    tracker.end_file()
+                    converted = len(converted_files) > converted_count
+                    metrics.end_file(converted_files[-1] if converted else None, converted)
+            
+            tracker.finish()
+            self.converter.page_callback = None
                     
             if self.view:
                 self.view.update_progress(75, "Uniendo archivos convertidos...")
             
             # FASE 2: Unir todos los PDFs convertidos
+            self.converter.optimize_outputs = True
             if converted_files:
                 output_path = os.path.join(output_dir, output_name)
-                success = self.converter.merge_pdfs(converted_files, output_path)
+                max_pages, max_bytes = self._volume_limits(params)
+                with metrics.stage("merge"):
+                    success, merge_message = self.converter.merge_pdfs(converted_files, output_path,
+                                                                       max_pages, max_bytes)
+                if not success:
+                    print(merge_message)
+                
+                size_note = ""
+                # El ajuste al tamaño objetivo se aplica a una salida única
+                if success and planner and self.converter.last_merge_outputs == [output_path]:
+                    if self.view:
+                        self.view.update_progress(80, "Ajustando al tamaño objetivo...")
+                    with metrics.stage("size_fit"):
+                        fits = self._fit_to_target_size(planner, plan_step, converted_sources, converted_files,
+                                                        output_path, target_bytes, temp_dir, conversion_type)
+                    final_mb = os.path.getsize(output_path) / (1024 * 1024)
+                    size_note = f"\\nTamaño: {final_mb:.1f} MB (objetivo {target_size_mb:g} MB)"
+                    if not fits:
+                        size_note += "\\n⚠️ No se pudo alcanzar el tamaño objetivo"
+                outputs = self.converter.last_merge_outputs
+                for path in outputs:
+                    metrics.record_output(path)
                 
                 if success:
                     if self.view:
@@ -376,8 +523,9 @@ class ModularAppController:
                         message = f"✅ Proceso combinado completado\\n\\n"
                         message += f"Archivos procesados: {len(files)}\\n"
                         message += f"Archivos convertidos: {len(converted_files)}\\n"
-                        message += f"PDF final: {output_name}\\n"
+                        message += self._format_outputs_line(outputs, output_name, "PDF final")
                         message += f"Ubicación: {output_dir}"
+                        message += size_note
                         
                         if delete_originals and deleted_originals > 0:
                             message += f"\\n\\n🗑️ Archivos originales eliminados: {deleted_originals}"
@@ -401,6 +549,12 @@ class ModularAppController:
             if self.view:
                 self.view.show_completion_message("Error", f"Error durante el proceso:\\n{str(e)}", True)
         finally:
+            self.converter.page_callback = None
+            self.converter.output_profile = None
+            self.converter.optimize_outputs = True
+            self.converter.render_settings = dict(DEFAULT_RENDER_SETTINGS)
+            self._finish_job_metrics()
+            
             # Limpiar directorio temporal
             if temp_dir and delete_intermediates and os.path.exists(temp_dir):
                 try:
@@ -410,23 +564,196 @@ class ModularAppController:
                     
             self.is_processing_flag = False
             
-    def _create_pdf_from_image(self, image_path: str, pdf_path: str) -> bool:
-        """Crear PDF desde imagen usando PIL"""
-        try:
-            from PIL import Image
-            
-            img = Image.open(image_path)
+    def _convert_file_for_merge(self, file_path: str, output_dir: str, conversion_type: str) -> Optional[str]:
+        """Convertir un archivo a PDF para la unión; devuelve el PDF a unir (None si no se pudo)"""
+        ext = os.path.splitext(file_path)[1].lower()
+        base_name = os.path.splitext(os.path.basename(file_path))[0]
+        
+        if ext == '.pdf':
+            # Convertir PDF
+            if conversion_type == "sepia":
+                output_path = os.path.join(output_dir, f"{base_name}_sepia.pdf")
+                success, message = self.converter.convert_pdf_to_sepia(file_path, output_path)
+            else:
+                output_path = os.path.join(output_dir, f"{base_name}_bw.pdf")
+                success, message = self.converter.convert_pdf_to_bw(file_path, output_path)
+                
+            if success:
+                return output_path
+            print(f"Error convirtiendo PDF {file_path}: {message}")
+            # Usar original si falla la conversión
+            return file_path
+        
+        if ext in ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.gif']:
+            # Convertir imagen
+            if conversion_type == "sepia":
+                img_output = os.path.join(output_dir, f"{base_name}_sepia{ext}")
+                success, message = self.converter.convert_image_to_sepia(file_path, img_output)
+            else:
+                img_output = os.path.join(output_dir, f"{base_name}_bw{ext}")
+                success, message = self.converter.convert_image_to_bw(file_path, img_output)
             
-            # Convertir a RGB si es necesario
-            if img.mode != 'RGB':
-                img = img.convert('RGB')
+            if success:
+                # Convertir imagen a PDF
+                pdf_path = os.path.join(output_dir, f"{base_name}_converted.pdf")
+                with self._metrics_stage("image_to_pdf"):
+                    created = self._create_pdf_from_image(img_output, pdf_path)
+                if created:
+                    return pdf_path
+                print(f"Error creando PDF de imagen {file_path}")
+                return None
+            
+            print(f"Error convirtiendo imagen {file_path}: {message}")
+            # Intentar crear PDF con imagen original
+            pdf_path = os.path.join(output_dir, f"{base_name}_original.pdf")
+            with self._metrics_stage("image_to_pdf"):
+                created = self._create_pdf_from_image(file_path, pdf_path)
+            return pdf_path if created else None
+        
+        print(f"Tipo de archivo no soportado: {file_path}")
+        return None
+    
+    def _fit_to_target_size(self, planner: SizePlanner, plan_step: int, sources: List[str],
+                            converted_files: List[str], output_path: str, target_bytes: int,
+                            temp_dir: str, conversion_type: str) -> bool:
+        """Re-codificar solo los intermedios más grandes hasta que el PDF final quepa en el objetivo"""
+        steps = [plan_step] * len(sources)
+        final_size = os.path.getsize(output_path)
+        
+        while final_size > target_bytes:
+            excess = final_size - target_bytes * planner.SAFETY_MARGIN
+            candidates = sorted((i for i in range(len(sources)) if planner.next_step(steps[i]) is not None),
+                                key=lambda i: os.path.getsize(converted_files[i]), reverse=True)
+            if not candidates:
+                return False
+            
+            saved = 0
+            for i in candidates:
+                if saved >= excess:
+                    break
+                
+                step = planner.next_step(steps[i])
+                steps[i] = step
+                step_dir = os.path.join(temp_dir, f"step_{step}")
+                os.makedirs(step_dir, exist_ok=True)
+                
+                planner.apply_step(step)
+                self.converter.optimize_outputs = False
+                try:
+                    new_path = self._convert_file_for_merge(sources[i], step_dir, conversion_type)
+                finally:
+                    self.converter.optimize_outputs = True
+                if not new_path:
+                    continue
                 
-            img.save(pdf_path, "PDF", resolution=100.0)
-            return True
+                saved += os.path.getsize(converted_files[i]) - os.path.getsize(new_path)
+                converted_files[i] = new_path
+                print(f"📏 {os.path.basename(sources[i])}: re-codificado con {planner.describe_step(step)}")
+            
+            success, message = self.converter.merge_pdfs(converted_files, output_path)
+            if not success:
+                print(message)
+                return False
+            final_size = os.path.getsize(output_path)
+        
+        return True
+    
+    @staticmethod
+    def _volume_limits(params: Dict[str, Any]):
+        """Límites de volumen de la unión: (máx. páginas, máx. bytes); None = sin límite"""
+        max_pages = params.get("volume_max_pages") or None
+        max_mb = params.get("volume_max_mb")
+        max_bytes = int(max_mb * 1024 * 1024) if max_mb else None
+        return max_pages, max_bytes
+    
+    @staticmethod
+    def _format_outputs_line(outputs: List[str], output_name: str, label: str = "Archivo creado") -> str:
+        """Línea del mensaje final con el archivo o los volúmenes creados"""
+        if len(outputs) > 1:
+            return (f"Volúmenes creados: {len(outputs)} "
+                    f"({os.path.basename(outputs[0])} … {os.path.basename(outputs[-1])})\\n")
+        return f"{label}: {output_name}\\n"
+    
+    def _metrics_stage(self, name: str):
+        """Medir una etapa del trabajo activo (si hay instrumentación)"""
+        metrics = self.converter.metrics
+        return metrics.stage(name) if metrics else nullcontext()
+    
+    def _start_job_metrics(self, job_type: str, params: Dict[str, Any]) -> JobMetrics:
+        """Crear la instrumentación por etapas del trabajo y activarla en el converter"""
+        files = params.get("files", [])
+        input_bytes = 0
+        for file_path in files:
+            try:
+                input_bytes += os.path.getsize(file_path)
+            except OSError:
+                pass
+        
+        metrics = JobMetrics(job_type, {
+            "conversion_type": params.get("conversion_type"),
+            "pdf_backend": self.converter.get_pdf_backend(),
+            "file_count": len(files),
+            "input_bytes": input_bytes
+        })
+        self.converter.metrics = metrics
+        return metrics
+    
+    def _finish_job_metrics(self):
+        """Cerrar la instrumentación activa y guardar el resumen JSON del trabajo"""
+        metrics = self.converter.metrics
+        if metrics is None:
+            return
+        
+        self.converter.metrics = None
+        metrics.finish()
+        print(metrics.format_summary())
+        
+        summary_path = metrics.write_json()
+        if summary_path:
+            print(f"📊 Métricas del trabajo guardadas en: {summary_path}")
+    
+    def _create_progress_tracker(self, files: List[str], conversion_type: str) -> ProgressTracker:
+        """Pre-contar páginas de los archivos y crear el seguimiento de progreso"""
+        if self.view:
+            self.view.update_progress(0, "Contando páginas...")
+        
+        tracker = ProgressTracker(self.throughput_history)
+        pdf_backend = self.converter.get_pdf_backend()
+        
+        for file_path in files:
+            is_pdf = file_path.lower().endswith('.pdf')
+            backend = pdf_backend if is_pdf else "pil"
+            try:
+                size = os.path.getsize(file_path)
+            except OSError:
+                size = 0
             
-        except Exception as e:
-            print(f"Error creando PDF desde imagen: {e}")
-            return False
+            tracker.add_file(file_path, self.converter.count_pages(file_path), size,
+                             f"{conversion_type}:{backend}")
+        
+        tracker.start()
+        return tracker
+    
+    def _begin_file_progress(self, tracker: ProgressTracker, index: int, label: str,
+                             start: float, span: float):
+        """Conectar el progreso por página del converter a la vista para el archivo número index"""
+        def on_page(pages: int):
+            tracker.advance(pages)
+            if self.view and tracker.should_report():
+                self.view.update_progress(start + tracker.fraction * span, tracker.format_status(label))
+        
+        tracker.begin_file(index)
+        self.converter.page_callback = on_page
+        
+        if self.view:
+            self.view.update_progress(start + tracker.fraction * span, tracker.format_status(label))
+            
+    def _create_pdf_from_image(self, image_path: str, pdf_path: str) -> bool:
+        """Crear PDF desde imagen (una página por fotograma)"""
+        success, message = self.converter.image_file_to_pdf(image_path, pdf_path)
+        if not success:
+            print(f"Error creando PDF desde imagen: {message}")
+        return success
     
     # ==================== MÉTODOS DE UTILIDAD ====================
     
@@ -3,12 +3,24 @@ Model: Converter Operations
 Maneja las operaciones de conversión de archivos
 """
 import os
+import re
+import math
 import tempfile
 import threading
+from io import BytesIO
+from contextlib import nullcontext
 from typing import List, Tuple, Callable, Optional, Dict, Any
-from PIL import Image
+from PIL import Image, ImageChops, TiffImagePlugin
 import PyPDF2
 
+from ..utils.instrumentation import JobMetrics
+from ..utils.file_passthrough import copy_file
+from ..utils.app_config import get_conversion_option
+from .pdf_optimizer import PdfOptimizer
+from .pdf_splitter import parse_page_ranges, plan_split_jobs, run_split_jobs
+from ..utils.image_decode import (open_image_for_profile, reduce_image_for_profile, fit_size_for_profile,
+                                  pdf_resolution_for, count_frames, is_multiframe, iter_frames)
+
 # Importaciones opcionales
 try:
     from pdf2image import convert_from_path
@@ -29,10 +41,46 @@ try:
 except ImportError:
     REPORTLAB_AVAILABLE = False
 
+# Operadores de color en los flujos de contenido PDF
+_PDF_NUMBER = rb"([-+]?(?:\d+\.?\d*|\.\d+))\s+"
+_RGB_COLOR_RE = re.compile(rb"(?<![\d.])" + _PDF_NUMBER * 3 + rb"(?:rg|RG)(?![A-Za-z])")
+_CMYK_COLOR_RE = re.compile(rb"(?<![\d.])" + _PDF_NUMBER * 4 + rb"(?:k|K)(?![A-Za-z])")
+# Espacios de color generales, sombreados e imágenes en línea: no se resuelven sin renderizar
+_UNRESOLVED_COLOR_RE = re.compile(rb"(?<![A-Za-z])(?:sc|scn|SC|SCN|sh|BI)(?![A-Za-z])")
+GRAY_IMAGE_COLORSPACES = ("DeviceGray", "CalGray", "")
+
+# Rasterizado de páginas: zoom y formato de las imágenes insertadas (png = sin pérdida)
+DEFAULT_RENDER_SETTINGS: Dict[str, Any] = {"zoom": 2.0, "format": "png", "jpeg_quality": 85}
+
+# DPI de render por unidad de zoom: PyMuPDF usa 72 puntos por pulgada y pdf2image recibe el zoom como 100 DPI
+RENDER_DPI_PER_ZOOM: Dict[str, int] = {"pymupdf": 72, "pdf2image": 100}
+
+# Memoria máxima (MB) para el pixmap de una página; páginas mayores se renderizan por franjas
+DEFAULT_RENDER_BUDGET_MB = 64
+
 class ConverterOperations:
+    # Franjas con menos filas que esto se sustituyen por mosaicos
+    MIN_BAND_ROWS = 64
+    # Sondeo de color: zoom del render de baja resolución y diferencia máxima entre canales
+    GRAY_PROBE_ZOOM = 0.5
+    GRAY_PROBE_TOLERANCE = 8
+    # Imágenes: diferencia máxima entre canales para considerarlas ya en gris y lado de la muestra
+    GRAY_IMAGE_TOLERANCE = 2
+    GRAY_IMAGE_PROBE_SIZE = 512
+    
     def __init__(self):
         self.progress_callback: Optional[Callable] = None
         self.completion_callback: Optional[Callable] = None
+        self.page_callback: Optional[Callable[[int], None]] = None
+        self.metrics: Optional[JobMetrics] = None
+        self.pdf_backend: Optional[str] = None  # Forzar backend (None = automático)
+        self.render_memory_budget_mb: float = DEFAULT_RENDER_BUDGET_MB
+        self.output_profile: Optional[Dict[str, Any]] = None  # Perfil de salida (None = resolución original)
+        self.pdf_optimizer = PdfOptimizer(get_conversion_option("pdf_compression"))
+        self.optimize_outputs = True  # Desactivar para PDFs intermedios
+        self.render_settings: Dict[str, Any] = dict(DEFAULT_RENDER_SETTINGS)
+        self.last_merge_outputs: List[str] = []  # Archivos escritos por la última unión
+        self.last_split_outputs: List[str] = []  # Archivos escritos por la última división
         self.is_processing = False
     
     def set_callbacks(self, progress_callback: Callable, completion_callback: Callable):
@@ -48,13 +96,174 @@ class ConverterOperations:
             "reportlab": REPORTLAB_AVAILABLE
         }
     
+    def get_available_pdf_backends(self) -> List[str]:
+        """Obtener backends de conversión de PDF disponibles, del mejor al peor"""
+        backends = []
+        if PYMUPDF_AVAILABLE:
+            backends.append("pymupdf")
+        if PDF2IMAGE_AVAILABLE and REPORTLAB_AVAILABLE:
+            backends.append("pdf2image")
+        backends.append("basic")
+        return backends
+    
+    def get_pdf_backend(self) -> str:
+        """Obtener el backend que se usará para convertir PDFs"""
+        if self.pdf_backend in self.get_available_pdf_backends():
+            return self.pdf_backend
+        if PYMUPDF_AVAILABLE:
+            return "pymupdf"
+        elif PDF2IMAGE_AVAILABLE and REPORTLAB_AVAILABLE:
+            return "pdf2image"
+        return "basic"
+    
+    def count_pages(self, file_path: str) -> int:
+        """Contar páginas de un archivo de forma rápida (imágenes: una por fotograma)"""
+        try:
+            if not file_path.lower().endswith('.pdf'):
+                return count_frames(file_path)
+            
+            if PYMUPDF_AVAILABLE:
+                with fitz.open(file_path) as doc:
+                    return len(doc)
+            
+            with open(file_path, 'rb') as input_file:
+                return len(PyPDF2.PdfReader(input_file).pages)
+        except Exception as e:
+            print(f"No se pudieron contar las páginas de {file_path}: {e}")
+            return 1
+    
+    def _pdf_page_count(self, pdf_path: str) -> int:
+        """Páginas de un PDF; lanza excepción si está dañado o cifrado"""
+        if PYMUPDF_AVAILABLE:
+            with fitz.open(pdf_path) as doc:
+                if doc.needs_pass:
+                    raise ValueError("el documento está protegido con contraseña")
+                return len(doc)
+        
+        with open(pdf_path, 'rb') as input_file:
+            reader = PyPDF2.PdfReader(input_file)
+            if reader.is_encrypted:
+                raise ValueError("el documento está protegido con contraseña")
+            return len(reader.pages)
+    
+    def _report_page(self, pages: int = 1):
+        """Notificar páginas procesadas al callback de progreso por página"""
+        if self.metrics:
+            self.metrics.add_pages(pages)
+        if self.page_callback:
+            self.page_callback(pages)
+    
+    def _encode_raster(self, image: Image.Image) -> bytes:
+        """Codificar una página rasterizada según la configuración de render (PNG o JPEG)"""
+        buffer = BytesIO()
+        if self.render_settings.get("format") == "jpeg":
+            with self._stage("jpeg_encode"):
+                image.save(buffer, format='JPEG', quality=self.render_settings.get("jpeg_quality", 85))
+        else:
+            with self._stage("png_encode"):
+                image.save(buffer, format='PNG')
+        return buffer.getvalue()
+    
+    def _encode_pixmap(self, pix) -> bytes:
+        """Codificar un pixmap de PyMuPDF (PNG directo o JPEG vía Pillow)"""
+        if self.render_settings.get("format") != "jpeg":
+            with self._stage("png_encode"):
+                return pix.tobytes("png")
+        mode = "L" if pix.n == 1 else "RGB"
+        return self._encode_raster(Image.frombytes(mode, (pix.width, pix.height), pix.samples))
+    
+    def _raster_suffix(self) -> str:
+        """Extensión de archivo para páginas rasterizadas temporales"""
+        return ".jpg" if self.render_settings.get("format") == "jpeg" else ".png"
+    
+    def render_dpi(self, zoom: Optional[float] = None, backend: Optional[str] = None) -> int:
+        """DPI efectivo de render para un zoom (por defecto el configurado) con el backend indicado o el actual"""
+        if zoom is None:
+            zoom = self.render_settings.get("zoom", 2.0)
+        per_zoom = RENDER_DPI_PER_ZOOM.get(backend or self.get_pdf_backend(), RENDER_DPI_PER_ZOOM["pymupdf"])
+        return int(round(per_zoom * zoom))
+    
+    def _save_pymupdf(self, doc, output_path: str, source_path: Optional[str] = None) -> str:
+        """Guardar un PDF de PyMuPDF con la compresión de salida aplicada en el propio save()
+        
+        El tamaño del archivo de entrada sirve de referencia para el informe; devuelve el
+        texto del informe ("" si no se optimiza).
+        """
+        if not self.optimize_outputs:
+            with self._stage("save"):
+                doc.save(output_path)
+            return ""
+        
+        bytes_before = os.path.getsize(source_path) if source_path else None
+        with self._stage("save"):
+            result = self.pdf_optimizer.save_document(doc, output_path, bytes_before)
+        return self._report_optimization(result)
+    
+    def _optimize_output(self, pdf_path: str) -> str:
+        """Optimizar un PDF recién escrito por otra librería (PyPDF2, reportlab); devuelve el informe antes/después"""
+        if not self.optimize_outputs:
+            return ""
+        
+        with self._stage("optimize"):
+            result = self.pdf_optimizer.optimize(pdf_path)
+        return self._report_optimization(result)
+    
+    def _report_optimization(self, result: Optional[Dict[str, Any]]) -> str:
+        """Imprimir y registrar el tamaño antes/después de una salida optimizada"""
+        if not result:
+            return ""
+        report = self.pdf_optimizer.format_report(result)
+        print(report)
+        if self.metrics:
+            self.metrics.record_optimization(result)
+        return report
+    
+    @staticmethod
+    def _with_report(message: str, report: str) -> str:
+        """Añadir el informe de tamaño al mensaje de resultado"""
+        return f"{message} • {report}" if report else message
+    
+    def _stage(self, name: str):
+        """Medir una etapa si hay instrumentación activa"""
+        if self.metrics:
+            return self.metrics.stage(name)
+        return nullcontext()
+    
     def convert_image_to_bw(self, image_path: str, output_path: str) -> Tuple[bool, str]:
         """Convertir imagen a blanco y negro"""
         try:
-            with Image.open(image_path) as image:
+            if self._is_multiframe_file(image_path):
+                frames = self._convert_image_frames(image_path, output_path, self._frame_to_bw)
+                return True, f"Imagen convertida exitosamente ({frames} páginas)"
+            
+            # Fuente ya en escala de grises: copiar los bytes sin decodificar ni recodificar
+            with self._stage("gray_probe"):
+                already_gray = self._can_passthrough_gray(image_path, output_path)
+            if already_gray:
+                return self._passthrough_gray_image(image_path, output_path)
+            
+            with self._stage("image.decode"):
+                image = Image.open(image_path)
+                keeps_size = self._profile_keeps_size(image)
+                image = reduce_image_for_profile(image, self.output_profile)
+                image.load()
+            
+            with image:
+                # Formatos sin decodificación reducida: comprobar canales sobre la imagen ya cargada
+                if keeps_size and self._same_extension(image_path, output_path) and image.mode == 'RGB':
+                    with self._stage("gray_probe"):
+                        probe = image.reduce(max(1, max(image.size) // self.GRAY_IMAGE_PROBE_SIZE))
+                        already_gray = self._channels_equal(probe, self.GRAY_IMAGE_TOLERANCE)
+                    if already_gray:
+                        return self._passthrough_gray_image(image_path, output_path)
+                
                 # Convertir a escala de grises
-                bw_image = image.convert('L')
-                bw_image.save(output_path)
+                with self._stage("image.convert"):
+                    bw_image = image.convert('L')
+                
+                with self._stage("image.encode"):
+                    bw_image.save(output_path)
+                self._report_page()
                 return True, "Imagen convertida exitosamente"
         except Exception as e:
             return False, f"Error convirtiendo imagen: {str(e)}"
@@ -62,45 +271,158 @@ class ConverterOperations:
     def convert_image_to_sepia(self, image_path: str, output_path: str) -> Tuple[bool, str]:
         """Convertir imagen a sepia"""
         try:
-            with Image.open(image_path) as image:
-                # Convertir a RGB si no lo está
-                if image.mode != 'RGB':
-                    image = image.convert('RGB')
-                
-                # Aplicar filtro sepia
-                pixels = image.load()
-                width, height = image.size
-                
-                for y in range(height):
-                    for x in range(width):
-                        r, g, b = pixels[x, y]
-                        
-                        # Fórmula sepia
-                        tr = int(0.393 * r + 0.769 * g + 0.189 * b)
-                        tg = int(0.349 * r + 0.686 * g + 0.168 * b)
-                        tb = int(0.272 * r + 0.534 * g + 0.131 * b)
-                        
-                        # Asegurar que los valores estén en el rango correcto
-                        tr = min(255, tr)
-                        tg = min(255, tg)
-                        tb = min(255, tb)
-                        
-                        pixels[x, y] = (tr, tg, tb)
+            if self._is_multiframe_file(image_path):
+                frames = self._convert_image_frames(image_path, output_path, self._frame_to_sepia)
+                return True, f"Imagen convertida a sepia exitosamente ({frames} páginas)"
+            
+            with self._stage("image.decode"):
+                image = open_image_for_profile(image_path, self.output_profile)
+                image.load()
+            
+            with image:
+                image = self._apply_sepia_filter(image)
                 
-                image.save(output_path)
+                with self._stage("image.encode"):
+                    image.save(output_path)
+                self._report_page()
                 return True, "Imagen convertida a sepia exitosamente"
         except Exception as e:
             return False, f"Error convirtiendo imagen a sepia: {str(e)}"
     
+    @staticmethod
+    def _same_extension(input_path: str, output_path: str) -> bool:
+        """Verificar si entrada y salida tienen el mismo formato (por extensión)"""
+        return os.path.splitext(input_path)[1].lower() == os.path.splitext(output_path)[1].lower()
+    
+    @staticmethod
+    def _channels_equal(image: Image.Image, tolerance: int) -> bool:
+        """Verificar si los canales R, G y B de una imagen son iguales (dentro de la tolerancia)"""
+        red, green, blue = image.convert('RGB').split()
+        for first, second in ((red, green), (green, blue)):
+            if ImageChops.difference(first, second).getextrema()[1] > tolerance:
+                return False
+        return True
+    
+    def _can_passthrough_gray(self, image_path: str, output_path: str) -> bool:
+        """Decidir, sin decodificar la imagen completa, si ya está en escala de grises"""
+        if not self._same_extension(image_path, output_path):
+            return False
+        
+        with Image.open(image_path) as image:
+            # Si el perfil reduce la imagen, hay que remuestrearla aunque ya sea gris
+            if is_multiframe(image) or not self._profile_keeps_size(image):
+                return False
+            if image.mode in ('L', '1'):
+                return True
+            if image.mode != 'RGB' or image.format != 'JPEG':
+                return False
+            
+            # JPEG: muestra decodificada a 1/8 de resolución por el propio decodificador
+            probe_size = self.GRAY_IMAGE_PROBE_SIZE
+            image.draft('RGB', (min(image.width, probe_size), min(image.height, probe_size)))
+            return self._channels_equal(image, self.GRAY_IMAGE_TOLERANCE)
+    
+    def _profile_keeps_size(self, image: Image.Image) -> bool:
+        """Verificar si el perfil de salida deja la imagen a su tamaño original"""
+        return fit_size_for_profile(image.size, self.output_profile) == image.size
+    
+    def _passthrough_gray_image(self, image_path: str, output_path: str) -> Tuple[bool, str]:
+        """Copiar una imagen que ya está en escala de grises"""
+        with self._stage("passthrough"):
+            copy_file(image_path, output_path)
+        self._report_page()
+        return True, "Imagen ya en escala de grises: copiada sin recodificar"
+    
+    def _is_multiframe_file(self, image_path: str) -> bool:
+        """Verificar si una imagen tiene varias páginas (solo lee la cabecera)"""
+        with Image.open(image_path) as image:
+            return is_multiframe(image)
+    
+    def _frame_to_bw(self, frame: Image.Image) -> Image.Image:
+        """Convertir un fotograma a escala de grises"""
+        with self._stage("image.convert"):
+            return frame.convert('L')
+    
+    def _frame_to_sepia(self, frame: Image.Image) -> Image.Image:
+        """Convertir un fotograma a sepia sin modificar el fotograma fuente"""
+        # GIF compone cada fotograma sobre el anterior: no tocarlo en el sitio
+        return self._apply_sepia_filter(frame if frame.mode != 'RGB' else frame.copy())
+    
+    def _convert_image_frames(self, image_path: str, output_path: str,
+                              transform: Callable[[Image.Image], Image.Image]) -> int:
+        """Convertir una imagen multipágina fotograma a fotograma; devuelve las páginas escritas"""
+        written = 0
+        
+        with Image.open(image_path) as image:
+            def converted_frames():
+                nonlocal written
+                for frame in iter_frames(image, self.output_profile):
+                    yield transform(frame)
+                    written += 1
+                    self._report_page()
+            
+            self._save_frames(converted_frames(), output_path)
+        
+        return written
+    
+    def _save_frames(self, frames, output_path: str):
+        """Guardar fotogramas en un archivo multipágina"""
+        ext = os.path.splitext(output_path)[1].lower()
+        
+        if ext in ('.tif', '.tiff'):
+            # TIFF: cada fotograma se codifica y se libera antes de leer el siguiente
+            with open(output_path, 'w+b') as output_file:
+                with TiffImagePlugin.AppendingTiffWriter(output_file) as tiff:
+                    for frame in frames:
+                        compression = frame.info.get("compression", "raw")
+                        # Las compresiones de fax (group3/group4) solo admiten imágenes de 1 bit
+                        if compression in ("group3", "group4") and frame.mode != "1":
+                            compression = "tiff_lzw"
+                        with self._stage("image.encode"):
+                            frame.save(tiff, format="TIFF", compression=compression)
+                            tiff.newFrame()
+            return
+        
+        # GIF y otros: el codificador de Pillow recibe el resto como generador
+        first = next(frames)
+        with self._stage("image.encode"):
+            first.save(output_path, save_all=True, append_images=frames)
+    
+    def _apply_sepia_filter(self, image: Image.Image) -> Image.Image:
+        """Aplicar filtro sepia píxel a píxel (devuelve imagen RGB)"""
+        with self._stage("sepia"):
+            # Convertir a RGB si no lo está
+            if image.mode != 'RGB':
+                image = image.convert('RGB')
+            
+            pixels = image.load()
+            width, height = image.size
+            
+            for y in range(height):
+                for x in range(width):
+                    r, g, b = pixels[x, y]
+                    
+                    # Fórmula sepia
+                    tr = int(0.393 * r + 0.769 * g + 0.189 * b)
+                    tg = int(0.349 * r + 0.686 * g + 0.168 * b)
+                    tb = int(0.272 * r + 0.534 * g + 0.131 * b)
+                    
+                    # Asegurar que los valores estén en el rango correcto
+                    pixels[x, y] = (min(255, tr), min(255, tg), min(255, tb))
+            
+            return image
+    
     def convert_pdf_to_bw(self, pdf_path: str, output_path: str) -> Tuple[bool, str]:
         """Convertir PDF a blanco y negro usando el mejor método disponible"""
         try:
+            backend = self.get_pdf_backend()
+            
             # Método 1: PyMuPDF (más confiable)
-            if PYMUPDF_AVAILABLE:
+            if backend == "pymupdf":
                 return self._convert_pdf_with_pymupdf(pdf_path, output_path)
             
             # Método 2: pdf2image
-            elif PDF2IMAGE_AVAILABLE and REPORTLAB_AVAILABLE:
+            elif backend == "pdf2image":
                 return self._convert_pdf_with_pdf2image(pdf_path, output_path)
             
             # Método 3: Copia básica
@@ -113,44 +435,153 @@ class ConverterOperations:
     def _convert_pdf_with_pymupdf(self, pdf_path: str, output_path: str) -> Tuple[bool, str]:
         """Convertir PDF usando PyMuPDF"""
         try:
-            doc = fitz.open(pdf_path)
+            with self._stage("fitz.open"):
+                doc = fitz.open(pdf_path)
             new_doc = fitz.open()
+            gray_pages = 0
             
             for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
+                with self._stage("load_page"):
+                    page = doc.load_page(page_num)
                 
-                # Convertir a escala de grises con alta calidad
-                mat = fitz.Matrix(2.0, 2.0)
-                pix = page.get_pixmap(matrix=mat, colorspace=fitz.csGRAY)
+                # Páginas sin color: copiarlas tal cual (vectorial) en lugar de rasterizarlas
+                with self._stage("color_probe"):
+                    is_gray = self._page_is_grayscale(page)
+                if is_gray:
+                    with self._stage("insert_pdf"):
+                        new_doc.insert_pdf(doc, from_page=page_num, to_page=page_num)
+                    gray_pages += 1
+                    self._report_page()
+                    continue
                 
                 # Crear nueva página
                 new_page = new_doc.new_page(width=page.rect.width, height=page.rect.height)
                 
-                # Insertar imagen en escala de grises
-                img_data = pix.tobytes("png")
-                new_page.insert_image(new_page.rect, stream=img_data)
+                # Convertir a escala de grises con alta calidad (por franjas si la página es enorme)
+                zoom = self.render_settings.get("zoom", 2.0)
+                for clip, pix in self._render_page_bands(page, zoom, fitz.csGRAY):
+                    img_data = self._encode_pixmap(pix)
+                    pix = None
+                    
+                    # Insertar imagen en escala de grises
+                    with self._stage("insert_image"):
+                        new_page.insert_image(self._band_target_rect(clip, page.rect), stream=img_data)
+                self._report_page()
+            
+            page_count = len(doc)
+            if gray_pages == page_count:
+                # Ninguna página tiene color: la salida es el propio archivo
+                new_doc.close()
+                doc.close()
+                with self._stage("passthrough"):
+                    copy_file(pdf_path, output_path)
+                return True, f"PDF sin color ({page_count} página(s)): copiado sin convertir"
             
-            new_doc.save(output_path)
+            report = self._save_pymupdf(new_doc, output_path, pdf_path)
             new_doc.close()
             doc.close()
             
-            return True, "PDF convertido con PyMuPDF (alta calidad)"
+            message = "PDF convertido con PyMuPDF (alta calidad)"
+            if gray_pages:
+                message += f" • {gray_pages} página(s) sin color copiadas sin rasterizar"
+            return True, self._with_report(message, report)
             
         except Exception as e:
             raise Exception(f"Error con PyMuPDF: {str(e)}")
     
+    def _page_is_grayscale(self, page) -> bool:
+        """Detectar si una página ya no tiene color (operadores de contenido + sondeo de baja resolución)"""
+        verdict = self._content_color_verdict(page)
+        if verdict is not None:
+            return verdict
+        
+        # Sin veredicto por los operadores: renderizar en baja resolución y comparar canales
+        zoom = self.GRAY_PROBE_ZOOM
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csRGB, alpha=False)
+        probe = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+        return self._channels_equal(probe, self.GRAY_PROBE_TOLERANCE)
+    
+    def _content_color_verdict(self, page) -> Optional[bool]:
+        """Analizar los operadores de color: True = gris, False = color, None = no concluyente"""
+        contents = page.read_contents()
+        
+        for match in _RGB_COLOR_RE.finditer(contents):
+            r, g, b = (float(value) for value in match.groups())
+            if not (r == g == b):
+                return False
+        
+        for match in _CMYK_COLOR_RE.finditer(contents):
+            # Solo el componente negro (K) es gris
+            if any(float(value) != 0 for value in match.groups()[:3]):
+                return False
+        
+        # Imágenes, formularios, anotaciones y fuentes Type3 pueden aportar color propio
+        if _UNRESOLVED_COLOR_RE.search(contents) or page.get_xobjects() or page.first_annot:
+            return None
+        if any(font[2] == "Type3" for font in page.get_fonts()):
+            return None
+        if any(image[5] not in GRAY_IMAGE_COLORSPACES for image in page.get_images(full=True)):
+            return None
+        return True
+    
+    def _render_page_bands(self, page, zoom: float, colorspace):
+        """Renderizar una página completa, o por franjas/mosaicos si supera el presupuesto de memoria"""
+        rect = page.rect
+        matrix = fitz.Matrix(zoom, zoom)
+        width_px = max(1, math.ceil(rect.width * zoom))
+        height_px = max(1, math.ceil(rect.height * zoom))
+        max_pixels = max(1, int(self.render_memory_budget_mb * 1024 * 1024) // colorspace.n)
+        
+        if width_px * height_px <= max_pixels:
+            with self._stage("get_pixmap"):
+                pix = page.get_pixmap(matrix=matrix, colorspace=colorspace)
+            yield rect, pix
+            return
+        
+        # Franjas horizontales de ancho completo; si son demasiado finas, mosaicos cuadrados
+        band_rows = max_pixels // width_px
+        if band_rows >= self.MIN_BAND_ROWS:
+            tile_width_px, tile_height_px = width_px, band_rows
+        else:
+            tile_width_px = tile_height_px = max(1, math.isqrt(max_pixels))
+        
+        step_x = tile_width_px / zoom
+        step_y = tile_height_px / zoom
+        
+        y0 = rect.y0
+        while y0 < rect.y1:
+            y1 = min(rect.y1, y0 + step_y)
+            x0 = rect.x0
+            while x0 < rect.x1:
+                x1 = min(rect.x1, x0 + step_x)
+                clip = fitz.Rect(x0, y0, x1, y1)
+                with self._stage("get_pixmap"):
+                    pix = page.get_pixmap(matrix=matrix, colorspace=colorspace, clip=clip)
+                yield clip, pix
+                x0 = x1
+            y0 = y1
+    
+    @staticmethod
+    def _band_target_rect(clip, page_rect):
+        """Posición de una franja renderizada dentro de la página nueva (origen en 0,0)"""
+        return fitz.Rect(clip.x0 - page_rect.x0, clip.y0 - page_rect.y0,
+                         clip.x1 - page_rect.x0, clip.y1 - page_rect.y0)
+    
     def _convert_pdf_with_pdf2image(self, pdf_path: str, output_path: str) -> Tuple[bool, str]:
         """Convertir PDF usando pdf2image + reportlab"""
         try:
-            images = convert_from_path(pdf_path, dpi=200)
+            with self._stage("pdf2image.render"):
+                images = convert_from_path(pdf_path, dpi=self.render_dpi(backend="pdf2image"))
             c = canvas.Canvas(output_path, pagesize=letter)
             page_width, page_height = letter
             
             for i, image in enumerate(images):
-                bw_image = image.convert('L')
+                with self._stage("image.convert"):
+                    bw_image = image.convert('L')
                 
-                with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as temp_file:
-                    bw_image.save(temp_file.name, format='PNG')
+                with tempfile.NamedTemporaryFile(suffix=self._raster_suffix(), delete=False) as temp_file:
+                    temp_file.write(self._encode_raster(bw_image))
+                    temp_file.flush()
                     
                     # Calcular dimensiones
                     img_width, img_height = bw_image.size
@@ -166,15 +597,19 @@ class ConverterOperations:
                     x = (page_width - new_width) / 2
                     y = (page_height - new_height) / 2
                     
-                    c.drawImage(temp_file.name, x, y, width=new_width, height=new_height)
+                    with self._stage("insert_image"):
+                        c.drawImage(temp_file.name, x, y, width=new_width, height=new_height)
                     
                     if i < len(images) - 1:
                         c.showPage()
                     
                     os.unlink(temp_file.name)
+                    self._report_page()
             
-            c.save()
-            return True, "PDF convertido con pdf2image"
+            with self._stage("save"):
+                c.save()
+            report = self._optimize_output(output_path)
+            return True, self._with_report("PDF convertido con pdf2image", report)
             
         except Exception as e:
             raise Exception(f"Error con pdf2image: {str(e)}")
@@ -182,15 +617,9 @@ class ConverterOperations:
     def _copy_pdf_basic(self, pdf_path: str, output_path: str) -> Tuple[bool, str]:
         """Copia básica del PDF (sin conversión real)"""
         try:
-            with open(pdf_path, 'rb') as input_file:
-                pdf_reader = PyPDF2.PdfReader(input_file)
-                pdf_writer = PyPDF2.PdfWriter()
-                
-                for page in pdf_reader.pages:
-                    pdf_writer.add_page(page)
-                
-                with open(output_path, 'wb') as output_file:
-                    pdf_writer.write(output_file)
+            # La salida es idéntica a la entrada: copia en el kernel, sin analizar el PDF
+            with self._stage("passthrough"):
+                copy_file(pdf_path, output_path)
             
             return True, "PDF copiado (conversión limitada - instala PyMuPDF para mejor calidad)"
             
@@ -200,12 +629,14 @@ class ConverterOperations:
     def convert_pdf_to_sepia(self, pdf_path: str, output_path: str) -> Tuple[bool, str]:
         """Convertir PDF a sepia"""
         try:
+            backend = self.get_pdf_backend()
+            
             # Método 1: PyMuPDF (mejor calidad)
-            if PYMUPDF_AVAILABLE:
+            if backend == "pymupdf":
                 return self._convert_pdf_with_pymupdf_sepia(pdf_path, output_path)
             
             # Método 2: pdf2image + reportlab
-            elif PDF2IMAGE_AVAILABLE and REPORTLAB_AVAILABLE:
+            elif backend == "pdf2image":
                 return self._convert_pdf_with_pdf2image_sepia(pdf_path, output_path)
             
             # Método 3: Copia básica (sin conversión real)
@@ -218,53 +649,43 @@ class ConverterOperations:
     def _convert_pdf_with_pymupdf_sepia(self, pdf_path: str, output_path: str) -> Tuple[bool, str]:
         """Convertir PDF a sepia usando PyMuPDF"""
         try:
-            doc = fitz.open(pdf_path)
+            with self._stage("fitz.open"):
+                doc = fitz.open(pdf_path)
             new_doc = fitz.open()
             
             for page_num in range(len(doc)):
-                page = doc.load_page(page_num)
-                
-                # Convertir a imagen RGB con alta calidad
-                mat = fitz.Matrix(2.0, 2.0)
-                pix = page.get_pixmap(matrix=mat)
-                
-                # Convertir a PIL para aplicar sepia
-                from io import BytesIO
-                img_data = pix.tobytes("ppm")
-                img = Image.open(BytesIO(img_data))
-                
-                # Aplicar filtro sepia
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-                
-                pixels = img.load()
-                width, height = img.size
-                
-                for y in range(height):
-                    for x in range(width):
-                        r, g, b = pixels[x, y]
-                        
-                        # Fórmula sepia
-                        tr = int(0.393 * r + 0.769 * g + 0.189 * b)
-                        tg = int(0.349 * r + 0.686 * g + 0.168 * b)
-                        tb = int(0.272 * r + 0.534 * g + 0.131 * b)
-                        
-                        pixels[x, y] = (min(255, tr), min(255, tg), min(255, tb))
-                
-                # Convertir de vuelta a bytes
-                img_bytes = BytesIO()
-                img.save(img_bytes, format='PNG')
-                img_bytes.seek(0)
+                with self._stage("load_page"):
+                    page = doc.load_page(page_num)
                 
                 # Crear nueva página
                 new_page = new_doc.new_page(width=page.rect.width, height=page.rect.height)
-                new_page.insert_image(new_page.rect, stream=img_bytes.getvalue())
+                
+                # Convertir a imagen RGB con alta calidad (por franjas si la página es enorme)
+                zoom = self.render_settings.get("zoom", 2.0)
+                for clip, pix in self._render_page_bands(page, zoom, fitz.csRGB):
+                    # Convertir a PIL para aplicar sepia
+                    with self._stage("image.decode"):
+                        img_data = pix.tobytes("ppm")
+                        pix = None
+                        img = Image.open(BytesIO(img_data))
+                        img.load()
+                    
+                    # Aplicar filtro sepia
+                    img = self._apply_sepia_filter(img)
+                    
+                    # Convertir de vuelta a bytes
+                    img_bytes = self._encode_raster(img)
+                    img = None
+                    
+                    with self._stage("insert_image"):
+                        new_page.insert_image(self._band_target_rect(clip, page.rect), stream=img_bytes)
+                self._report_page()
             
-            new_doc.save(output_path)
+            report = self._save_pymupdf(new_doc, output_path, pdf_path)
             new_doc.close()
             doc.close()
             
-            return True, "PDF convertido a sepia con PyMuPDF (alta calidad)"
+            return True, self._with_report("PDF convertido a sepia con PyMuPDF (alta calidad)", report)
             
         except Exception as e:
             raise Exception(f"Error con PyMuPDF sepia: {str(e)}")
@@ -275,28 +696,14 @@ class ConverterOperations:
             from reportlab.pdfgen import canvas
             from reportlab.lib.pagesizes import letter
             
-            images = convert_from_path(pdf_path, dpi=200)
+            with self._stage("pdf2image.render"):
+                images = convert_from_path(pdf_path, dpi=self.render_dpi(backend="pdf2image"))
             c = canvas.Canvas(output_path, pagesize=letter)
             page_width, page_height = letter
             
             for i, image in enumerate(images):
                 # Convertir a sepia
-                if image.mode != 'RGB':
-                    image = image.convert('RGB')
-                
-                pixels = image.load()
-                width, height = image.size
-                
-                for y in range(height):
-                    for x in range(width):
-                        r, g, b = pixels[x, y]
-                        
-                        # Fórmula sepia
-                        tr = int(0.393 * r + 0.769 * g + 0.189 * b)
-                        tg = int(0.349 * r + 0.686 * g + 0.168 * b)
-                        tb = int(0.272 * r + 0.534 * g + 0.131 * b)
-                        
-                        pixels[x, y] = (min(255, tr), min(255, tg), min(255, tb))
+                image = self._apply_sepia_filter(image)
                 
                 # Ajustar tamaño de imagen a página
                 img_width, img_height = image.size
@@ -309,27 +716,46 @@ class ConverterOperations:
                 y_offset = (page_height - new_height) / 2
                 
                 # Guardar imagen temporalmente
-                temp_path = f"temp_sepia_{i}.png"
-                image.save(temp_path)
+                temp_path = f"temp_sepia_{i}{self._raster_suffix()}"
+                with open(temp_path, 'wb') as temp_file:
+                    temp_file.write(self._encode_raster(image))
                 
                 # Insertar en PDF
-                c.drawImage(temp_path, x_offset, y_offset, new_width, new_height)
+                with self._stage("insert_image"):
+                    c.drawImage(temp_path, x_offset, y_offset, new_width, new_height)
                 
                 # Limpiar archivo temporal
                 os.remove(temp_path)
                 
                 if i < len(images) - 1:
                     c.showPage()
+                
+                self._report_page()
             
-            c.save()
-            return True, "PDF convertido a sepia con pdf2image + reportlab"
+            with self._stage("save"):
+                c.save()
+            report = self._optimize_output(output_path)
+            return True, self._with_report("PDF convertido a sepia con pdf2image + reportlab", report)
             
         except Exception as e:
             raise Exception(f"Error con pdf2image sepia: {str(e)}")
     
-    def merge_pdfs(self, pdf_files: List[str], output_path: str) -> Tuple[bool, str]:
-        """Unir múltiples PDFs"""
+    def merge_pdfs(self, pdf_files: List[str], output_path: str, max_pages: Optional[int] = None,
+                   max_bytes: Optional[int] = None) -> Tuple[bool, str]:
+        """Unir múltiples PDFs (opcionalmente en volúmenes limitados por páginas o bytes)"""
+        self.last_merge_outputs = []
         try:
+            if max_pages or max_bytes:
+                return self._merge_pdfs_in_volumes(pdf_files, output_path, max_pages, max_bytes)
+            
+            if len(pdf_files) == 1:
+                # Un solo PDF: la unión es el propio archivo
+                with self._stage("passthrough"):
+                    copy_file(pdf_files[0], output_path)
+                report = self._optimize_output(output_path)
+                self.last_merge_outputs = [output_path]
+                return True, self._with_report(f"PDFs unidos exitosamente en: {output_path}", report)
+            
             merger = PyPDF2.PdfMerger()
             
             for i, pdf_file in enumerate(pdf_files):
@@ -337,16 +763,199 @@ class ConverterOperations:
                     progress = (i / len(pdf_files)) * 100
                     self.progress_callback(progress, f"Procesando: {os.path.basename(pdf_file)}")
                 
-                merger.append(pdf_file)
+                with self._stage("merge.append"):
+                    merger.append(pdf_file)
             
-            merger.write(output_path)
+            with self._stage("merge.write"):
+                merger.write(output_path)
             merger.close()
+            report = self._optimize_output(output_path)
+            self.last_merge_outputs = [output_path]
             
-            return True, f"PDFs unidos exitosamente en: {output_path}"
+            return True, self._with_report(f"PDFs unidos exitosamente en: {output_path}", report)
             
         except Exception as e:
             return False, f"Error uniendo PDFs: {str(e)}"
     
+    @staticmethod
+    def volume_path(output_path: str, index: int) -> str:
+        """Ruta del volumen N derivada del nombre de salida (documento_vol001.pdf)"""
+        base, ext = os.path.splitext(output_path)
+        return f"{base}_vol{index:03d}{ext or '.pdf'}"
+    
+    @staticmethod
+    def _estimate_page_bytes(page) -> int:
+        """Bytes propios de una página: flujos de contenido e imágenes/formularios que usa
+        
+        Los recursos compartidos (fuentes) no se cuentan; la diferencia la corrige
+        la proporción real/estimado aprendida de los volúmenes ya escritos.
+        """
+        seen = set()
+        
+        def stream_bytes(obj, depth: int = 0) -> int:
+            reference = getattr(obj, "idnum", None)
+            if reference is not None:
+                if reference in seen:
+                    return 0
+                seen.add(reference)
+            obj = obj.get_object()
+            if isinstance(obj, PyPDF2.generic.ArrayObject):
+                return sum(stream_bytes(item, depth) for item in obj)
+            
+            total = len(getattr(obj, "_data", b"") or b"")
+            if depth < 3 and isinstance(obj, PyPDF2.generic.DictionaryObject):
+                # Formularios (/Form) con sus propias imágenes
+                resources = obj.get("/Resources")
+                if resources is not None:
+                    xobjects = resources.get_object().get("/XObject")
+                    if xobjects is not None:
+                        total += sum(stream_bytes(x, depth + 1) for x in xobjects.get_object().values())
+            return total
+        
+        try:
+            total = stream_bytes(page.get("/Contents", PyPDF2.generic.ArrayObject()))
+            resources = page.get("/Resources")
+            if resources is not None:
+                xobjects = resources.get_object().get("/XObject")
+                if xobjects is not None:
+                    total += sum(stream_bytes(x, 1) for x in xobjects.get_object().values())
+        except Exception:
+            total = 0
+        # Sobrecarga fija por página (diccionario, referencias cruzadas)
+        return total + 512
+    
+    def _merge_pdfs_in_volumes(self, pdf_files: List[str], output_path: str, max_pages: Optional[int],
+                               max_bytes: Optional[int]) -> Tuple[bool, str]:
+        """Unir PDFs escribiendo cada volumen en cuanto se llena (nunca un archivo gigante)
+        
+        Con límite de bytes, el tamaño real de cada volumen se comprueba tras escribirlo
+        (y optimizarlo): si se pasa, se reescribe con menos páginas y las sobrantes
+        pasan al siguiente. Solo se admite superar el límite con una única página que
+        ya es mayor que él.
+        """
+        volumes: List[str] = []
+        volume: List[Tuple[Any, int, int]] = []  # (lector, página, bytes estimados)
+        size_ratio = 1.0  # Corrección real/estimado aprendida de los volúmenes escritos
+        
+        def estimated(pages) -> float:
+            return sum(page_bytes for _, _, page_bytes in pages) * size_ratio
+        
+        def write_pages(pages, path: str) -> int:
+            merger = PyPDF2.PdfMerger()
+            start = 0
+            # Un append por tramo consecutivo de páginas del mismo lector
+            for k in range(1, len(pages) + 1):
+                if (k == len(pages) or pages[k][0] is not pages[start][0]
+                        or pages[k][1] != pages[k - 1][1] + 1):
+                    with self._stage("merge.append"):
+                        merger.append(pages[start][0], pages=(pages[start][1], pages[k - 1][1] + 1))
+                    start = k
+            with self._stage("merge.write"):
+                merger.write(path)
+            merger.close()
+            self._optimize_output(path)
+            return os.path.getsize(path)
+        
+        def flush():
+            """Escribir el volumen actual; devuelve las páginas que no cupieron"""
+            nonlocal volume, size_ratio
+            pages, volume = volume, []
+            if not pages:
+                return []
+            path = self.volume_path(output_path, len(volumes) + 1)
+            
+            size = write_pages(pages, path)
+            if max_bytes and size > max_bytes and len(pages) > 1:
+                # La estimación se quedó corta: búsqueda binaria del mayor prefijo que cabe
+                low, high = 1, len(pages) - 1
+                keep, written = 1, None
+                while low <= high:
+                    middle = (low + high) // 2
+                    written = middle
+                    size = write_pages(pages[:middle], path)
+                    if size <= max_bytes:
+                        keep, low = middle, middle + 1
+                    else:
+                        high = middle - 1
+                # El archivo en disco debe ser el del prefijo elegido
+                if written != keep:
+                    size = write_pages(pages[:keep], path)
+                volume = pages[keep:]
+                pages = pages[:keep]
+            
+            if max_bytes and size > max_bytes:
+                print(f"⚠️ La página {pages[0][1] + 1} ocupa {size / 2**20:.2f} MB por sí sola, "
+                      f"más que el límite de {max_bytes / 2**20:.2f} MB por volumen")
+            
+            own_bytes = sum(page_bytes for _, _, page_bytes in pages)
+            if own_bytes > 0 and len(pages) > 1:
+                size_ratio = size / own_bytes
+            volumes.append(path)
+            print(f"📚 Volumen {len(volumes)}: {os.path.basename(path)} "
+                  f"({len(pages)} páginas, {size / 2**20:.2f} MB)")
+            return volume
+        
+        def volume_full(page_bytes: int) -> bool:
+            if not volume:
+                return False
+            if max_pages and len(volume) >= max_pages:
+                return True
+            return bool(max_bytes) and (estimated(volume) + page_bytes * size_ratio) > max_bytes
+        
+        for i, pdf_file in enumerate(pdf_files):
+            if self.progress_callback:
+                progress = (i / len(pdf_files)) * 100
+                self.progress_callback(progress, f"Procesando: {os.path.basename(pdf_file)}")
+            
+            with self._stage("merge.append"):
+                reader = PyPDF2.PdfReader(pdf_file)
+            
+            for page_index, page in enumerate(reader.pages):
+                page_bytes = self._estimate_page_bytes(page) if max_bytes else 0
+                while volume_full(page_bytes):
+                    flush()
+                volume.append((reader, page_index, page_bytes))
+        
+        while volume:
+            flush()
+        
+        # Si todo cupo en un volumen se usa el nombre de salida tal cual
+        if len(volumes) == 1:
+            os.replace(volumes[0], output_path)
+            volumes = [output_path]
+        self.last_merge_outputs = volumes
+        
+        if len(volumes) == 1:
+            return True, f"PDFs unidos exitosamente en: {output_path}"
+        return True, f"PDFs unidos en {len(volumes)} volúmenes: {', '.join(os.path.basename(v) for v in volumes)}"
+    
+    def split_pdf(self, pdf_path: str, ranges: str, output_dir: str,
+                  max_workers: Optional[int] = None) -> Tuple[bool, str]:
+        """Extraer rangos de páginas a PDFs separados (ver parse_page_ranges)"""
+        self.last_split_outputs = []
+        try:
+            page_count = self._pdf_page_count(pdf_path)
+        except Exception as e:
+            # count_pages() devuelve 1 ante cualquier error: aquí se informa del error real
+            return False, f"No se pudo abrir el PDF: {str(e)}"
+        
+        try:
+            jobs = plan_split_jobs(pdf_path, parse_page_ranges(ranges, page_count), output_dir)
+        except ValueError as e:
+            return False, f"Rangos no válidos: {str(e)}"
+        
+        def on_done(index: int, pages: int):
+            self._report_page(pages)
+        
+        try:
+            with self._stage("split"):
+                run_split_jobs(pdf_path, jobs, self.get_pdf_backend() == "pymupdf", max_workers, on_done)
+        except Exception as e:
+            return False, f"Error dividiendo PDF: {str(e)}"
+        
+        self.last_split_outputs = [output_path for _, _, output_path in jobs]
+        return True, f"PDF dividido en {len(jobs)} archivos desde: {pdf_path}"
+    
     def convert_files_async(self, files: List[str], output_directory: str, 
                           conversion_type: str = "bw"):
         """Convertir archivos de forma asíncrona"""
@@ -424,18 +1033,97 @@ class ConverterOperations:
             base_name = os.path.splitext(os.path.basename(image_path))[0]
             output_path = os.path.join(output_dir, f"{base_name}.pdf")
             
-            # Abrir imagen
-            img = Image.open(image_path)
+            success, message = self.image_file_to_pdf(image_path, output_path)
+            if not success:
+                print(message)
+                return None
+            
+            return output_path
+            
+        except Exception as e:
+            print(f"Error convirtiendo imagen a PDF: {e}")
+            return None
+    
+    def _pdf_image_options(self) -> Dict[str, Any]:
+        """Opciones del escritor PDF de Pillow (calidad JPEG si la configuración de render la fija)"""
+        if self.render_settings.get("format") == "jpeg":
+            return {"quality": self.render_settings.get("jpeg_quality", 85)}
+        return {}
+    
+    def _encode_pdf_frame(self, frame: Image.Image) -> bytes:
+        """Codificar un fotograma como imagen de página PDF (JPEG como el escritor PDF de Pillow; 1 bit en PNG)"""
+        buffer = BytesIO()
+        if frame.mode == '1':
+            frame.save(buffer, format='PNG')
+        else:
+            if frame.mode not in ('L', 'RGB'):
+                frame = frame.convert('RGB')
+            frame.save(buffer, format='JPEG', quality=self._pdf_image_options().get("quality", 75))
+        return buffer.getvalue()
+    
+    def _frames_to_pdf(self, image_path: str, image: Image.Image, pdf_path: str) -> Tuple[int, str]:
+        """Escribir una imagen multipágina como PDF fotograma a fotograma; devuelve las páginas y el informe de tamaño
+        
+        Cada fotograma se reduce al perfil, se inserta en su página y se libera antes de
+        decodificar el siguiente, así que nunca hay más de uno en memoria.
+        """
+        written = 0
+        
+        if not PYMUPDF_AVAILABLE:
+            # Sin PyMuPDF: Pillow añade cada página al PDF ya escrito
+            for frame in iter_frames(image, self.output_profile):
+                if frame.mode not in ('1', 'L', 'RGB', 'CMYK'):
+                    frame = frame.convert('RGB')
+                with self._stage("image.encode"):
+                    frame.save(pdf_path, "PDF", append=written > 0,
+                               resolution=pdf_resolution_for(frame, self.output_profile),
+                               **self._pdf_image_options())
+                frame = None
+                written += 1
+                self._report_page()
+            return written, ""
+        
+        doc = fitz.open()
+        try:
+            for frame in iter_frames(image, self.output_profile):
+                scale = 72.0 / pdf_resolution_for(frame, self.output_profile)
+                width, height = frame.width * scale, frame.height * scale
+                with self._stage("image.encode"):
+                    img_data = self._encode_pdf_frame(frame)
+                frame = None
+                
+                page = doc.new_page(width=width, height=height)
+                with self._stage("insert_image"):
+                    page.insert_image(page.rect, stream=img_data)
+                img_data = None
+                written += 1
+                self._report_page()
+            
+            report = self._save_pymupdf(doc, pdf_path, image_path)
+        finally:
+            doc.close()
+        
+        return written, report
+    
+    def image_file_to_pdf(self, image_path: str, pdf_path: str) -> Tuple[bool, str]:
+        """Guardar una imagen como PDF (una página por fotograma)"""
+        try:
+            with Image.open(image_path) as image:
+                if is_multiframe(image):
+                    pages, report = self._frames_to_pdf(image_path, image, pdf_path)
+                    return True, self._with_report(f"PDF creado exitosamente ({pages} páginas)", report)
+            
+            # Abrir imagen (reducida si el perfil de salida no necesita más resolución)
+            img = open_image_for_profile(image_path, self.output_profile)
+            resolution = pdf_resolution_for(img, self.output_profile)
             
             # Convertir a RGB si es necesario
             if img.mode != 'RGB':
                 img = img.convert('RGB')
             
             # Guardar como PDF
-            img.save(output_path, "PDF", resolution=100.0)
-            
-            return output_path
+            img.save(pdf_path, "PDF", resolution=resolution, **self._pdf_image_options())
+            return True, "PDF creado exitosamente"
             
         except Exception as e:
-            print(f"Error convirtiendo imagen a PDF: {e}")
-            return None
+            return False, f"Error convirtiendo imagen a PDF: {e}"
@@ -0,0 +1,142 @@
+"""
+Model: File Collection
+Lista ordenada de archivos con índice por ruta, compartida por el modelo y los widgets
+"""
+import os
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.gif']
+
+
+def file_type_for(path: str) -> str:
+    """Tipo de archivo según la extensión: 'PDF', 'IMAGE' o 'UNKNOWN'"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.pdf':
+        return 'PDF'
+    elif ext in IMAGE_EXTENSIONS:
+        return 'IMAGE'
+    return 'UNKNOWN'
+
+
+class FileEntry:
+    """Archivo de la lista (compacto: sin __dict__ por instancia)"""
+
+    __slots__ = ("path", "name", "type", "size", "metadata")
+
+    def __init__(self, path: str, size: Optional[int] = None):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.type = file_type_for(path)
+        self.size = size  # Bytes al agregarlo (None si no se pudo leer)
+        self.metadata: Optional[Dict[str, Any]] = None  # Del índice de metadatos, cuando se pida
+
+    def __repr__(self) -> str:
+        return f"FileEntry({self.path!r})"
+
+
+class FileCollection:
+    """Archivos en orden, sin duplicados y con pertenencia O(1)
+
+    Las operaciones masivas (agregar, quitar, mover bloques) recorren la lista
+    una sola vez, así que escalan linealmente con el número de archivos.
+    """
+
+    def __init__(self, paths: Optional[Iterable[str]] = None):
+        self._entries: List[FileEntry] = []
+        self._by_path: Dict[str, FileEntry] = {}
+        if paths:
+            self.add(paths)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[FileEntry]:
+        return iter(self._entries)
+
+    def __getitem__(self, index: int) -> FileEntry:
+        return self._entries[index]
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._by_path
+
+    def get(self, path: str) -> Optional[FileEntry]:
+        """Entrada de una ruta (None si no está en la lista)"""
+        return self._by_path.get(path)
+
+    def paths(self) -> List[str]:
+        """Rutas en el orden actual"""
+        return [entry.path for entry in self._entries]
+
+    def add(self, paths: Iterable[str], require_exists: bool = False) -> List[FileEntry]:
+        """Agregar rutas al final (ignorando duplicadas); devuelve las entradas nuevas"""
+        added = []
+        for path in paths:
+            if path in self._by_path:
+                continue
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                if require_exists:
+                    continue
+                size = None
+
+            entry = FileEntry(path, size)
+            self._entries.append(entry)
+            self._by_path[path] = entry
+            added.append(entry)
+        return added
+
+    def remove_at(self, index: int) -> Optional[FileEntry]:
+        """Quitar por posición; devuelve la entrada quitada"""
+        if not 0 <= index < len(self._entries):
+            return None
+        entry = self._entries.pop(index)
+        del self._by_path[entry.path]
+        return entry
+
+    def remove(self, paths: Iterable[str]) -> int:
+        """Quitar varias rutas de una pasada; devuelve cuántas se quitaron"""
+        doomed = {path for path in paths if path in self._by_path}
+        if not doomed:
+            return 0
+        self._entries = [entry for entry in self._entries if entry.path not in doomed]
+        for path in doomed:
+            del self._by_path[path]
+        return len(doomed)
+
+    def clear(self):
+        """Vaciar la lista"""
+        self._entries.clear()
+        self._by_path.clear()
+
+    def move(self, from_index: int, to_index: int) -> bool:
+        """Mover una entrada a otra posición"""
+        count = len(self._entries)
+        if not (0 <= from_index < count and 0 <= to_index < count):
+            return False
+        self._entries.insert(to_index, self._entries.pop(from_index))
+        return True
+
+    def move_block(self, indices: Iterable[int], to_index: int) -> List[int]:
+        """Mover varias entradas juntas (en su orden relativo) delante de la posición to_index
+
+        to_index se refiere a la lista antes del movimiento; devuelve las nuevas posiciones.
+        """
+        chosen = sorted({i for i in indices if 0 <= i < len(self._entries)})
+        if not chosen:
+            return []
+
+        chosen_set = set(chosen)
+        block = [self._entries[i] for i in chosen]
+        # Posición de inserción descontando las entradas movidas que estaban antes
+        insert_at = to_index - sum(1 for i in chosen if i < to_index)
+        rest = [entry for i, entry in enumerate(self._entries) if i not in chosen_set]
+        insert_at = max(0, min(insert_at, len(rest)))
+        self._entries = rest[:insert_at] + block + rest[insert_at:]
+        return list(range(insert_at, insert_at + len(block)))
+
+    def reorder(self, paths: List[str]):
+        """Aplicar un orden nuevo con las mismas rutas"""
+        if len(paths) != len(self._entries) or set(paths) != self._by_path.keys():
+            raise ValueError("El nuevo orden debe contener exactamente las mismas rutas")
+        self._entries = [self._by_path[path] for path in paths]
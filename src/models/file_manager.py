@@ -4,11 +4,14 @@ Maneja la lógica de archivos y configuraciones
 """
 import os
 import json
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any
+
+from .metadata_index import get_metadata_index
+from .file_collection import FileCollection
 
 class FileManager:
     def __init__(self):
-        self.selected_files: List[str] = []
+        self.files = FileCollection()
         self.output_directory: str = ""
         self.settings: Dict[str, Any] = self.load_settings()
     
@@ -20,7 +23,8 @@ class FileManager:
             "theme": "default",
             "color_conversion_quality": "high",
             "merge_default_option": "orden_seleccion",
-            "window_geometry": "900x700"
+            "window_geometry": "900x700",
+            "render_memory_budget_mb": 64
         }
         
         try:
@@ -42,32 +46,29 @@ class FileManager:
         except Exception as e:
             print(f"Error guardando configuraciones: {e}")
     
+    @property
+    def selected_files(self) -> List[str]:
+        """Rutas seleccionadas en orden"""
+        return self.files.paths()
+    
     def add_files(self, files: List[str], clear_existing: bool = False) -> int:
         """Agregar archivos a la lista"""
         if clear_existing:
-            self.selected_files.clear()
+            self.files.clear()
         
-        new_files_count = 0
-        for file_path in files:
-            if file_path not in self.selected_files and os.path.exists(file_path):
-                self.selected_files.append(file_path)
-                new_files_count += 1
+        new_entries = self.files.add(files, require_exists=True)
         
-        return new_files_count
+        # Indexar metadatos en segundo plano antes de que se consulten
+        get_metadata_index().prefetch(entry.path for entry in new_entries)
+        return len(new_entries)
     
     def remove_file(self, index: int) -> bool:
         """Remover archivo por índice"""
-        try:
-            if 0 <= index < len(self.selected_files):
-                self.selected_files.pop(index)
-                return True
-        except Exception:
-            pass
-        return False
+        return self.files.remove_at(index) is not None
     
     def clear_files(self):
         """Limpiar lista de archivos"""
-        self.selected_files.clear()
+        self.files.clear()
     
     def set_output_directory(self, directory: str):
         """Establecer directorio de salida"""
@@ -105,22 +106,23 @@ class FileManager:
                 "type": self._get_file_type(file_ext)
             }
             
-            # Información específica por tipo
+            # Información específica por tipo (desde el índice de metadatos, sin bloquear:
+            # si aún no está indexado se encola y la vista vuelve a preguntar)
+            metadata = get_metadata_index().get(file_path, compute=False)
+            if metadata is None:
+                info["pending"] = True
+                metadata = {}
             if file_ext == '.pdf':
-                try:
-                    import PyPDF2
-                    with open(file_path, 'rb') as file:
-                        pdf_reader = PyPDF2.PdfReader(file)
-                        info["pages"] = len(pdf_reader.pages)
-                except:
-                    info["pages"] = "No se pudo leer"
+                info["pages"] = metadata.get("pages", "Calculando..." if info.get("pending") else "No se pudo leer")
             elif file_ext in ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.gif']:
-                try:
-                    from PIL import Image
-                    with Image.open(file_path) as img:
-                        info["dimensions"] = f"{img.size[0]} x {img.size[1]} píxeles"
-                        info["mode"] = img.mode
-                except:
+                if info.get("pending"):
+                    info["dimensions"] = "Calculando..."
+                    info["mode"] = "Calculando..."
+                elif "dimensions" in metadata:
+                    width, height = metadata["dimensions"]
+                    info["dimensions"] = f"{width} x {height} píxeles"
+                    info["mode"] = metadata["mode"]
+                else:
                     info["dimensions"] = "No se pudo leer"
                     info["mode"] = "Desconocido"
             
@@ -140,19 +142,18 @@ class FileManager:
     
     def get_pdf_files(self) -> List[str]:
         """Obtener solo archivos PDF"""
-        return [f for f in self.selected_files if f.lower().endswith('.pdf')]
+        return [entry.path for entry in self.files if entry.type == 'PDF']
     
     def get_image_files(self) -> List[str]:
         """Obtener solo archivos de imagen"""
-        image_extensions = ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.gif']
-        return [f for f in self.selected_files if os.path.splitext(f)[1].lower() in image_extensions]
+        return [entry.path for entry in self.files if entry.type == 'IMAGE']
     
     def get_file_counts(self) -> Dict[str, int]:
         """Obtener conteos de archivos por tipo"""
         pdf_count = len(self.get_pdf_files())
         image_count = len(self.get_image_files())
         return {
-            "total": len(self.selected_files),
+            "total": len(self.files),
             "pdf": pdf_count,
             "image": image_count
         }
@@ -161,7 +162,7 @@ class FileManager:
         """Validar si una operación puede ejecutarse"""
         result = {"valid": False, "message": ""}
         
-        if not self.selected_files:
+        if not self.files:
             result["message"] = "No hay archivos seleccionados"
             return result
         
@@ -0,0 +1,256 @@
+"""
+Model: Metadata Index
+Índice persistente de metadatos de archivos (páginas, tamaños, dimensiones, hash)
+"""
+import os
+import json
+import queue
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import PyPDF2
+from PIL import Image
+
+from ..utils.app_paths import get_data_dir
+
+try:
+    import fitz  # PyMuPDF
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
+INDEX_FILENAME = "metadata_index.sqlite"
+IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif', '.gif']
+
+# Clave de validez de una entrada: (ruta, tamaño, mtime en ns)
+FileKey = Tuple[str, int, int]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS file_metadata (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    data TEXT NOT NULL
+)
+"""
+
+
+def file_key(path: str) -> Optional[FileKey]:
+    """Clave actual de un archivo (None si no existe)"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return os.path.abspath(path), stat.st_size, stat.st_mtime_ns
+
+
+def content_hash(path: str) -> str:
+    """Hash BLAKE2b (128 bits) del contenido del archivo"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def extract_metadata(path: str) -> Dict[str, Any]:
+    """Leer los metadatos de un archivo (operación lenta: la hace el hilo de fondo)"""
+    extension = os.path.splitext(path)[1].lower()
+    data: Dict[str, Any] = {"hash": content_hash(path)}
+
+    try:
+        if extension == '.pdf':
+            data.update(_pdf_metadata(path))
+        elif extension in IMAGE_EXTENSIONS:
+            with Image.open(path) as image:
+                data["dimensions"] = list(image.size)
+                data["mode"] = image.mode
+                data["pages"] = getattr(image, "n_frames", 1)
+    except Exception as e:
+        data["error"] = str(e)
+
+    return data
+
+
+def _pdf_metadata(path: str) -> Dict[str, Any]:
+    """Páginas y tamaño de cada página (en puntos) sin cargar su contenido"""
+    if PYMUPDF_AVAILABLE:
+        with fitz.open(path) as doc:
+            sizes = []
+            for page_index in range(len(doc)):
+                rect = doc.page_cropbox(page_index) if hasattr(doc, "page_cropbox") else doc[page_index].rect
+                sizes.append([round(rect.width, 2), round(rect.height, 2)])
+    else:
+        with open(path, 'rb') as f:
+            sizes = [[round(float(page.mediabox.width), 2), round(float(page.mediabox.height), 2)]
+                     for page in PyPDF2.PdfReader(f).pages]
+    return {"pages": len(sizes), "page_sizes": sizes}
+
+
+class MetadataIndex:
+    """Caché de metadatos en memoria respaldada por SQLite y rellenada en segundo plano
+
+    Una entrada solo es válida mientras la ruta conserve el mismo tamaño y mtime;
+    si el archivo cambia se vuelve a leer.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = db_path or os.path.join(get_data_dir(), INDEX_FILENAME)
+        self._memory: Dict[str, Tuple[FileKey, Dict[str, Any]]] = {}  # ruta -> (clave, datos)
+        self._lock = threading.Lock()
+        # Rutas que se están indexando (cola o get): quien llegue después espera al evento
+        self._in_progress: Dict[str, threading.Event] = {}
+        self._queue: "queue.Queue[str]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._db: Optional[sqlite3.Connection] = None
+
+        try:
+            self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._db.execute(_SCHEMA)
+            self._db.commit()
+        except sqlite3.Error as e:
+            print(f"No se pudo abrir el índice de metadatos {self.db_path}: {e}")
+            self._db = None
+
+    def get(self, path: str, compute: bool = True) -> Optional[Dict[str, Any]]:
+        """Metadatos de un archivo; si no están indexados se leen ahora (compute) o se encolan"""
+        key = file_key(path)
+        if key is None:
+            return None
+
+        data = self._lookup(key)
+        if data is not None:
+            return data
+
+        if not compute:
+            self.prefetch([path])
+            return None
+        return self._index_once(key)
+
+    def known_size(self, path: str) -> Optional[int]:
+        """Tamaño guardado en la clave del índice, sin consultar el disco (None si no está indexado)"""
+        cached = self._memory.get(os.path.abspath(path))
+        return cached[0][1] if cached is not None else None
+
+    def prefetch(self, paths: Iterable[str]):
+        """Encolar archivos para indexarlos en el hilo de fondo"""
+        for path in paths:
+            key = file_key(path)
+            if key is None or self._lookup(key) is not None:
+                continue
+            with self._lock:
+                if key[0] in self._in_progress:
+                    continue
+                self._in_progress[key[0]] = threading.Event()
+            self._queue.put(path)
+
+        self._ensure_worker()
+
+    def _lookup(self, key: FileKey) -> Optional[Dict[str, Any]]:
+        """Buscar en memoria y después en SQLite"""
+        cached = self._memory.get(key[0])
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        if self._db is None:
+            return None
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT data FROM file_metadata WHERE path = ? AND size = ? AND mtime_ns = ?", key
+            ).fetchone()
+        if row is None:
+            return None
+
+        data = json.loads(row[0])
+        self._memory[key[0]] = (key, data)
+        return data
+
+    def _index_once(self, key: FileKey) -> Dict[str, Any]:
+        """Indexar sin duplicar trabajo: si otro hilo ya lee el archivo, esperar su resultado"""
+        with self._lock:
+            event = self._in_progress.get(key[0])
+            owner = event is None
+            if owner:
+                event = self._in_progress[key[0]] = threading.Event()
+
+        if not owner:
+            event.wait()
+            data = self._lookup(key)
+            if data is not None:
+                return data
+            # El archivo cambió mientras se indexaba: leerlo de nuevo
+            return self._index(key)
+
+        try:
+            return self._index(key)
+        finally:
+            self._finish(key[0])
+
+    def _finish(self, path: str):
+        """Marcar una ruta como indexada y despertar a quien la espere"""
+        with self._lock:
+            event = self._in_progress.pop(path, None)
+        if event is not None:
+            event.set()
+
+    def _index(self, key: FileKey) -> Dict[str, Any]:
+        """Leer un archivo y guardar sus metadatos"""
+        data = extract_metadata(key[0])
+        self._memory[key[0]] = (key, data)
+
+        if self._db is not None:
+            try:
+                with self._lock:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO file_metadata (path, size, mtime_ns, data) VALUES (?, ?, ?, ?)",
+                        (*key, json.dumps(data))
+                    )
+                    self._db.commit()
+            except sqlite3.Error as e:
+                print(f"No se pudo guardar en el índice de metadatos: {e}")
+        return data
+
+    def _ensure_worker(self):
+        """Arrancar el hilo de fondo si hay trabajo pendiente"""
+        with self._lock:
+            if self._worker is not None:
+                return
+            self._worker = threading.Thread(target=self._run_worker, daemon=True)
+            self._worker.start()
+
+    def _run_worker(self):
+        """Indexar los archivos encolados; el hilo termina cuando la cola se vacía"""
+        while True:
+            try:
+                path = self._queue.get(timeout=1.0)
+            except queue.Empty:
+                with self._lock:
+                    # Comprobado bajo el candado: prefetch() arrancará otro hilo si hace falta
+                    if self._queue.empty():
+                        self._worker = None
+                        return
+                continue
+
+            try:
+                key = file_key(path)
+                if key is not None and self._lookup(key) is None:
+                    self._index(key)
+            except Exception as e:
+                print(f"No se pudieron indexar los metadatos de {path}: {e}")
+            finally:
+                self._finish(os.path.abspath(path))
+
+
+_shared_index: Optional[MetadataIndex] = None
+_shared_lock = threading.Lock()
+
+
+def get_metadata_index() -> MetadataIndex:
+    """Índice compartido por toda la aplicación"""
+    global _shared_index
+    with _shared_lock:
+        if _shared_index is None:
+            _shared_index = MetadataIndex()
+        return _shared_index
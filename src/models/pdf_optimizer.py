@@ -0,0 +1,116 @@
+"""
+Model: PDF Optimizer
+Etapa de optimización posterior a la escritura de los PDFs generados
+"""
+import os
+from typing import Any, Dict, Optional
+
+try:
+    import fitz  # PyMuPDF
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
+# Opciones de guardado de PyMuPDF por nivel de "pdf_compression"
+COMPRESSION_LEVELS: Dict[str, Dict[str, Any]] = {
+    "low": {"garbage": 1, "deflate": True},
+    "medium": {"garbage": 3, "deflate": True, "use_objstms": 1},
+    "high": {"garbage": 4, "deflate": True, "deflate_images": True, "deflate_fonts": True,
+             "clean": True, "use_objstms": 1}
+}
+
+DEFAULT_COMPRESSION = {"enabled": True, "level": "medium", "linearize": False}
+
+
+class PdfOptimizer:
+    """Recolectar objetos sin uso, comprimir flujos y usar flujos de objetos
+
+    Los documentos de PyMuPDF se guardan directamente con estas opciones
+    (save_document); optimize() reescribe los PDFs que producen otras librerías.
+    """
+
+    def __init__(self, options: Optional[Dict[str, Any]] = None):
+        self.options = dict(DEFAULT_COMPRESSION)
+        self.options.update(options or {})
+
+    @property
+    def enabled(self) -> bool:
+        """Verificar si la optimización está activa y es posible"""
+        return bool(self.options.get("enabled")) and PYMUPDF_AVAILABLE
+
+    def _save_options(self) -> Dict[str, Any]:
+        """Opciones de guardado para el nivel configurado"""
+        save_options = dict(COMPRESSION_LEVELS.get(self.options.get("level"), COMPRESSION_LEVELS["medium"]))
+        if self.options.get("linearize"):
+            save_options["linear"] = True
+        return save_options
+
+    @staticmethod
+    def _save(doc, path: str, save_options: Dict[str, Any]):
+        """Guardar con las opciones disponibles en la versión instalada de PyMuPDF"""
+        options = dict(save_options)
+        while True:
+            try:
+                doc.save(path, **options)
+                return
+            except TypeError:
+                # PyMuPDF antiguo: sin flujos de objetos
+                if options.pop("use_objstms", None) is None:
+                    raise
+            except Exception:
+                # MuPDF reciente ya no linealiza
+                if options.pop("linear", None) is None:
+                    raise
+                print("⚠️ Linealización no soportada por esta versión de PyMuPDF: se omite")
+
+    def save_document(self, doc, path: str, bytes_before: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """Guardar un documento de PyMuPDF ya comprimido (sin reabrirlo ni reescribirlo después)
+
+        Devuelve tamaños antes/después como optimize() (None si está desactivado). El tamaño
+        de referencia es bytes_before (p. ej. el del archivo de entrada) o, si no se indica,
+        el de un guardado sin compresión hecho en memoria.
+        """
+        if not self.enabled:
+            doc.save(path)
+            return None
+
+        if bytes_before is None:
+            bytes_before = len(doc.tobytes())
+        self._save(doc, path, self._save_options())
+        return {"path": path, "bytes_before": bytes_before, "bytes_after": os.path.getsize(path)}
+
+    def optimize(self, pdf_path: str) -> Optional[Dict[str, Any]]:
+        """Optimizar un PDF en el sitio; devuelve tamaños antes/después (None si está desactivado)"""
+        if not self.enabled:
+            return None
+
+        bytes_before = os.path.getsize(pdf_path)
+        temp_path = f"{pdf_path}.optimizing"
+
+        try:
+            with fitz.open(pdf_path) as doc:
+                self._save(doc, temp_path, self._save_options())
+
+            bytes_after = os.path.getsize(temp_path)
+            # Solo se sustituye si el resultado es más pequeño (o se pidió linealizar)
+            if bytes_after < bytes_before or self.options.get("linearize"):
+                os.replace(temp_path, pdf_path)
+            else:
+                os.remove(temp_path)
+                bytes_after = bytes_before
+        except Exception as e:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            print(f"No se pudo optimizar {pdf_path}: {e}")
+            return None
+
+        return {"path": pdf_path, "bytes_before": bytes_before, "bytes_after": bytes_after}
+
+    @staticmethod
+    def format_report(result: Dict[str, Any]) -> str:
+        """Texto con el tamaño antes y después"""
+        before = result["bytes_before"]
+        after = result["bytes_after"]
+        change = (after - before) / before * 100 if before else 0.0
+        return (f"🗜️ {os.path.basename(result['path'])}: {before / (1024 * 1024):.2f} MB → "
+                f"{after / (1024 * 1024):.2f} MB ({change:+.1f}%)")
@@ -0,0 +1,221 @@
+"""
+Model: PDF Splitter
+Extracción de rangos de páginas a PDFs separados, sin rasterizar y en paralelo
+"""
+import os
+import re
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, List, Optional, Tuple
+
+import PyPDF2
+
+try:
+    import fitz  # PyMuPDF
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
+# Un trabajo de extracción: (índice de salida, páginas base 0, ruta de salida)
+SplitJob = Tuple[int, List[int], str]
+
+_RANGE_RE = re.compile(r"^(\d*)\s*-\s*(\d*)$")
+_EVERY_RE = re.compile(r"^(?:cada|every)\s+(\d+)$", re.IGNORECASE)
+_UNSAFE_NAME_RE = re.compile(r"[^\w\-. ]+")
+
+# Por debajo de estas páginas el arranque de procesos cuesta más que la copia
+PARALLEL_MIN_PAGES = 200
+MAX_WORKERS = 8
+
+
+def parse_page_ranges(expression: str, page_count: int) -> List[Tuple[Optional[str], List[int]]]:
+    """Interpretar una expresión de rangos; devuelve (nombre, páginas base 0) por salida
+
+    Cada salida se separa con ";" o salto de línea y admite un nombre opcional
+    ("cliente_a: 1-40"). Dentro de una salida, elementos separados por comas:
+    "7", "3-5", "10-" (hasta el final), "-4" (desde el inicio) o "8-6" (orden inverso).
+    "cada N" divide el documento completo en bloques de N páginas.
+    """
+    outputs: List[Tuple[Optional[str], List[int]]] = []
+
+    for spec in re.split(r"[;\n]+", expression or ""):
+        spec = spec.strip()
+        if not spec:
+            continue
+
+        name = None
+        if ":" in spec:
+            name, spec = (part.strip() for part in spec.split(":", 1))
+            name = name or None
+
+        every = _EVERY_RE.match(spec)
+        if every:
+            size = int(every.group(1))
+            if size <= 0:
+                raise ValueError(f"Tamaño de bloque no válido en '{spec}'")
+            for block, start in enumerate(range(0, page_count, size), start=1):
+                block_name = f"{name}_{block:03d}" if name else None
+                outputs.append((block_name, list(range(start, min(start + size, page_count)))))
+            continue
+
+        pages: List[int] = []
+        for item in spec.split(","):
+            pages.extend(_parse_item(item.strip(), page_count))
+        if not pages:
+            raise ValueError(f"Rango vacío: '{spec}'")
+        outputs.append((name, pages))
+
+    if not outputs:
+        raise ValueError("No se indicó ningún rango de páginas")
+    return outputs
+
+
+def _parse_item(item: str, page_count: int) -> List[int]:
+    """Páginas (base 0) de un elemento "N", "A-B", "A-" o "-B" """
+    if not item:
+        return []
+
+    if item.isdigit():
+        first = last = int(item)
+    else:
+        match = _RANGE_RE.match(item)
+        if not match:
+            raise ValueError(f"Rango no válido: '{item}'")
+        first = int(match.group(1)) if match.group(1) else 1
+        last = int(match.group(2)) if match.group(2) else page_count
+
+    for page in (first, last):
+        if page < 1 or page > page_count:
+            raise ValueError(f"Página {page} fuera de rango en '{item}' (el documento tiene {page_count})")
+
+    step = 1 if last >= first else -1
+    return list(range(first - 1, last - 1 + step, step))
+
+
+def output_name_for(base_name: str, name: Optional[str], pages: List[int], index: int) -> str:
+    """Nombre de archivo de una salida: nombre indicado, rango contiguo o número de parte"""
+    if name:
+        label = _UNSAFE_NAME_RE.sub("_", name).strip() or f"parte{index:03d}"
+    elif pages == list(range(pages[0], pages[-1] + 1)):
+        label = f"p{pages[0] + 1}" if len(pages) == 1 else f"p{pages[0] + 1}-{pages[-1] + 1}"
+    else:
+        label = f"parte{index:03d}"
+    return f"{base_name}_{label}.pdf"
+
+
+def plan_split_jobs(pdf_path: str, ranges: List[Tuple[Optional[str], List[int]]],
+                    output_dir: str) -> List[SplitJob]:
+    """Asignar una ruta de salida a cada rango
+
+    Dos salidas con el mismo nombre (mismo nombre indicado, o el mismo rango sin
+    nombre, p. ej. "9-" y el último bloque de "cada 4") se rechazan en lugar de
+    generar archivos duplicados con nombres parecidos.
+    """
+    base_name = os.path.splitext(os.path.basename(pdf_path))[0]
+    jobs: List[SplitJob] = []
+    used = {}  # nombre de archivo -> (número de salida, páginas)
+
+    for index, (name, pages) in enumerate(ranges, start=1):
+        file_name = output_name_for(base_name, name, pages, index)
+        if file_name in used:
+            other_index, other_pages = used[file_name]
+            if other_pages == pages:
+                raise ValueError(f"Las salidas {other_index} y {index} repiten las mismas páginas "
+                                 f"({_describe_pages(pages)})")
+            raise ValueError(f"Las salidas {other_index} y {index} tendrían el mismo nombre: {file_name}")
+        used[file_name] = (index, pages)
+        jobs.append((index, pages, os.path.join(output_dir, file_name)))
+
+    return jobs
+
+
+def _describe_pages(pages: List[int]) -> str:
+    """Texto de las páginas (base 1) de una salida para los mensajes de error"""
+    return ", ".join(str(first + 1) if first == last else f"{first + 1}-{last + 1}"
+                     for first, last in _page_runs(pages))
+
+
+def _page_runs(pages: List[int]) -> List[Tuple[int, int]]:
+    """Agrupar páginas consecutivas en tramos (desde, hasta) para copiarlas de una vez"""
+    runs: List[Tuple[int, int]] = []
+    for page in pages:
+        if runs and page == runs[-1][1] + 1:
+            runs[-1] = (runs[-1][0], page)
+        else:
+            runs.append((page, page))
+    return runs
+
+
+def extract_jobs(pdf_path: str, jobs: List[SplitJob], use_pymupdf: bool = True) -> List[Tuple[int, int]]:
+    """Escribir un lote de salidas abriendo el PDF fuente una sola vez
+
+    Las páginas se copian como objetos PDF (contenido, fuentes e imágenes tal cual),
+    nunca se rasterizan. Devuelve (índice, páginas escritas) por salida.
+    """
+    results: List[Tuple[int, int]] = []
+
+    if use_pymupdf and PYMUPDF_AVAILABLE:
+        with fitz.open(pdf_path) as source:
+            for index, pages, output_path in jobs:
+                with fitz.open() as part:
+                    for first, last in _page_runs(pages):
+                        part.insert_pdf(source, from_page=first, to_page=last)
+                    part.save(output_path, garbage=3, deflate=True)
+                results.append((index, len(pages)))
+        return results
+
+    with open(pdf_path, 'rb') as input_file:
+        reader = PyPDF2.PdfReader(input_file)
+        for index, pages, output_path in jobs:
+            writer = PyPDF2.PdfWriter()
+            for page_index in pages:
+                writer.add_page(reader.pages[page_index])
+            with open(output_path, 'wb') as output_file:
+                writer.write(output_file)
+            results.append((index, len(pages)))
+    return results
+
+
+def _batch_jobs(jobs: List[SplitJob], batch_count: int) -> List[List[SplitJob]]:
+    """Repartir los trabajos en lotes consecutivos de páginas similares"""
+    total_pages = sum(len(pages) for _, pages, _ in jobs)
+    pages_per_batch = max(1, total_pages // batch_count)
+    batches: List[List[SplitJob]] = [[]]
+    batch_pages = 0
+
+    for job in jobs:
+        if batches[-1] and batch_pages >= pages_per_batch:
+            batches.append([])
+            batch_pages = 0
+        batches[-1].append(job)
+        batch_pages += len(job[1])
+
+    return batches
+
+
+def run_split_jobs(pdf_path: str, jobs: List[SplitJob], use_pymupdf: bool = True,
+                   max_workers: Optional[int] = None,
+                   on_done: Optional[Callable[[int, int], None]] = None):
+    """Ejecutar los trabajos, en varios procesos si hay suficientes páginas
+
+    on_done(índice, páginas) se llama en este proceso al terminar cada salida.
+    """
+    total_pages = sum(len(pages) for _, pages, _ in jobs)
+    workers = min(max_workers or os.cpu_count() or 1, MAX_WORKERS, len(jobs))
+
+    if workers < 2 or total_pages < PARALLEL_MIN_PAGES:
+        for job in jobs:
+            for index, pages in extract_jobs(pdf_path, [job], use_pymupdf):
+                if on_done:
+                    on_done(index, pages)
+        return
+
+    # "spawn": el proceso principal tiene hilos (Tk, conversión) y fork no es seguro
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        futures = [executor.submit(extract_jobs, pdf_path, batch, use_pymupdf)
+                   for batch in _batch_jobs(jobs, workers * 2)]
+        for future in as_completed(futures):
+            for index, pages in future.result():
+                if on_done:
+                    on_done(index, pages)
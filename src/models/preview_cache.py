@@ -0,0 +1,116 @@
+"""
+Model: Preview Cache
+Caché LRU de vistas previas decodificadas con presupuesto de memoria
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from ..utils.app_config import get_preview_option
+
+# Presupuesto por defecto si app_config.json no indica "cache_memory_mb"
+DEFAULT_CACHE_MEMORY_MB = 256
+
+
+def image_nbytes(image: Any) -> int:
+    """Bytes que ocupa una imagen decodificada (PIL.Image o PhotoImage)
+
+    Tk guarda las PhotoImage como RGBA de 32 bits, así que se cuentan 4 bytes
+    por píxel; para PIL se usa el número real de bandas.
+    """
+    if hasattr(image, "getbands"):
+        width, height = image.size
+        return width * height * max(1, len(image.getbands()))
+    return image.width() * image.height() * 4
+
+
+class PreviewCache:
+    """LRU acotado por bytes en lugar de por número de entradas
+
+    Las claves son tuplas cuyo primer elemento es la ruta del archivo, de modo que
+    se pueden descartar todas las vistas de un archivo a la vez. Al superar el
+    presupuesto se expulsan primero las entradas usadas hace más tiempo.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = None):
+        if max_bytes is None:
+            max_bytes = int(get_preview_option("cache_memory_mb", DEFAULT_CACHE_MEMORY_MB) * 1024 * 1024)
+        self.max_bytes = max(0, max_bytes)
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Tuple, Tuple[Any, int]]" = OrderedDict()  # clave -> (valor, bytes)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Tuple) -> bool:
+        return key in self._entries
+
+    def get(self, key: Tuple) -> Optional[Any]:
+        """Valor en caché (None si no está); cuenta acierto o fallo"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: Tuple, value: Any, nbytes: Optional[int] = None):
+        """Guardar un valor; nbytes se calcula de la imagen si no se indica"""
+        if nbytes is None:
+            nbytes = image_nbytes(value)
+
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            # Una imagen mayor que todo el presupuesto no se guarda
+            if nbytes > self.max_bytes:
+                return
+            self._entries[key] = (value, nbytes)
+            self.current_bytes += nbytes
+            self._evict()
+
+    def discard(self, path: Hashable):
+        """Quitar todas las entradas de un archivo"""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == path]:
+                self.current_bytes -= self._entries.pop(key)[1]
+
+    def clear(self):
+        """Vaciar la caché (los contadores se conservan)"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def set_budget(self, max_bytes: int):
+        """Cambiar el presupuesto de memoria, expulsando lo que sobre"""
+        with self._lock:
+            self.max_bytes = max(0, max_bytes)
+            self._evict()
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores de uso de la caché"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def _evict(self):
+        """Expulsar las entradas menos usadas hasta entrar en el presupuesto (con el candado)"""
+        while self.current_bytes > self.max_bytes and self._entries:
+            _, (_, nbytes) = self._entries.popitem(last=False)
+            self.current_bytes -= nbytes
+            self.evictions += 1
@@ -0,0 +1,97 @@
+"""
+Model: Preview Renderer
+Render de páginas PDF e imágenes a un tamaño de caja, fuera del hilo de Tk
+"""
+import os
+import threading
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from PIL import Image
+
+try:
+    import fitz  # PyMuPDF
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
+IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.gif']
+
+# Procesos de render compartidos por miniaturas y vistas previas
+MAX_RENDER_WORKERS = 2
+
+
+def fit_zoom(page_width: float, page_height: float, box: Tuple[int, int]) -> float:
+    """Zoom exacto para que una página quepa en la caja (ancho, alto) en píxeles"""
+    if page_width <= 0 or page_height <= 0:
+        return 1.0
+    return min(box[0] / page_width, box[1] / page_height)
+
+
+def render_pdf_page(pdf_path: str, page_index: int, box: Tuple[int, int]) -> Image.Image:
+    """Renderizar una página directamente al tamaño de la caja (sin reescalar después)"""
+    if not PYMUPDF_AVAILABLE:
+        raise RuntimeError("PyMuPDF no está disponible para la vista previa de PDF")
+
+    with fitz.open(pdf_path) as doc:
+        page = doc[page_index]
+        zoom = fit_zoom(page.rect.width, page.rect.height, box)
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+        return Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+
+
+def render_image(image_path: str, box: Tuple[int, int], frame: int = 0) -> Image.Image:
+    """Decodificar una imagen solo a la resolución de la caja (draft JPEG + reduce)"""
+    with Image.open(image_path) as image:
+        if frame:
+            image.seek(frame)
+        image.draft("RGB", box)
+        if image.mode not in ("RGB", "RGBA", "L"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+        image.thumbnail(box, Image.Resampling.LANCZOS, reducing_gap=2.0)
+        image.load()
+        return image.copy()
+
+
+def render_preview(path: str, box: Tuple[int, int], page_index: int = 0) -> Image.Image:
+    """Página o fotograma page_index de un archivo, ajustado a la caja"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.pdf':
+        return render_pdf_page(path, page_index, box)
+    if ext in IMAGE_EXTENSIONS:
+        return render_image(path, box, page_index)
+    raise ValueError(f"Vista previa no disponible para {ext or 'archivos sin extensión'}")
+
+
+def render_to_file(path: str, box: Tuple[int, int], output_path: str, page_index: int = 0) -> str:
+    """Renderizar y guardar como PNG de forma atómica (para el pool de procesos)"""
+    image = render_preview(path, box, page_index)
+    temp_path = f"{output_path}.{os.getpid()}.tmp"
+    image.save(temp_path, format="PNG")
+    os.replace(temp_path, output_path)
+    return output_path
+
+
+_render_pool: Optional[Executor] = None
+_render_pool_lock = threading.Lock()
+
+
+def get_render_pool() -> Executor:
+    """Pool de render compartido
+
+    Se usan procesos porque PyMuPDF no libera el GIL mientras renderiza: en un hilo,
+    una página pesada congelaría igualmente la interfaz. Si no se pueden crear
+    procesos se usa un hilo.
+    """
+    global _render_pool
+    with _render_pool_lock:
+        if _render_pool is None:
+            workers = min(MAX_RENDER_WORKERS, os.cpu_count() or 1)
+            try:
+                _render_pool = ProcessPoolExecutor(max_workers=workers,
+                                                   mp_context=multiprocessing.get_context("spawn"))
+            except (OSError, NotImplementedError) as e:
+                print(f"No se pudo crear el pool de procesos de render, se usará un hilo: {e}")
+                _render_pool = ThreadPoolExecutor(max_workers=1)
+        return _render_pool
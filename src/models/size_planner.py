@@ -0,0 +1,178 @@
+"""
+Model: Size Planner
+Elige DPI y calidad JPEG para que el PDF final no supere un tamaño objetivo
+"""
+import os
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import PyPDF2
+from PIL import Image
+
+from ..utils.image_decode import get_output_profile
+
+try:
+    import fitz  # PyMuPDF
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
+# Escalones de calidad, de mejor a más compacto. El primero es la configuración normal.
+RENDER_LADDER: List[Dict[str, Any]] = [
+    {"zoom": 2.0, "format": "png", "jpeg_quality": 85, "image_dpi": None},
+    {"zoom": 2.0, "format": "jpeg", "jpeg_quality": 85, "image_dpi": 200},
+    {"zoom": 1.5, "format": "jpeg", "jpeg_quality": 75, "image_dpi": 150},
+    {"zoom": 1.25, "format": "jpeg", "jpeg_quality": 65, "image_dpi": 120},
+    {"zoom": 1.0, "format": "jpeg", "jpeg_quality": 55, "image_dpi": 96},
+    {"zoom": 0.75, "format": "jpeg", "jpeg_quality": 45, "image_dpi": 72},
+]
+
+
+class SizePlanner:
+    """Estimar el tamaño final con páginas de muestra y ajustar la calidad de render"""
+
+    # Páginas de muestra repartidas por todo el lote
+    SAMPLE_PAGES = 6
+    # Margen para el error de estimación y la sobrecarga de la unión
+    SAFETY_MARGIN = 0.9
+
+    def __init__(self, converter, convert_file: Callable[[str, str], Optional[str]], quality: str = "high"):
+        """convert_file(ruta, directorio) convierte un archivo a PDF y devuelve la ruta creada"""
+        self.converter = converter
+        self.convert_file = convert_file
+        self.quality = quality
+
+    def describe_step(self, step: int) -> str:
+        """Descripción breve de un escalón (DPI del backend de render actual)"""
+        settings = RENDER_LADDER[step]
+        dpi = self.converter.render_dpi(settings["zoom"])
+        if settings["format"] == "png":
+            return f"{dpi} DPI sin pérdida"
+        return f"{dpi} DPI, JPEG {settings['jpeg_quality']}"
+
+    @staticmethod
+    def next_step(step: int) -> Optional[int]:
+        """Siguiente escalón más compacto (None si ya es el último)"""
+        return step + 1 if step + 1 < len(RENDER_LADDER) else None
+
+    def apply_step(self, step: int):
+        """Configurar el converter con un escalón"""
+        settings = RENDER_LADDER[step]
+        self.converter.render_settings = {
+            "zoom": settings["zoom"],
+            "format": settings["format"],
+            "jpeg_quality": settings["jpeg_quality"]
+        }
+        self.converter.output_profile = get_output_profile(self.quality, dpi=settings["image_dpi"])
+
+    def choose_step(self, files: List[str], target_bytes: int, work_dir: str) -> Tuple[int, Optional[int]]:
+        """Primer escalón cuyo tamaño estimado cabe en el objetivo; devuelve (escalón, estimación)"""
+        page_counts = [self.converter.count_pages(path) for path in files]
+        total_pages = sum(page_counts)
+        samples = self._build_samples(files, page_counts, work_dir)
+        if not samples or total_pages == 0:
+            return 0, None
+
+        # Las muestras no cuentan para el progreso ni para las métricas del trabajo
+        page_callback, metrics = self.converter.page_callback, self.converter.metrics
+        self.converter.page_callback, self.converter.metrics = None, None
+        try:
+            estimate = None
+            for step in range(len(RENDER_LADDER)):
+                estimate = self._estimate_bytes(samples, total_pages, step, work_dir)
+                if estimate is None:
+                    continue
+                print(f"📏 Estimación con {self.describe_step(step)}: {estimate / (1024 * 1024):.1f} MB")
+                if estimate <= target_bytes * self.SAFETY_MARGIN:
+                    return step, estimate
+            return len(RENDER_LADDER) - 1, estimate
+        finally:
+            self.converter.page_callback, self.converter.metrics = page_callback, metrics
+
+    def _build_samples(self, files: List[str], page_counts: List[int], work_dir: str) -> List[Tuple[str, int]]:
+        """Extraer páginas de muestra espaciadas uniformemente; devuelve (archivo, páginas)"""
+        total_pages = sum(page_counts)
+        count = min(self.SAMPLE_PAGES, total_pages)
+        if count == 0:
+            return []
+
+        # Índices globales de página repartidos por todo el lote
+        wanted = sorted({int((i + 0.5) * total_pages / count) for i in range(count)})
+        samples = []
+        offset = 0
+        sample_dir = os.path.join(work_dir, "samples")
+        os.makedirs(sample_dir, exist_ok=True)
+
+        for path, pages in zip(files, page_counts):
+            local = [index - offset for index in wanted if offset <= index < offset + pages]
+            offset += pages
+            if not local:
+                continue
+
+            is_pdf = path.lower().endswith('.pdf')
+            if not is_pdf and pages == 1:
+                # Imagen de una página: la muestra es el propio archivo
+                samples.append((path, 1))
+                continue
+
+            # PDF o imagen multipágina: solo las páginas/fotogramas elegidos
+            base_name, ext = os.path.splitext(os.path.basename(path))
+            for page_index in local:
+                sample_path = os.path.join(sample_dir, f"{base_name}_p{page_index + 1}{ext if not is_pdf else '.pdf'}")
+                try:
+                    if is_pdf:
+                        self._extract_page(path, page_index, sample_path)
+                    else:
+                        self._extract_frame(path, page_index, sample_path)
+                    samples.append((sample_path, 1))
+                except Exception as e:
+                    print(f"No se pudo extraer la página de muestra {page_index + 1} de {path}: {e}")
+
+        return samples
+
+    @staticmethod
+    def _extract_page(pdf_path: str, page_index: int, output_path: str):
+        """Copiar una página a un PDF propio (sin rasterizar)"""
+        if PYMUPDF_AVAILABLE:
+            with fitz.open(pdf_path) as source, fitz.open() as sample:
+                sample.insert_pdf(source, from_page=page_index, to_page=page_index)
+                sample.save(output_path, garbage=3, deflate=True)
+            return
+
+        with open(pdf_path, 'rb') as input_file:
+            writer = PyPDF2.PdfWriter()
+            writer.add_page(PyPDF2.PdfReader(input_file).pages[page_index])
+            with open(output_path, 'wb') as output_file:
+                writer.write(output_file)
+
+    @staticmethod
+    def _extract_frame(image_path: str, frame_index: int, output_path: str):
+        """Guardar un fotograma como imagen propia, con la compresión original si el formato la admite"""
+        with Image.open(image_path) as image:
+            image.seek(frame_index)
+            options = {}
+            compression = image.info.get("compression")
+            if compression and output_path.lower().endswith(('.tif', '.tiff')):
+                # Las compresiones de fax (group3/group4) solo admiten imágenes de 1 bit
+                if compression in ("group3", "group4") and image.mode != "1":
+                    compression = "tiff_lzw"
+                options["compression"] = compression
+            image.save(output_path, **options)
+
+    def _estimate_bytes(self, samples: List[Tuple[str, int]], total_pages: int, step: int,
+                        work_dir: str) -> Optional[int]:
+        """Convertir las muestras con un escalón y extrapolar al lote completo"""
+        step_dir = os.path.join(work_dir, f"step_{step}")
+        os.makedirs(step_dir, exist_ok=True)
+        self.apply_step(step)
+
+        sampled_bytes = 0
+        sampled_pages = 0
+        for path, pages in samples:
+            output_path = self.convert_file(path, step_dir)
+            if output_path and os.path.exists(output_path):
+                sampled_bytes += os.path.getsize(output_path)
+                sampled_pages += pages
+
+        if sampled_pages == 0:
+            return None
+        return int(sampled_bytes / sampled_pages * total_pages)
@@ -0,0 +1,115 @@
+"""
+Model: Thumbnail Store
+Miniaturas en disco por hash de contenido, generadas en segundo plano
+"""
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from ..utils.app_paths import get_data_dir
+from .metadata_index import get_metadata_index
+from .preview_renderer import get_render_pool, render_to_file, MAX_RENDER_WORKERS
+
+# Caja por defecto de las miniaturas de la lista (ancho, alto) en píxeles
+THUMBNAIL_SIZE = (42, 56)
+
+
+class ThumbnailStore:
+    """Caché persistente de miniaturas PNG
+
+    La clave es el hash de contenido (del índice de metadatos) y el tamaño, así que
+    un archivo movido o copiado reutiliza su miniatura y uno modificado genera otra.
+    Las peticiones devuelven un Future con la ruta del PNG (None si no hay miniatura).
+    Cada petición debe liberarse con release() si deja de interesar: cuando nadie
+    espera una miniatura, su trabajo se cancela o se abandona antes de renderizar.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir or get_data_dir("thumbnails")
+        # Hilos coordinadores: hash + consulta en disco; el render va al pool de procesos
+        self._executor = ThreadPoolExecutor(max_workers=MAX_RENDER_WORKERS)
+        self._in_flight: Dict[Tuple[str, Tuple[int, int]], Future] = {}
+        self._wanted: Dict[Tuple[str, Tuple[int, int]], int] = {}  # clave -> peticiones vivas
+        self._lock = threading.Lock()
+
+    def cache_path(self, content_hash: str, size: Tuple[int, int]) -> str:
+        """Ruta del PNG para un hash y tamaño"""
+        return os.path.join(self.cache_dir, f"{content_hash}_{size[0]}x{size[1]}.png")
+
+    def request(self, path: str, size: Tuple[int, int] = THUMBNAIL_SIZE) -> Future:
+        """Pedir la miniatura de un archivo (las peticiones repetidas comparten Future)"""
+        key = (path, size)
+        with self._lock:
+            self._wanted[key] = self._wanted.get(key, 0) + 1
+            future = self._in_flight.get(key)
+            if future is not None:
+                return future
+            future = self._executor.submit(self._resolve, path, size)
+            self._in_flight[key] = future
+        # Fuera del candado: si ya terminó, el callback se ejecuta aquí mismo
+        future.add_done_callback(lambda done: self._forget(key, done))
+        return future
+
+    def release(self, path: str, size: Tuple[int, int] = THUMBNAIL_SIZE):
+        """Retirar una petición; sin peticiones vivas, el trabajo pendiente se cancela"""
+        key = (path, size)
+        with self._lock:
+            count = self._wanted.get(key, 0) - 1
+            if count > 0:
+                self._wanted[key] = count
+                return
+            self._wanted.pop(key, None)
+            # Una petición nueva de la misma clave creará otro trabajo
+            future = self._in_flight.pop(key, None)
+        if future is not None:
+            # Si aún está en cola no llega a ejecutarse; si ya empezó, _resolve lo abandona
+            future.cancel()
+
+    def _abandoned(self, key: Tuple[str, Tuple[int, int]]) -> bool:
+        """Si ya nadie espera la clave (comprobado y retirado a la vez, bajo el candado)"""
+        with self._lock:
+            if key in self._wanted:
+                return False
+            self._in_flight.pop(key, None)
+            return True
+
+    def _forget(self, key: Tuple[str, Tuple[int, int]], future: Future):
+        with self._lock:
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    def _resolve(self, path: str, size: Tuple[int, int]) -> Optional[str]:
+        """Devolver el PNG en caché o renderizarlo en el pool de procesos"""
+        key = (path, size)
+        if self._abandoned(key):
+            return None
+        # Si el hilo del índice ya está leyendo el archivo se espera su hash (no se calcula dos veces)
+        metadata = get_metadata_index().get(path)
+        if not metadata or "hash" not in metadata or metadata.get("error"):
+            return None
+
+        output_path = self.cache_path(metadata["hash"], size)
+        if os.path.exists(output_path):
+            return output_path
+        if self._abandoned(key):
+            return None
+
+        try:
+            return get_render_pool().submit(render_to_file, path, size, output_path).result()
+        except Exception as e:
+            print(f"No se pudo generar la miniatura de {path}: {e}")
+            return None
+
+
+_shared_store: Optional[ThumbnailStore] = None
+_shared_lock = threading.Lock()
+
+
+def get_thumbnail_store() -> ThumbnailStore:
+    """Almacén de miniaturas compartido por toda la aplicación"""
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None:
+            _shared_store = ThumbnailStore()
+        return _shared_store
@@ -0,0 +1,37 @@
+"""
+Utilities: App Config
+Lectura de app_config.json (opciones de conversión de la aplicación)
+"""
+import os
+import json
+from typing import Any, Dict, Optional
+
+APP_CONFIG_FILENAME = "app_config.json"
+
+# Raíz del proyecto (junto a main.py), usada si el archivo no está en el directorio actual
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def load_app_config() -> Dict[str, Any]:
+    """Cargar app_config.json; devuelve {} si no existe o no es válido"""
+    for directory in (os.getcwd(), PROJECT_ROOT):
+        path = os.path.join(directory, APP_CONFIG_FILENAME)
+        if not os.path.exists(path):
+            continue
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Error cargando {path}: {e}")
+            return {}
+    return {}
+
+
+def get_conversion_option(name: str, default: Optional[Any] = None) -> Any:
+    """Obtener una entrada de "conversion_options" de app_config.json"""
+    return load_app_config().get("conversion_options", {}).get(name, default)
+
+
+def get_preview_option(name: str, default: Optional[Any] = None) -> Any:
+    """Obtener una entrada de "preview_options" de app_config.json"""
+    return load_app_config().get("preview_options", {}).get(name, default)
@@ -0,0 +1,23 @@
+"""
+Utilities: App Paths
+Ubicaciones de datos persistentes de la aplicación
+"""
+import os
+from typing import Optional
+
+APP_DATA_DIRNAME = ".pdf_image_converter"
+
+
+def get_data_dir(subdir: Optional[str] = None) -> str:
+    """Obtener (y crear si no existe) el directorio de datos de la aplicación"""
+    base_dir = os.environ.get("PDF_CONVERTER_DATA_DIR") or os.path.join(
+        os.path.expanduser("~"), APP_DATA_DIRNAME
+    )
+    path = os.path.join(base_dir, subdir) if subdir else base_dir
+
+    try:
+        os.makedirs(path, exist_ok=True)
+    except OSError as e:
+        print(f"No se pudo crear el directorio de datos {path}: {e}")
+
+    return path
@@ -0,0 +1,98 @@
+"""
+Utilities: File Passthrough
+Copias de archivos hechas por el kernel cuando la salida es igual a la entrada
+"""
+import os
+import errno
+import shutil
+from typing import List
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+# ioctl FICLONE de Linux (_IOW(0x94, 9, int)): clon copy-on-write en Btrfs, XFS, etc.
+FICLONE = 0x40049409
+
+# Errores que indican "este método no está disponible aquí": probar el siguiente
+_UNSUPPORTED_ERRNOS = {
+    errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP,
+    errno.ENOTSUP, errno.EBADF, errno.EPERM, errno.ENOTTY
+}
+
+# Tamaño máximo por llamada al kernel
+_CHUNK_SIZE = 64 * 1024 * 1024
+
+
+def _reflink(source_fd: int, destination_fd: int, offset: int, size: int) -> int:
+    """Clonar el archivo completo (solo desde el inicio)"""
+    if not FCNTL_AVAILABLE or offset != 0:
+        raise OSError(errno.ENOSYS, "reflink no disponible")
+    fcntl.ioctl(destination_fd, FICLONE, source_fd)
+    return size
+
+
+def _copy_file_range(source_fd: int, destination_fd: int, offset: int, size: int) -> int:
+    """Copiar con os.copy_file_range (Linux 4.5+, Python 3.8+)"""
+    if not hasattr(os, "copy_file_range"):
+        raise OSError(errno.ENOSYS, "copy_file_range no disponible")
+    copied = offset
+    while copied < size:
+        sent = os.copy_file_range(source_fd, destination_fd, min(_CHUNK_SIZE, size - copied),
+                                  copied, copied)
+        if sent == 0:
+            break
+        copied += sent
+    return copied
+
+
+def _sendfile(source_fd: int, destination_fd: int, offset: int, size: int) -> int:
+    """Copiar con os.sendfile (archivo a archivo en Linux)"""
+    if not hasattr(os, "sendfile"):
+        raise OSError(errno.ENOSYS, "sendfile no disponible")
+    os.lseek(destination_fd, offset, os.SEEK_SET)
+    copied = offset
+    while copied < size:
+        sent = os.sendfile(destination_fd, source_fd, copied, min(_CHUNK_SIZE, size - copied))
+        if sent == 0:
+            break
+        copied += sent
+    return copied
+
+
+_KERNEL_METHODS: List[tuple] = [
+    ("reflink", _reflink),
+    ("copy_file_range", _copy_file_range),
+    ("sendfile", _sendfile),
+]
+
+
+def copy_file(source: str, destination: str) -> str:
+    """Copiar un archivo sin pasar los datos por Python; devuelve el método usado
+
+    Se prueba reflink (copy-on-write), copy_file_range y sendfile; si ninguno está
+    disponible se usa una copia por bloques. Solo se copian los datos, no los permisos.
+    """
+    with open(source, 'rb') as source_file, open(destination, 'wb') as destination_file:
+        source_fd = source_file.fileno()
+        destination_fd = destination_file.fileno()
+        size = os.fstat(source_fd).st_size
+        copied = 0
+
+        for name, method in _KERNEL_METHODS:
+            try:
+                copied = method(source_fd, destination_fd, copied, size)
+            except OSError as e:
+                if e.errno not in _UNSUPPORTED_ERRNOS:
+                    raise
+                continue
+            if copied >= size:
+                return name
+
+        # Sin soporte del kernel: continuar desde donde se quedó el último método
+        source_file.seek(copied)
+        destination_file.seek(copied)
+        shutil.copyfileobj(source_file, destination_file, 1024 * 1024)
+        return "userspace"
@@ -0,0 +1,129 @@
+"""
+Utilities: Image Decode
+Decodificación de imágenes a la resolución que necesita la salida
+"""
+import math
+from typing import Dict, Iterator, Optional, Tuple, Any
+
+from PIL import Image, ImageSequence
+
+# Tamaños de página en puntos (1/72 de pulgada)
+PAGE_SIZES: Dict[str, Tuple[float, float]] = {
+    "letter": (612.0, 792.0),
+    "a4": (595.0, 842.0)
+}
+
+# DPI por calidad (ver "image_quality" en app_config.json)
+QUALITY_DPI: Dict[str, int] = {
+    "low": 150,
+    "medium": 200,
+    "high": 300
+}
+
+# Resolución usada históricamente al convertir imágenes a PDF
+DEFAULT_PDF_RESOLUTION = 100.0
+
+
+def get_output_profile(quality: str = "high", page: str = "letter", dpi: Optional[int] = None) -> Dict[str, Any]:
+    """Perfil de salida: página destino y DPI según la calidad configurada (o DPI explícito)"""
+    return {
+        "page": page,
+        "page_size": PAGE_SIZES.get(page, PAGE_SIZES["letter"]),
+        "dpi": dpi or QUALITY_DPI.get(quality, QUALITY_DPI["high"])
+    }
+
+
+def fit_size_for_profile(image_size: Tuple[int, int], profile: Optional[Dict[str, Any]]) -> Tuple[int, int]:
+    """Tamaño en píxeles necesario para llenar la página del perfil (nunca mayor que el original)"""
+    width, height = image_size
+    if not profile or width <= 0 or height <= 0:
+        return image_size
+
+    page_width, page_height = profile["page_size"]
+    # Orientar la página como la imagen
+    if (width > height) != (page_width > page_height):
+        page_width, page_height = page_height, page_width
+
+    max_width = page_width / 72.0 * profile["dpi"]
+    max_height = page_height / 72.0 * profile["dpi"]
+    scale = min(max_width / width, max_height / height)
+
+    if scale >= 1.0:
+        return image_size
+    return max(1, math.ceil(width * scale)), max(1, math.ceil(height * scale))
+
+
+def open_image_for_profile(image_path: str, profile: Optional[Dict[str, Any]]) -> Image.Image:
+    """Abrir una imagen decodificando solo la resolución que necesita el perfil
+
+    Para JPEG se usa el modo draft (escalado en el decodificador, 1/2 a 1/8) y para
+    el resto Image.reduce antes del remuestreo final; la imagen completa nunca se
+    decodifica cuando la salida es más pequeña.
+    """
+    return reduce_image_for_profile(Image.open(image_path), profile)
+
+
+def reduce_image_for_profile(image: Image.Image, profile: Optional[Dict[str, Any]]) -> Image.Image:
+    """Reducir en el sitio una imagen abierta (aún sin cargar) al tamaño del perfil"""
+    if not profile:
+        return image
+
+    target_size = fit_size_for_profile(image.size, profile)
+    if target_size != image.size:
+        # JPEG: escalar en el decodificador hasta el tamaño destino (no-op en otros formatos)
+        image.draft(None, target_size)
+        # thumbnail() reduce con Image.reduce antes del remuestreo final
+        image.thumbnail(target_size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+    return image
+
+
+def count_frames(image_path: str) -> int:
+    """Número de fotogramas/páginas de una imagen (TIFF multipágina, GIF animado)"""
+    with Image.open(image_path) as image:
+        return getattr(image, "n_frames", 1)
+
+
+def is_multiframe(image: Image.Image) -> bool:
+    """Verificar si una imagen abierta tiene más de un fotograma"""
+    return getattr(image, "n_frames", 1) > 1
+
+
+def iter_frames(image: Image.Image, profile: Optional[Dict[str, Any]] = None) -> Iterator[Image.Image]:
+    """Recorrer los fotogramas de uno en uno, reducidos al perfil si corresponde
+
+    Solo el fotograma actual está decodificado; el objeto devuelto puede reutilizarse
+    en la siguiente iteración, así que debe procesarse antes de avanzar.
+    """
+    for frame in ImageSequence.Iterator(image):
+        target_size = fit_size_for_profile(frame.size, profile)
+        if target_size == frame.size:
+            yield frame
+            continue
+
+        # reduce()/LANCZOS no admiten modos paletizados ni de 1 bit
+        if frame.mode == "1":
+            frame = frame.convert("L")
+        elif frame.mode == "P":
+            frame = frame.convert("RGBA" if "transparency" in frame.info else "RGB")
+
+        factor = min(frame.width // target_size[0], frame.height // target_size[1])
+        reduced = frame.reduce(factor) if factor >= 2 else frame
+        yield reduced.resize(target_size, Image.Resampling.LANCZOS)
+
+
+def pdf_resolution_for(image: Image.Image, profile: Optional[Dict[str, Any]]) -> float:
+    """Resolución para guardar una imagen como página PDF
+
+    Con perfil, las imágenes que a la resolución histórica excederían la página destino
+    se ajustan a ella; el resto conserva la resolución histórica.
+    """
+    if not profile:
+        return DEFAULT_PDF_RESOLUTION
+
+    page_width, page_height = profile["page_size"]
+    width, height = image.size
+    if (width > height) != (page_width > page_height):
+        page_width, page_height = page_height, page_width
+
+    fit_resolution = max(width / (page_width / 72.0), height / (page_height / 72.0))
+    return max(DEFAULT_PDF_RESOLUTION, fit_resolution)
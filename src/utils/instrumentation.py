@@ -0,0 +1,163 @@
+"""
+Utilities: Pipeline Instrumentation
+Tiempos por etapa (reloj y CPU), bytes y páginas por archivo de cada trabajo
+"""
+import os
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from .app_paths import get_data_dir
+
+METRICS_SCHEMA_VERSION = 1
+
+
+class JobMetrics:
+    """Métricas de un trabajo de conversión, agregadas por etapa y por archivo"""
+
+    def __init__(self, job_type: str, params: Optional[Dict[str, Any]] = None):
+        self.job_type = job_type
+        self.params = params or {}
+        self.started_at = datetime.now()
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.files: List[Dict[str, Any]] = []
+        self.outputs: List[Dict[str, Any]] = []
+        self.optimizations: List[Dict[str, Any]] = []
+
+        self._current_file: Optional[Dict[str, Any]] = None
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.thread_time()
+        self._wall_total: Optional[float] = None
+        self._cpu_total: Optional[float] = None
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Medir una etapa del pipeline (tiempo de reloj y de CPU del hilo)"""
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.thread_time() - cpu_start
+            self._add_stage(self.stages, name, wall, cpu)
+            if self._current_file is not None:
+                self._add_stage(self._current_file["stages"], name, wall, cpu)
+
+    @staticmethod
+    def _add_stage(stages: Dict[str, Dict[str, float]], name: str, wall: float, cpu: float):
+        """Acumular una medición en un diccionario de etapas"""
+        entry = stages.setdefault(name, {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0})
+        entry["calls"] += 1
+        entry["wall_s"] += wall
+        entry["cpu_s"] += cpu
+
+    def begin_file(self, file_path: str):
+        """Iniciar métricas de un archivo de entrada"""
+        self.end_file()
+        try:
+            bytes_in = os.path.getsize(file_path)
+        except OSError:
+            bytes_in = 0
+
+        self._current_file = {
+            "path": file_path,
+            "name": os.path.basename(file_path),
+            "pages": 0,
+            "bytes_in": bytes_in,
+            "bytes_out": 0,
+            "success": False,
+            "stages": {},
+            "_wall_start": time.perf_counter(),
+            "_cpu_start": time.thread_time()
+        }
+
+    def add_pages(self, pages: int = 1):
+        """Sumar páginas procesadas al archivo actual"""
+        if self._current_file is not None:
+            self._current_file["pages"] += pages
+
+    def end_file(self, output_path: Optional[str] = None, success: bool = False):
+        """Cerrar métricas del archivo actual"""
+        current = self._current_file
+        if current is None:
+            return
+
+        if output_path:
+            try:
+                current["bytes_out"] = os.path.getsize(output_path)
+            except OSError:
+                pass
+
+        current["success"] = success
+        current["wall_s"] = time.perf_counter() - current.pop("_wall_start")
+        current["cpu_s"] = time.thread_time() - current.pop("_cpu_start")
+        self.files.append(current)
+        self._current_file = None
+
+    def record_output(self, output_path: str):
+        """Registrar un archivo final del trabajo y su tamaño"""
+        try:
+            size = os.path.getsize(output_path)
+        except OSError:
+            size = 0
+        self.outputs.append({"path": output_path, "bytes": size})
+
+    def record_optimization(self, result: Dict[str, Any]):
+        """Registrar el tamaño antes/después de optimizar un PDF"""
+        self.optimizations.append(dict(result))
+
+    def finish(self):
+        """Cerrar el trabajo"""
+        self.end_file()
+        if self._wall_total is None:
+            self._wall_total = time.perf_counter() - self._wall_start
+            self._cpu_total = time.thread_time() - self._cpu_start
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Resumen del trabajo en formato serializable y estable"""
+        self.finish()
+        return {
+            "schema_version": METRICS_SCHEMA_VERSION,
+            "job_type": self.job_type,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "params": self.params,
+            "wall_s": self._wall_total,
+            "cpu_s": self._cpu_total,
+            "totals": {
+                "files": len(self.files),
+                "pages": sum(f["pages"] for f in self.files),
+                "bytes_in": sum(f["bytes_in"] for f in self.files),
+                "bytes_out": sum(f["bytes_out"] for f in self.files),
+                "bytes_final": sum(o["bytes"] for o in self.outputs)
+            },
+            "stages": self.stages,
+            "files": self.files,
+            "outputs": self.outputs,
+            "optimizations": self.optimizations
+        }
+
+    def write_json(self, directory: Optional[str] = None) -> Optional[str]:
+        """Guardar el resumen JSON del trabajo y devolver su ruta"""
+        directory = directory or get_data_dir("job_metrics")
+        file_name = f"{self.job_type}_{self.started_at.strftime('%Y%m%d_%H%M%S_%f')}.json"
+        path = os.path.join(directory, file_name)
+
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.to_dict(), f, indent=2, sort_keys=True, ensure_ascii=False)
+            return path
+        except Exception as e:
+            print(f"Error guardando métricas del trabajo: {e}")
+            return None
+
+    def format_summary(self, limit: int = 6) -> str:
+        """Texto breve con las etapas más costosas"""
+        ranked = sorted(self.stages.items(), key=lambda item: item[1]["wall_s"], reverse=True)
+        lines = [f"⏱️ {self.job_type}: {self._wall_total or 0:.2f}s"]
+        for name, entry in ranked[:limit]:
+            lines.append(f"   • {name}: {entry['wall_s']:.3f}s reloj / {entry['cpu_s']:.3f}s CPU "
+                         f"({entry['calls']} llamadas)")
+        return "\n".join(lines)
@@ -0,0 +1,118 @@
+"""
+Utilities: Workflow Profiler
+Modo de perfilado opcional con cProfile y tracemalloc
+"""
+import os
+import io
+import cProfile
+import pstats
+import functools
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+PROFILE_ENV_VAR = "PDF_CONVERTER_PROFILE"
+
+
+def is_profiling_enabled() -> bool:
+    """Verificar si el modo de perfilado está activo"""
+    return os.environ.get(PROFILE_ENV_VAR, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def enable_profiling():
+    """Activar el modo de perfilado para el resto del proceso"""
+    os.environ[PROFILE_ENV_VAR] = "1"
+
+
+class WorkflowProfiler:
+    """Envolver un flujo de trabajo en cProfile y tracemalloc y guardar los reportes"""
+
+    # Profundidad de las trazas de asignación
+    TRACEBACK_DEPTH = 25
+
+    def __init__(self, name: str, output_dir: Optional[str] = None, top_n: int = 30):
+        self.name = name
+        self.output_dir = output_dir if output_dir and os.path.isdir(output_dir) else os.getcwd()
+        self.top_n = top_n
+        self.profile = cProfile.Profile()
+        self.stats_path: Optional[str] = None
+        self.allocations_path: Optional[str] = None
+        self._started_tracemalloc = False
+
+    def __enter__(self) -> "WorkflowProfiler":
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.TRACEBACK_DEPTH)
+            self._started_tracemalloc = True
+        tracemalloc.reset_peak()
+        self.profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.profile.disable()
+
+        try:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+
+        try:
+            self._write_reports(snapshot, current, peak)
+        except Exception as e:
+            print(f"Error guardando reportes de perfilado: {e}")
+        return False
+
+    def _write_reports(self, snapshot: tracemalloc.Snapshot, current: int, peak: int):
+        """Escribir archivo pstats y reporte de asignaciones junto a la salida"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        base_path = os.path.join(self.output_dir, f"{self.name}_profile_{timestamp}")
+
+        self.stats_path = f"{base_path}.pstats"
+        self.profile.dump_stats(self.stats_path)
+
+        # Excluir la propia maquinaria de tracemalloc del reporte
+        snapshot = snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+
+        lines = [
+            f"Perfil de memoria: {self.name}",
+            f"Pico de memoria (tracemalloc): {peak / (1024 * 1024):.1f} MB",
+            f"Memoria retenida al final: {current / (1024 * 1024):.1f} MB",
+            "(tracemalloc solo cuenta memoria de Python; los buffers nativos de MuPDF/Pillow no aparecen)",
+            "",
+            f"Top {self.top_n} asignaciones por línea:",
+        ]
+        for index, stat in enumerate(snapshot.statistics("lineno")[:self.top_n], 1):
+            frame = stat.traceback[0]
+            lines.append(f"{index:3d}. {frame.filename}:{frame.lineno} — "
+                         f"{stat.size / 1024:.1f} KB en {stat.count} bloques")
+
+        lines.extend(["", f"Top {self.top_n} funciones por tiempo acumulado:"])
+        stats_output = io.StringIO()
+        stats = pstats.Stats(self.profile, stream=stats_output)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top_n)
+        lines.append(stats_output.getvalue())
+
+        self.allocations_path = f"{base_path}_allocations.txt"
+        with open(self.allocations_path, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines))
+
+        print(f"🔬 Perfil guardado: {self.stats_path}")
+        print(f"🔬 Reporte de memoria: {self.allocations_path} (pico {peak / (1024 * 1024):.1f} MB)")
+
+
+def profiled_workflow(name: str) -> Callable:
+    """Decorador: perfilar un flujo del controlador cuando el modo de perfilado está activo"""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(self, params: Dict[str, Any], *args, **kwargs):
+            if not is_profiling_enabled():
+                return func(self, params, *args, **kwargs)
+
+            with WorkflowProfiler(name, params.get("output_dir")):
+                return func(self, params, *args, **kwargs)
+        return wrapper
+    return decorator
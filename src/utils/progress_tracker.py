@@ -0,0 +1,271 @@
+"""
+Utilities: Progress Tracker
+Progreso por páginas con velocidad (páginas/s, MB/s) y ETA aprendida
+"""
+import os
+import json
+import time
+import threading
+from typing import Dict, List, Optional
+
+from .app_paths import get_data_dir
+
+
+class ThroughputHistory:
+    """Historial persistente de rendimiento por tipo de conversión y backend"""
+
+    # Peso de la última ejecución en la media móvil exponencial
+    SMOOTHING = 0.3
+
+    def __init__(self, history_file: Optional[str] = None):
+        self.history_file = history_file or os.path.join(get_data_dir(), "throughput_history.json")
+        self._lock = threading.Lock()
+        self.rates: Dict[str, Dict[str, float]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, float]]:
+        """Cargar historial desde disco"""
+        try:
+            if os.path.exists(self.history_file):
+                with open(self.history_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"Error cargando historial de rendimiento: {e}")
+        return {}
+
+    def save(self):
+        """Guardar historial a disco"""
+        with self._lock:
+            try:
+                with open(self.history_file, 'w', encoding='utf-8') as f:
+                    json.dump(self.rates, f, indent=2, sort_keys=True)
+            except Exception as e:
+                print(f"Error guardando historial de rendimiento: {e}")
+
+    def get_pages_per_sec(self, key: str) -> Optional[float]:
+        """Obtener velocidad histórica (páginas/s) para una clave"""
+        entry = self.rates.get(key)
+        if entry and entry.get("pages_per_sec", 0) > 0:
+            return entry["pages_per_sec"]
+        return None
+
+    def record(self, key: str, pages: int, seconds: float, bytes_processed: int = 0):
+        """Registrar una medición y actualizar la media móvil"""
+        if pages <= 0 or seconds <= 0:
+            return
+
+        pages_per_sec = pages / seconds
+        bytes_per_sec = bytes_processed / seconds
+
+        with self._lock:
+            entry = self.rates.get(key)
+            if entry:
+                alpha = self.SMOOTHING
+                entry["pages_per_sec"] = alpha * pages_per_sec + (1 - alpha) * entry["pages_per_sec"]
+                entry["bytes_per_sec"] = alpha * bytes_per_sec + (1 - alpha) * entry.get("bytes_per_sec", 0)
+                entry["samples"] = entry.get("samples", 0) + 1
+            else:
+                self.rates[key] = {
+                    "pages_per_sec": pages_per_sec,
+                    "bytes_per_sec": bytes_per_sec,
+                    "samples": 1
+                }
+
+
+class ProgressTracker:
+    """Seguimiento de progreso medido en páginas para un trabajo por lotes"""
+
+    # Segundos mínimos entre actualizaciones de la vista
+    REPORT_INTERVAL = 0.25
+    # Segundos de ejecución tras los cuales se confía plenamente en la velocidad medida
+    LIVE_RATE_WARMUP = 10.0
+
+    def __init__(self, history: Optional[ThroughputHistory] = None):
+        self.history = history
+        # Un elemento por trabajo, en orden: el mismo archivo puede estar dos veces en la lista
+        self.files: List[Dict] = []
+        self.total_pages = 0
+        self.total_bytes = 0
+        self.pages_done = 0
+        self.bytes_done = 0.0
+
+        self._remaining_by_key: Dict[str, int] = {}
+        self._stats_by_key: Dict[str, Dict[str, float]] = {}
+        self._current: Optional[Dict] = None
+        self._start_time: Optional[float] = None
+        self._last_report = 0.0
+
+    def add_file(self, file_path: str, pages: int, size: int, key: str) -> int:
+        """Registrar un archivo en el plan del trabajo (pre-conteo de páginas); devuelve su índice"""
+        pages = max(1, pages)
+        self.files.append({"path": file_path, "pages": pages, "size": size, "key": key})
+        self.total_pages += pages
+        self.total_bytes += size
+        self._remaining_by_key[key] = self._remaining_by_key.get(key, 0) + pages
+        return len(self.files) - 1
+
+    def start(self):
+        """Marcar el inicio del trabajo"""
+        self._start_time = time.perf_counter()
+
+    def begin_file(self, index: int):
+        """Marcar el inicio del trabajo número index (el orden de add_file)"""
+        if self._start_time is None:
+            self.start()
+        if 0 <= index < len(self.files):
+            info = self.files[index]
+        else:
+            info = {"path": None, "pages": 1, "size": 0, "key": "desconocido"}
+            self._remaining_by_key.setdefault(info["key"], 0)
+        self._current = {
+            "index": index,
+            "path": info["path"],
+            "pages": info["pages"],
+            "key": info["key"],
+            "bytes_per_page": info["size"] / info["pages"],
+            "done": 0,
+            "start": time.perf_counter()
+        }
+
+    def advance(self, pages: int = 1):
+        """Avanzar el progreso en un número de páginas del archivo actual"""
+        current = self._current
+        if current is None:
+            return
+
+        # No superar lo previsto en el pre-conteo
+        pages = min(pages, current["pages"] - current["done"])
+        if pages <= 0:
+            return
+
+        current["done"] += pages
+        self.pages_done += pages
+        self.bytes_done += pages * current["bytes_per_page"]
+        self._remaining_by_key[current["key"]] -= pages
+
+    def end_file(self):
+        """Marcar el final del archivo actual y acumular estadísticas"""
+        current = self._current
+        if current is None:
+            return
+
+        # Completar páginas no reportadas (archivo fallido o conteo inexacto)
+        self.advance(current["pages"] - current["done"])
+
+        stats = self._stats_by_key.setdefault(current["key"], {"pages": 0, "seconds": 0.0, "bytes": 0.0})
+        stats["pages"] += current["pages"]
+        stats["seconds"] += time.perf_counter() - current["start"]
+        stats["bytes"] += current["pages"] * current["bytes_per_page"]
+        self._current = None
+
+    def finish(self):
+        """Finalizar el trabajo y guardar el rendimiento en el historial"""
+        if self.history is None:
+            return
+        for key, stats in self._stats_by_key.items():
+            self.history.record(key, int(stats["pages"]), stats["seconds"], int(stats["bytes"]))
+        self.history.save()
+
+    @property
+    def elapsed(self) -> float:
+        """Segundos transcurridos desde el inicio"""
+        if self._start_time is None:
+            return 0.0
+        return time.perf_counter() - self._start_time
+
+    @property
+    def fraction(self) -> float:
+        """Fracción completada (0.0 - 1.0)"""
+        if self.total_pages <= 0:
+            return 0.0
+        return min(1.0, self.pages_done / self.total_pages)
+
+    @property
+    def pages_per_sec(self) -> Optional[float]:
+        """Velocidad medida en páginas por segundo"""
+        elapsed = self.elapsed
+        if elapsed <= 0 or self.pages_done <= 0:
+            return None
+        return self.pages_done / elapsed
+
+    @property
+    def mb_per_sec(self) -> Optional[float]:
+        """Velocidad medida en MB de entrada por segundo"""
+        elapsed = self.elapsed
+        if elapsed <= 0 or self.bytes_done <= 0:
+            return None
+        return self.bytes_done / (1024 * 1024) / elapsed
+
+    def _historical_eta(self) -> Optional[float]:
+        """ETA según el rendimiento histórico de cada tipo de conversión y backend"""
+        if self.history is None:
+            return None
+
+        eta = 0.0
+        for key, remaining in self._remaining_by_key.items():
+            if remaining <= 0:
+                continue
+            rate = self.history.get_pages_per_sec(key)
+            if rate is None:
+                return None
+            eta += remaining / rate
+        return eta
+
+    def eta_seconds(self) -> Optional[float]:
+        """Estimar segundos restantes combinando velocidad medida e histórica"""
+        remaining = self.total_pages - self.pages_done
+        if remaining <= 0:
+            return 0.0
+
+        historical = self._historical_eta()
+        live_rate = self.pages_per_sec
+        live = remaining / live_rate if live_rate else None
+
+        if live is None:
+            return historical
+        if historical is None:
+            return live
+
+        # Al principio domina el histórico; con el tiempo, la medición real
+        weight = min(1.0, self.elapsed / self.LIVE_RATE_WARMUP)
+        return weight * live + (1 - weight) * historical
+
+    def should_report(self) -> bool:
+        """Limitar la frecuencia de actualizaciones de la vista"""
+        now = time.perf_counter()
+        if now - self._last_report >= self.REPORT_INTERVAL:
+            self._last_report = now
+            return True
+        return False
+
+    def format_status(self, prefix: str = "") -> str:
+        """Construir línea de estado con páginas, velocidad y ETA"""
+        parts = []
+        if prefix:
+            parts.append(prefix)
+
+        parts.append(f"pág. {self.pages_done}/{self.total_pages}")
+
+        pages_per_sec = self.pages_per_sec
+        if pages_per_sec is not None:
+            parts.append(f"{pages_per_sec:.1f} pág/s")
+
+        mb_per_sec = self.mb_per_sec
+        if mb_per_sec is not None:
+            parts.append(f"{mb_per_sec:.1f} MB/s")
+
+        eta = self.eta_seconds()
+        parts.append(f"ETA {self._format_duration(eta)}" if eta is not None else "ETA calculando...")
+
+        return " • ".join(parts)
+
+    @staticmethod
+    def _format_duration(seconds: float) -> str:
+        """Formatear duración en texto corto"""
+        seconds = int(round(seconds))
+        if seconds < 60:
+            return f"{seconds}s"
+        minutes, seconds = divmod(seconds, 60)
+        if minutes < 60:
+            return f"{minutes}m {seconds:02d}s"
+        hours, minutes = divmod(minutes, 60)
+        return f"{hours}h {minutes:02d}m"
@@ -4,22 +4,67 @@ Drag and Drop Widget with Preview functionality
 """
 import tkinter as tk
 from tkinter import ttk
-import os
-from typing import List, Callable, Optional
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, List, Callable, Optional
 from PIL import Image, ImageTk
-import fitz  # PyMuPDF para vista previa de PDF
+
+from ..models.file_collection import FileCollection, FileEntry
+from ..models.preview_cache import PreviewCache
+from .preview_window import PreviewWindow
+from ..models.thumbnail_store import get_thumbnail_store
+
+
+class FileRow:
+    """Fila reutilizable de la lista: los widgets se crean una vez y se reasignan al desplazar"""
+    
+    def __init__(self, frame: tk.Frame, window_id: int):
+        self.frame = frame
+        self.window_id = window_id  # Ventana del canvas que contiene la fila
+        self.index: Optional[int] = None  # Archivo mostrado (None = fila libre)
+        self.position_label: Optional[tk.Label] = None
+        self.thumb_label: Optional[tk.Label] = None
+        self.thumb_path: Optional[str] = None  # Archivo cuya miniatura se espera
+        self.thumb_future: Optional[Future] = None
+        self.main_label: Optional[tk.Label] = None
+        self.detail_label: Optional[tk.Label] = None
+
 
 class DragDropListbox(tk.Frame):
+    # Alto fijo de cada fila (píxeles): permite calcular qué filas son visibles
+    ROW_HEIGHT = 84
+    # Filas extra materializadas por encima y por debajo del área visible
+    OVERSCAN = 2
+    # Intervalo mínimo entre procesados de movimiento durante el drag (~60 Hz)
+    MOTION_INTERVAL_MS = 16
+    # Distancia al borde (píxeles) que activa el desplazamiento automático durante el drag
+    AUTOSCROLL_MARGIN = 24
+    # Miniaturas decodificadas que se conservan en memoria (las demás quedan en disco)
+    MAX_THUMBNAILS = 512
+    # Intervalo de sondeo de las miniaturas que se generan en segundo plano
+    THUMB_POLL_MS = 50
+    
     def __init__(self, parent, on_order_change: Optional[Callable] = None, **kwargs):
         super().__init__(parent, **kwargs)
         
         self.on_order_change = on_order_change
-        self.files = []  # Lista de archivos
-        self.previews = {}  # Cache de vistas previas
+        self.files = FileCollection()  # Lista de archivos
+        self.previews = PreviewCache()  # Vistas previas decodificadas (LRU con presupuesto de memoria)
+        self.thumbnails: "OrderedDict[str, ImageTk.PhotoImage]" = OrderedDict()  # ruta -> miniatura (LRU)
+        self.thumb_poll = None  # after() que recoge las miniaturas terminadas
+        
+        # Lista virtualizada: solo existen widgets para las filas visibles
+        self.visible_rows: Dict[int, FileRow] = {}  # índice de archivo -> fila
+        self.free_rows: List[FileRow] = []          # filas ocultas listas para reutilizar
+        self.empty_window = None                    # Estado vacío (ventana del canvas)
         
         # Variables para drag & drop mejorado
         self.drag_data = {"item": None, "start_y": 0, "current_y": 0, "widget": None, "is_dragging": False}
-        self.placeholder_frame = None  # Frame visual para mostrar dónde se va a insertar
+        self.placeholder_frame = None  # Frame visual para mostrar dónde se va a insertar (se crea una vez)
+        self.placeholder_window = None
+        self.placeholder_position: Optional[int] = None  # Posición mostrada (None = oculto)
+        self.pending_motion = None  # after() que procesa el último movimiento del drag
+        self.drag_styles = {}  # Colores originales de los widgets resaltados durante el drag
         self.drag_threshold = 5  # Píxeles mínimos para considerar drag
         
         self.setup_widgets()
@@ -46,94 +91,86 @@ class DragDropListbox(tk.Frame):
         list_frame = ttk.Frame(main_frame)
         list_frame.pack(fill=tk.BOTH, expand=True)
         
-        # Canvas para scroll
+        # Canvas para scroll: las filas son ventanas del canvas en y = índice * ROW_HEIGHT
         self.canvas = tk.Canvas(list_frame, bg="white", highlightthickness=1, 
                                highlightcolor="gray", relief="sunken")
-        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.canvas.yview)
-        
-        self.scrollable_frame = ttk.Frame(self.canvas)
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
-        )
+        self.scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.canvas.yview)
         
-        self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        self.canvas.configure(yscrollcommand=scrollbar.set)
+        # Cualquier cambio de la vista (barra, rueda, redimensionado) actualiza las filas visibles
+        self.canvas.configure(yscrollcommand=self._on_view_change)
+        self.canvas.bind("<Configure>", self._on_canvas_configure)
         
         # Pack canvas y scrollbar
         self.canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-        
-        # Variables para drag & drop
-        self.drag_data = {"item": None, "start_y": 0, "current_y": 0, "widget": None, "is_dragging": False}
-        self.placeholder_frame = None
-        self.drag_threshold = 5
+        self.scrollbar.pack(side="right", fill="y")
         
         # Bind events para mousewheel
         self.canvas.bind_all("<MouseWheel>", self._on_mousewheel)
         
+        self.create_placeholder()
+        self.refresh_display()
+        
     def _on_mousewheel(self, event):
         """Manejar scroll con rueda del mouse"""
         self.canvas.yview_scroll(int(-1*(event.delta/120)), "units")
         
+    def _on_view_change(self, first, last):
+        """La vista del canvas cambió: mover la barra y materializar las filas visibles"""
+        self.scrollbar.set(first, last)
+        self.render_visible_rows()
+        
+    def _on_canvas_configure(self, event):
+        """Ajustar el ancho de las filas al del canvas"""
+        width = self._row_width(event.width)
+        for row in list(self.visible_rows.values()) + self.free_rows:
+            self.canvas.itemconfigure(row.window_id, width=width)
+        if self.empty_window:
+            self.canvas.itemconfigure(self.empty_window, width=width)
+        self.canvas.itemconfigure(self.placeholder_window, width=width)
+        self._update_scrollregion()
+        self.render_visible_rows()
+        
+    def _row_width(self, canvas_width: Optional[int] = None) -> int:
+        """Ancho de una fila dentro del canvas"""
+        canvas_width = canvas_width or self.canvas.winfo_width()
+        return max(1, canvas_width - 8)
+        
+    def _update_scrollregion(self):
+        """Región de scroll según el número de archivos (sin medir widgets)"""
+        height = len(self.files) * self.ROW_HEIGHT
+        self.canvas.configure(scrollregion=(0, 0, self.canvas.winfo_width(), height))
+        
     def add_files(self, file_paths: List[str]):
         """Agregar archivos a la lista"""
-        for file_path in file_paths:
-            if file_path not in [f["path"] for f in self.files]:
-                self.files.append({
-                    "path": file_path,
-                    "name": os.path.basename(file_path),
-                    "type": self._get_file_type(file_path)
-                })
-        
+        self.files.add(file_paths)
         self.refresh_display()
         
-    def _get_file_type(self, file_path: str) -> str:
-        """Determinar tipo de archivo"""
-        ext = os.path.splitext(file_path)[1].lower()
-        if ext == '.pdf':
-            return 'PDF'
-        elif ext in ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.gif']:
-            return 'IMAGE'
-        return 'UNKNOWN'
-        
     def remove_file(self, index: int):
         """Remover archivo por índice"""
-        if 0 <= index < len(self.files):
-            file_path = self.files[index]["path"]
+        entry = self.files.remove_at(index)
+        if entry is not None:
             # Limpiar cache de preview
-            if file_path in self.previews:
-                del self.previews[file_path]
-            
-            self.files.pop(index)
+            self.previews.discard(entry.path)
+            self.thumbnails.pop(entry.path, None)
             self.refresh_display()
             
     def clear_files(self):
         """Limpiar todos los archivos"""
         self.files.clear()
         self.previews.clear()
+        self.thumbnails.clear()
         
         # Remover placeholder si existe
         self.remove_placeholder()
         
-        # Limpiar widgets existentes
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
-            
-        # Resetear scroll region para eliminar espacio vacío
-        self.canvas.configure(scrollregion=(0, 0, 0, 0))
-        self.canvas.yview_moveto(0)  # Mover scroll al inicio
-        
-        # Actualizar display vacío
+        # Mover scroll al inicio y actualizar display vacío
+        self.canvas.yview_moveto(0)
         self.refresh_display()
         
     def create_placeholder(self):
-        """Crear placeholder visual mejorado para mostrar dónde se va a insertar"""
-        if self.placeholder_frame:
-            self.placeholder_frame.destroy()
-            
-        # Crear frame con mejor estilo visual
-        self.placeholder_frame = tk.Frame(self.scrollable_frame, height=4, bg="#FF6B6B")
+        """Crear el placeholder visual (oculto) que marca dónde se va a insertar"""
+        # Frame con mejor estilo visual
+        self.placeholder_frame = tk.Frame(self.canvas, height=4, bg="#FF6B6B")
         
         # Agregar label indicativo
         placeholder_label = tk.Label(self.placeholder_frame, 
@@ -142,126 +179,90 @@ class DragDropListbox(tk.Frame):
                                    font=("Arial", 8, "bold"))
         placeholder_label.pack(pady=1)
         
+        self.placeholder_window = self.canvas.create_window(4, 0, window=self.placeholder_frame, anchor="nw",
+                                                            width=self._row_width(), state="hidden")
+        
     def remove_placeholder(self):
-        """Eliminar placeholder visual"""
-        if self.placeholder_frame:
-            self.placeholder_frame.destroy()
-            self.placeholder_frame = None
+        """Ocultar el placeholder visual"""
+        if self.placeholder_position is not None:
+            self.canvas.itemconfigure(self.placeholder_window, state="hidden")
+            self.placeholder_position = None
             
     def get_drop_position(self, y_position):
-        """Calcular posición donde insertar basado en coordenada Y"""
-        widgets = self.scrollable_frame.winfo_children()
-        
-        # Filtrar solo widgets de archivos válidos (excluir placeholder y otros)
-        file_widgets = []
-        for w in widgets:
-            if (hasattr(w, 'index') and w != self.placeholder_frame and 
-                w != self.drag_data.get("widget")):
-                file_widgets.append(w)
-        
-        if not file_widgets:
-            return 0
-            
-        # Ordenar widgets por su posición Y actual
-        file_widgets.sort(key=lambda w: w.winfo_y())
+        """Calcular posición donde insertar basado en coordenada Y del canvas
         
-        # Calcular posición basada en punto medio de cada widget
-        for i, widget in enumerate(file_widgets):
-            try:
-                widget_top = widget.winfo_y()
-                widget_height = widget.winfo_height()
-                widget_bottom = widget_top + widget_height
-                widget_middle = widget_top + (widget_height // 2)
-                
-                # Si estamos en la mitad superior del primer widget, insertar al inicio
-                if i == 0 and y_position < widget_middle:
-                    return 0
-                
-                # Si estamos entre la mitad de este widget y el siguiente
-                if y_position < widget_middle:
-                    return i
-                    
-                # Si es el último widget y estamos en su mitad inferior
-                if i == len(file_widgets) - 1 and y_position >= widget_middle:
-                    return len(self.files)
-                    
-            except Exception as e:
-                print(f"Error calculando posición: {e}")
-                continue
-                
-        # Por defecto, insertar al final
-        return len(self.files)
+        Las filas tienen alto fijo, así que la posición sale directamente de la
+        coordenada: antes de la fila cuyo punto medio aún no se ha alcanzado.
+        """
+        position = int((y_position + self.ROW_HEIGHT // 2) // self.ROW_HEIGHT)
+        return max(0, min(position, len(self.files)))
         
     def show_placeholder_at_position(self, position):
-        """Mostrar placeholder en una posición específica de manera más estable"""
-        try:
-            self.remove_placeholder()
-            self.create_placeholder()
-            
-            widgets = self.scrollable_frame.winfo_children()
-            
-            # Filtrar widgets de archivos válidos (excluyendo placeholder y widget siendo arrastrado)
-            file_widgets = []
-            for w in widgets:
-                if (w != self.placeholder_frame and 
-                    w != self.drag_data.get("widget") and 
-                    hasattr(w, 'index')):
-                    file_widgets.append(w)
-            
-            # Ordenar por posición Y
-            file_widgets.sort(key=lambda w: w.winfo_y())
-            
-            if position <= 0:
-                # Insertar al principio
-                if file_widgets:
-                    self.placeholder_frame.pack(before=file_widgets[0], fill=tk.X, padx=2, pady=1)
-                else:
-                    self.placeholder_frame.pack(fill=tk.X, padx=2, pady=1)
-            elif position >= len(file_widgets):
-                # Insertar al final
-                self.placeholder_frame.pack(fill=tk.X, padx=2, pady=1)
-            else:
-                # Insertar en posición específica
-                if position < len(file_widgets):
-                    self.placeholder_frame.pack(before=file_widgets[position], fill=tk.X, padx=2, pady=1)
-                else:
-                    self.placeholder_frame.pack(fill=tk.X, padx=2, pady=1)
-                    
-        except Exception as e:
-            print(f"Error mostrando placeholder: {e}")
-            self.remove_placeholder()
+        """Mover el placeholder al borde entre filas de la posición indicada"""
+        if position == self.placeholder_position:
+            return
+        y = max(0, position * self.ROW_HEIGHT - 9)
+        self.canvas.coords(self.placeholder_window, 4, y)
+        self.canvas.itemconfigure(self.placeholder_window, state="normal", width=self._row_width())
+        self.placeholder_frame.lift()  # Por encima de las filas creadas después
+        self.placeholder_position = position
                                       
     def get_file_paths(self) -> List[str]:
         """Obtener lista ordenada de rutas de archivos"""
-        file_paths = [f["path"] for f in self.files]
-        print(f"📋 Orden de archivos solicitado: {[os.path.basename(path) for path in file_paths]}")
-        return file_paths
+        return self.files.paths()
         
     def refresh_display(self):
-        """Actualizar la visualización de la lista con mejor UX"""
+        """Actualizar la visualización tras agregar, quitar o mover archivos
+        
+        No se destruyen widgets: se recalcula la región de scroll y las filas visibles
+        se reasignan a los archivos que ahora ocupan sus posiciones.
+        """
         # Remover placeholder si existe
         self.remove_placeholder()
         
-        # Limpiar widgets existentes
-        for widget in self.scrollable_frame.winfo_children():
-            widget.destroy()
-            
-        # Crear items para cada archivo o mostrar mensaje vacío
         if self.files:
-            for i, file_info in enumerate(self.files):
-                self.create_file_item(i, file_info)
-        else:
+            if self.empty_window:
+                self.canvas.delete(self.empty_window)
+                self.empty_window = None
+        elif not self.empty_window:
             # Mostrar mensaje cuando no hay archivos
             self.create_empty_state()
             
-        # Actualizar scroll region
-        self.scrollable_frame.update_idletasks()
-        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+        self._update_scrollregion()
+        self.render_visible_rows(rebind=True)
+        
+    def render_visible_rows(self, rebind: bool = False):
+        """Materializar solo las filas dentro del área visible, reutilizando las que salen"""
+        count = len(self.files)
+        top = self.canvas.canvasy(0)
+        height = max(self.canvas.winfo_height(), self.ROW_HEIGHT)
+        first = max(0, int(top // self.ROW_HEIGHT) - self.OVERSCAN)
+        last = min(count - 1, int((top + height) // self.ROW_HEIGHT) + self.OVERSCAN)
+        
+        # Liberar filas que quedaron fuera de la vista; la fila que se arrastra queda fijada
+        # hasta soltarla (el desplazamiento automático no debe reasignarla a otro archivo)
+        dragged = self.drag_data["item"]
+        for index in [i for i in self.visible_rows if (i < first or i > last) and i != dragged]:
+            row = self.visible_rows.pop(index)
+            row.index = None
+            self._release_thumbnail(row)
+            self.canvas.itemconfigure(row.window_id, state="hidden")
+            self.free_rows.append(row)
+        
+        for index in range(first, last + 1):
+            row = self.visible_rows.get(index)
+            if row is None:
+                row = self.free_rows.pop() if self.free_rows else self.create_file_row()
+                self.visible_rows[index] = row
+                self.bind_row(row, index)
+            elif rebind:
+                self.bind_row(row, index)
         
     def create_empty_state(self):
         """Crear estado vacío con instrucciones"""
-        empty_frame = tk.Frame(self.scrollable_frame, bg="white", relief="groove", borderwidth=2)
-        empty_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+        empty_frame = tk.Frame(self.canvas, bg="white", relief="groove", borderwidth=2)
+        self.empty_window = self.canvas.create_window(4, 20, window=empty_frame, anchor="nw",
+                                                      width=self._row_width())
         
         # Icono y mensaje principal
         icon_label = tk.Label(empty_frame, text="📁", font=("Arial", 48), bg="white", fg="#DDD")
@@ -277,16 +278,22 @@ class DragDropListbox(tk.Frame):
                                    font=("Arial", 10), bg="white", fg="#888", justify=tk.CENTER)
         instruction_label.pack(pady=(0, 20))
         
-    def create_file_item(self, index: int, file_info: dict):
-        """Crear widget para un archivo individual con mejor UX"""
+    def create_file_row(self) -> FileRow:
+        """Crear los widgets de una fila (una sola vez; después se reutiliza)"""
         # Frame principal del item con mejor estilo
-        item_frame = tk.Frame(self.scrollable_frame, relief="groove", borderwidth=1, bg="#F8F9FA")
-        item_frame.pack(fill=tk.X, padx=4, pady=3)
+        item_frame = tk.Frame(self.canvas, relief="groove", borderwidth=1, bg="#F8F9FA")
+        window_id = self.canvas.create_window(4, 0, window=item_frame, anchor="nw",
+                                              width=self._row_width(), height=self.ROW_HEIGHT - 6)
+        row = FileRow(item_frame, window_id)
         
         # Frame interno con mejor padding
         inner_frame = tk.Frame(item_frame, bg="#F8F9FA", padx=12, pady=8)
         inner_frame.pack(fill=tk.X)
         
+        # Miniatura (icono hasta que la genera el almacén de miniaturas)
+        row.thumb_label = tk.Label(inner_frame, bg="#F8F9FA", font=("Arial", 20))
+        row.thumb_label.pack(side=tk.LEFT, padx=(0, 10))
+        
         # Frame izquierdo para contenido principal
         left_frame = tk.Frame(inner_frame, bg="#F8F9FA")
         left_frame.pack(side=tk.LEFT, fill=tk.X, expand=True)
@@ -296,12 +303,11 @@ class DragDropListbox(tk.Frame):
         header_frame.pack(fill=tk.X, pady=(0, 4))
         
         # Número de posición
-        position_label = tk.Label(header_frame, 
-                                text=f"#{index + 1}", 
-                                bg="#4CAF50", fg="white", 
-                                font=("Arial", 8, "bold"),
-                                padx=6, pady=2)
-        position_label.pack(side=tk.LEFT, padx=(0, 8))
+        row.position_label = tk.Label(header_frame, 
+                                    bg="#4CAF50", fg="white", 
+                                    font=("Arial", 8, "bold"),
+                                    padx=6, pady=2)
+        row.position_label.pack(side=tk.LEFT, padx=(0, 8))
         
         # Indicador de drag
         drag_indicator = tk.Label(header_frame, 
@@ -314,62 +320,129 @@ class DragDropListbox(tk.Frame):
         file_frame = tk.Frame(left_frame, bg="#F8F9FA")
         file_frame.pack(fill=tk.X, pady=(0, 2))
         
-        # Icono según tipo de archivo
-        icon = "📄" if file_info["type"] == "PDF" else "🖼️"
-        
         # Label principal con información del archivo
-        info_text = f"{icon} {file_info['name']}"
-        main_label = tk.Label(file_frame, text=info_text, 
-                            bg="#F8F9FA", fg="#333", 
-                            font=("Arial", 11, "bold"), anchor="w")
-        main_label.pack(fill=tk.X)
+        row.main_label = tk.Label(file_frame, 
+                                bg="#F8F9FA", fg="#333", 
+                                font=("Arial", 11, "bold"), anchor="w")
+        row.main_label.pack(fill=tk.X)
         
         # Información adicional mejorada
-        size_text = self._get_file_size_text(file_info["path"])
-        detail_text = f"📊 {file_info['type']} • 💾 {size_text} • 📁 ...{file_info['path'][-30:]}"
-        detail_label = tk.Label(file_frame, text=detail_text, 
-                              bg="#F8F9FA", fg="#666", 
-                              font=("Arial", 8), anchor="w")
-        detail_label.pack(fill=tk.X)
+        row.detail_label = tk.Label(file_frame, 
+                                  bg="#F8F9FA", fg="#666", 
+                                  font=("Arial", 8), anchor="w")
+        row.detail_label.pack(fill=tk.X)
         
         # Frame derecho para botones mejorados
         right_frame = tk.Frame(inner_frame, bg="#F8F9FA")
         right_frame.pack(side=tk.RIGHT, padx=(10, 0))
         
-        # Botón de vista previa mejorado
+        # Los botones leen el índice actual de la fila al pulsarse
         preview_btn = tk.Button(right_frame, text="👁️ Ver", 
-                              command=lambda: self.show_preview(file_info["path"]),
+                              command=lambda: self.show_preview(self.files[row.index].path),
                               bg="#2196F3", fg="white", font=("Arial", 8, "bold"),
                               relief="flat", padx=8, pady=4, cursor="hand2")
         preview_btn.pack(pady=(0, 4))
         
         # Botón de eliminar mejorado
         remove_btn = tk.Button(right_frame, text="🗑️ Quitar", 
-                             command=lambda: self.remove_file(index),
+                             command=lambda: self.remove_file(row.index),
                              bg="#F44336", fg="white", font=("Arial", 8, "bold"),
                              relief="flat", padx=8, pady=4, cursor="hand2")
         remove_btn.pack()
         
         # Configurar drag & drop
-        self.setup_drag_drop(item_frame, index)
+        self.setup_drag_drop(row)
+        return row
         
-        # Almacenar índice para referencia
-        item_frame.index = index
+    def bind_row(self, row: FileRow, index: int):
+        """Mostrar en una fila el archivo de la posición index"""
+        file_info: FileEntry = self.files[index]
+        row.index = index
         
-    def _get_file_size_text(self, file_path: str) -> str:
-        """Obtener texto de tamaño de archivo"""
-        try:
-            size = os.path.getsize(file_path)
-            if size < 1024:
-                return f"{size} B"
-            elif size < 1024 * 1024:
-                return f"{size / 1024:.1f} KB"
-            else:
-                return f"{size / (1024 * 1024):.1f} MB"
-        except:
+        # Icono según tipo de archivo
+        icon = "📄" if file_info.type == "PDF" else "🖼️"
+        size_text = self._get_file_size_text(file_info.size)
+        
+        row.position_label.configure(text=f"#{index + 1}")
+        row.main_label.configure(text=f"{icon} {file_info.name}")
+        row.detail_label.configure(text=f"📊 {file_info.type} • 💾 {size_text} • 📁 ...{file_info.path[-30:]}")
+        self._show_thumbnail(row, file_info, icon)
+        
+        self.canvas.coords(row.window_id, 4, index * self.ROW_HEIGHT + 3)
+        self.canvas.itemconfigure(row.window_id, state="normal")
+        
+    def _show_thumbnail(self, row: FileRow, file_info: FileEntry, icon: str):
+        """Mostrar la miniatura de la fila o pedirla en segundo plano"""
+        if row.thumb_path == file_info.path and row.thumb_future is not None:
+            return  # La fila ya espera la miniatura de este archivo
+        self._release_thumbnail(row)
+        
+        photo = self.thumbnails.get(file_info.path)
+        if photo is not None:
+            self.thumbnails.move_to_end(file_info.path)
+            row.thumb_label.configure(image=photo, text="")
+            return
+        
+        row.thumb_label.configure(image="", text=icon)
+        row.thumb_path = file_info.path
+        row.thumb_future = get_thumbnail_store().request(file_info.path)
+        if self.thumb_poll is None:
+            self.thumb_poll = self.after(self.THUMB_POLL_MS, self._poll_thumbnails)
+            
+    def _release_thumbnail(self, row: FileRow):
+        """Dejar de esperar la miniatura de una fila (la fila se libera o cambia de archivo)"""
+        if row.thumb_future is not None:
+            get_thumbnail_store().release(row.thumb_path)
+        row.thumb_path = None
+        row.thumb_future = None
+        
+    def _poll_thumbnails(self):
+        """Cargar en el hilo de Tk las miniaturas terminadas y colocarlas en sus filas"""
+        self.thumb_poll = None
+        waiting = False
+        
+        for row in self.visible_rows.values():
+            future = row.thumb_future
+            if future is None:
+                continue
+            if not future.done():
+                waiting = True
+                continue
+            
+            path = row.thumb_path
+            self._release_thumbnail(row)
+            thumb_path = None if future.cancelled() or future.exception() else future.result()
+            if not thumb_path:
+                continue
+            
+            photo = self.thumbnails.get(path)
+            if photo is None:
+                try:
+                    with Image.open(thumb_path) as image:
+                        photo = ImageTk.PhotoImage(image)
+                except Exception as e:
+                    print(f"Error cargando miniatura de {path}: {e}")
+                    continue
+                self.thumbnails[path] = photo
+                if len(self.thumbnails) > self.MAX_THUMBNAILS:
+                    self.thumbnails.popitem(last=False)
+            row.thumb_label.configure(image=photo, text="")
+        
+        if waiting:
+            self.thumb_poll = self.after(self.THUMB_POLL_MS, self._poll_thumbnails)
+        
+    def _get_file_size_text(self, size: Optional[int]) -> str:
+        """Obtener texto de tamaño de archivo (tamaño leído al agregarlo)"""
+        if size is None:
             return "? KB"
+        if size < 1024:
+            return f"{size} B"
+        elif size < 1024 * 1024:
+            return f"{size / 1024:.1f} KB"
+        else:
+            return f"{size / (1024 * 1024):.1f} MB"
             
-    def setup_drag_drop(self, widget, index):
+    def setup_drag_drop(self, row: FileRow):
         """Configurar eventos de drag & drop SOLO en áreas de drag"""
         
         # Función para aplicar drag SOLO a elementos que no son botones
@@ -379,7 +452,8 @@ class DragDropListbox(tk.Frame):
             is_button = isinstance(w, (tk.Button, ttk.Button)) or 'Button' in widget_class
             
             if not is_button:
-                w.bind("<Button-1>", lambda e: self.start_drag(e, index), add=True)
+                # El índice se lee al pulsar: la fila puede mostrar otro archivo tras desplazar
+                w.bind("<Button-1>", lambda e: self.start_drag(e, row.index), add=True)
                 w.bind("<B1-Motion>", lambda e: self.on_drag(e), add=True)
                 w.bind("<ButtonRelease-1>", lambda e: self.end_drag(e), add=True)
                 
@@ -391,40 +465,28 @@ class DragDropListbox(tk.Frame):
                 for child in w.winfo_children():
                     bind_to_draggable_area(child)
         
-        bind_to_draggable_area(widget)
-        widget.index = index
+        bind_to_draggable_area(row.frame)
         
     def start_drag(self, event, index):
         """Iniciar potencial drag - NO activar hasta que se mueva suficiente"""
+        if index is None:
+            return
         self.drag_data["item"] = index
         self.drag_data["start_y"] = event.y_root
         self.drag_data["current_y"] = event.y_root
         self.drag_data["is_dragging"] = False  # NO está arrastrando todavía
         
-        # Obtener el widget específico que corresponde al índice
-        widgets = self.scrollable_frame.winfo_children()
-        file_widgets = [w for w in widgets if hasattr(w, 'index')]
-        
-        # Buscar el widget con el índice correcto
-        target_widget = None
-        for widget in file_widgets:
-            if hasattr(widget, 'index') and widget.index == index:
-                target_widget = widget
-                break
-        
-        if target_widget:
-            self.drag_data["widget"] = target_widget
-        else:
-            # Fallback: usar posición en la lista
-            if index < len(file_widgets):
-                self.drag_data["widget"] = file_widgets[index]
+        # Widget de la fila que muestra ese archivo
+        row = self.visible_rows.get(index)
+        self.drag_data["widget"] = row.frame if row else None
         
         # NO aplicar efectos visuales ni print hasta que realmente se arrastre
                 
     def _apply_drag_style(self, widget):
-        """Aplicar estilo de drag recursivamente"""
+        """Aplicar estilo de drag recursivamente (guardando el color original)"""
         try:
             if hasattr(widget, 'configure'):
+                self.drag_styles[widget] = widget.cget("bg")
                 widget.configure(bg="#E3F2FD")
             
             # Aplicar a hijos
@@ -434,69 +496,68 @@ class DragDropListbox(tk.Frame):
             pass
         
     def on_drag(self, event):
-        """Durante el movimiento - solo activar drag si se mueve lo suficiente"""
-        if self.drag_data["item"] is not None:
-            self.drag_data["current_y"] = event.y_root
-            
-            # Calcular cuánto se ha movido
-            distance_moved = abs(self.drag_data["current_y"] - self.drag_data["start_y"])
-            
-            # Solo activar drag si se mueve más del threshold
-            if not self.drag_data["is_dragging"] and distance_moved > self.drag_threshold:
-                # AHORA SÍ empezar el drag real
-                self.drag_data["is_dragging"] = True
-                print(f"🖱️ DRAG ACTIVADO para archivo #{self.drag_data['item'] + 1}")
-                
-                # Aplicar efectos visuales AHORA
-                if self.drag_data["widget"]:
-                    try:
-                        self.drag_data["widget"].configure(relief="raised", borderwidth=3, bg="#E3F2FD")
-                        for child in self.drag_data["widget"].winfo_children():
-                            self._apply_drag_style(child)
-                    except Exception as e:
-                        print(f"Error aplicando estilo drag: {e}")
+        """Durante el movimiento - solo activar drag si se mueve lo suficiente
+        
+        Los eventos de movimiento solo guardan la posición; el trabajo se hace como
+        mucho una vez por refresco de pantalla (MOTION_INTERVAL_MS).
+        """
+        if self.drag_data["item"] is None:
+            return
+        self.drag_data["current_y"] = event.y_root
+        
+        # Solo activar drag si se mueve más del threshold
+        if not self.drag_data["is_dragging"]:
+            if abs(event.y_root - self.drag_data["start_y"]) <= self.drag_threshold:
+                return
+            self.drag_data["is_dragging"] = True
             
-            # Solo procesar movimiento si realmente está arrastrando
-            if self.drag_data["is_dragging"]:
+            # Aplicar efectos visuales una sola vez, al activarse
+            if self.drag_data["widget"]:
                 try:
-                    # Calcular posición relativa dentro del canvas
-                    canvas_y = event.y - self.canvas.winfo_rooty() + self.canvas.canvasy(0)
-                    
-                    # Determinar nueva posición basada en coordenadas mejoradas
-                    drop_position = self.get_drop_position(canvas_y)
-                    
-                    # Solo mostrar placeholder si es diferente al item actual
-                    current_index = self.drag_data["item"]
-                    
-                    # Ajustar posición si el drop position es después del item actual
-                    adjusted_position = drop_position
-                    if drop_position > current_index:
-                        adjusted_position = drop_position - 1
-                    
-                    # Mostrar placeholder solo si la posición cambió significativamente
-                    if abs(adjusted_position - current_index) > 0:
-                        self.show_placeholder_at_position(drop_position)
-                    else:
-                        self.remove_placeholder()
-                        
+                    self.drag_data["widget"].configure(relief="raised", borderwidth=3, bg="#E3F2FD")
+                    for child in self.drag_data["widget"].winfo_children():
+                        self._apply_drag_style(child)
                 except Exception as e:
-                    print(f"Error durante drag: {e}")
-                    self.remove_placeholder()
+                    print(f"Error aplicando estilo drag: {e}")
+        
+        if self.pending_motion is None:
+            self.pending_motion = self.after(self.MOTION_INTERVAL_MS, self._process_drag_motion)
+            
+    def _process_drag_motion(self):
+        """Procesar la última posición del drag: desplazar en los bordes y mover el placeholder"""
+        self.pending_motion = None
+        if not self.drag_data["is_dragging"]:
+            return
+        
+        try:
+            pointer_y = self.drag_data["current_y"] - self.canvas.winfo_rooty()
+            
+            # Desplazamiento automático cerca de los bordes para listas largas
+            if pointer_y < self.AUTOSCROLL_MARGIN:
+                self.canvas.yview_scroll(-1, "units")
+            elif pointer_y > self.canvas.winfo_height() - self.AUTOSCROLL_MARGIN:
+                self.canvas.yview_scroll(1, "units")
+            
+            drop_position = self.get_drop_position(self.canvas.canvasy(pointer_y))
+            current_index = self.drag_data["item"]
+            
+            # Soltar justo antes o después del propio archivo no lo mueve
+            if drop_position in (current_index, current_index + 1):
+                self.remove_placeholder()
+            else:
+                self.show_placeholder_at_position(drop_position)
+        except Exception as e:
+            print(f"Error durante drag: {e}")
+            self.remove_placeholder()
             
     def end_drag(self, event):
         """Finalizar drag - solo procesar si realmente se arrastraba"""
-        if self.drag_data["item"] is not None:
+        if self.pending_motion is not None:
+            self.after_cancel(self.pending_motion)
+            self.pending_motion = None
+        
+        if self.drag_data["item"] is not None and self.drag_data["is_dragging"]:
             drag_index = self.drag_data["item"]
-            was_dragging = self.drag_data["is_dragging"]
-            
-            # Si NO estaba realmente arrastrando, solo limpiar y salir
-            if not was_dragging:
-                print(f"👆 Simple click en archivo #{drag_index + 1} - sin movimiento")
-                # Reset drag data
-                self.drag_data = {"item": None, "start_y": 0, "current_y": 0, "widget": None, "is_dragging": False}
-                return
-            
-            print(f"🏁 Finalizando drag desde posición #{drag_index + 1}")
             
             # Restaurar estilo visual del item arrastrado
             if self.drag_data["widget"]:
@@ -510,38 +571,21 @@ class DragDropListbox(tk.Frame):
                 except Exception as e:
                     print(f"Error restaurando estilo: {e}")
             
-            # Calcular posición final de manera más precisa
+            # Calcular posición final
             try:
-                canvas_y = event.y - self.canvas.winfo_rooty() + self.canvas.canvasy(0)
+                canvas_y = self.canvas.canvasy(event.y_root - self.canvas.winfo_rooty())
                 drop_position = self.get_drop_position(canvas_y)
-                
-                print(f"📐 Posición calculada para drop: #{drop_position + 1} (desde #{drag_index + 1})")
-                
-                # Remover placeholder
                 self.remove_placeholder()
                 
-                # Determinar la posición final correcta
-                final_position = drop_position
-                
                 # Si estamos moviendo hacia abajo, ajustar
-                if drop_position > drag_index:
-                    final_position = drop_position - 1
+                final_position = drop_position - 1 if drop_position > drag_index else drop_position
                 
                 # Solo mover si la posición realmente cambió
                 if final_position != drag_index and 0 <= final_position < len(self.files):
                     self.move_item(drag_index, final_position)
-                    print(f"🔄 ¡Archivo movido! #{drag_index + 1} → #{final_position + 1}")
-                    
-                    # Crear lista de orden para mostrar
-                    order_list = []
-                    for i, f in enumerate(self.files):
-                        order_list.append(f"#{i+1} {os.path.basename(f['path'])}")
-                    print(f"📋 Nuevo orden: {order_list}")
                     
                     # Mostrar mensaje visual de éxito
                     self._show_move_success(drag_index, final_position)
-                else:
-                    print(f"❌ Sin movimiento: se mantiene en posición #{drag_index + 1}")
                     
             except Exception as e:
                 print(f"Error en end_drag: {e}")
@@ -549,12 +593,14 @@ class DragDropListbox(tk.Frame):
             
         # Reset drag data
         self.drag_data = {"item": None, "start_y": 0, "current_y": 0, "widget": None, "is_dragging": False}
+        # Liberar la fila arrastrada si quedó fuera de la vista
+        self.render_visible_rows()
         
     def _restore_normal_style(self, widget):
-        """Restaurar estilo normal recursivamente"""
+        """Restaurar estilo normal recursivamente (la fila se reutiliza, no se recrea)"""
         try:
             if hasattr(widget, 'configure'):
-                widget.configure(bg="#F8F9FA")
+                widget.configure(bg=self.drag_styles.pop(widget, "#F8F9FA"))
             
             # Restaurar hijos
             for child in widget.winfo_children():
@@ -566,12 +612,12 @@ class DragDropListbox(tk.Frame):
         """Mostrar feedback visual de movimiento exitoso"""
         try:
             # Crear mensaje temporal
-            success_label = tk.Label(self.scrollable_frame, 
+            success_label = tk.Label(self.canvas, 
                                    text=f"✅ Movido: #{from_pos + 1} → #{to_pos + 1}", 
                                    bg="#4CAF50", fg="white", 
                                    font=("Arial", 9, "bold"),
                                    padx=10, pady=5)
-            success_label.pack(pady=5)
+            success_label.place(relx=0.5, y=5, anchor="n")
             
             # Remover después de 2 segundos
             self.after(2000, success_label.destroy)
@@ -580,11 +626,7 @@ class DragDropListbox(tk.Frame):
         
     def move_item(self, from_index: int, to_index: int):
         """Mover item de una posición a otra"""
-        if 0 <= from_index < len(self.files) and 0 <= to_index < len(self.files):
-            # Mover el item
-            item = self.files.pop(from_index)
-            self.files.insert(to_index, item)
-            
+        if self.files.move(from_index, to_index):
             # Refrescar display
             self.refresh_display()
             
@@ -593,96 +635,8 @@ class DragDropListbox(tk.Frame):
                 self.on_order_change(self.get_file_paths())
                 
     def show_preview(self, file_path: str):
-        """Mostrar vista previa del archivo"""
+        """Mostrar vista previa del archivo (el render se hace en segundo plano)"""
         try:
-            # Crear ventana de preview
-            preview_window = tk.Toplevel(self)
-            preview_window.title(f"Vista Previa - {os.path.basename(file_path)}")
-            preview_window.geometry("600x700")
-            preview_window.resizable(True, True)
-            
-            # Frame principal
-            main_frame = ttk.Frame(preview_window, padding="10")
-            main_frame.pack(fill=tk.BOTH, expand=True)
-            
-            # Información del archivo
-            info_text = f"📄 {os.path.basename(file_path)}\n📁 {os.path.dirname(file_path)}"
-            info_label = ttk.Label(main_frame, text=info_text, font=("Arial", 10))
-            info_label.pack(pady=(0, 10))
-            
-            # Canvas para la imagen
-            canvas = tk.Canvas(main_frame, bg="white", relief="sunken", borderwidth=2)
-            canvas.pack(fill=tk.BOTH, expand=True)
-            
-            # Generar y mostrar preview
-            self.generate_preview(file_path, canvas)
-            
+            PreviewWindow(self, file_path, self.previews).show()
         except Exception as e:
             tk.messagebox.showerror("Error", f"No se pudo mostrar la vista previa:\n{str(e)}")
-            
-    def generate_preview(self, file_path: str, canvas: tk.Canvas):
-        """Generar vista previa de archivo"""
-        try:
-            # Verificar si ya está en cache
-            if file_path in self.previews:
-                self.display_preview_image(canvas, self.previews[file_path])
-                return
-                
-            ext = os.path.splitext(file_path)[1].lower()
-            
-            if ext == '.pdf':
-                # Vista previa de PDF (primera página)
-                doc = fitz.open(file_path)
-                page = doc[0]
-                pix = page.get_pixmap(matrix=fitz.Matrix(1.5, 1.5))  # 150% zoom
-                img_data = pix.tobytes("ppm")
-                
-                # Convertir a PIL Image
-                from io import BytesIO
-                img = Image.open(BytesIO(img_data))
-                doc.close()
-                
-            elif ext in ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.gif']:
-                # Vista previa de imagen
-                img = Image.open(file_path)
-                
-            else:
-                # Tipo no soportado
-                canvas.create_text(300, 300, text="Vista previa no disponible", 
-                                 font=("Arial", 14), fill="gray")
-                return
-                
-            # Redimensionar imagen para ajustar al canvas
-            canvas_width = canvas.winfo_width() if canvas.winfo_width() > 1 else 500
-            canvas_height = canvas.winfo_height() if canvas.winfo_height() > 1 else 400
-            
-            img.thumbnail((canvas_width - 20, canvas_height - 20), Image.Resampling.LANCZOS)
-            
-            # Convertir a PhotoImage
-            photo = ImageTk.PhotoImage(img)
-            
-            # Guardar en cache
-            self.previews[file_path] = photo
-            
-            # Mostrar en canvas
-            self.display_preview_image(canvas, photo)
-            
-        except Exception as e:
-            canvas.create_text(300, 300, text=f"Error al generar vista previa:\n{str(e)}", 
-                             font=("Arial", 12), fill="red")
-            
-    def display_preview_image(self, canvas: tk.Canvas, photo: ImageTk.PhotoImage):
-        """Mostrar imagen en canvas"""
-        canvas.delete("all")
-        
-        # Calcular posición centrada
-        canvas_width = canvas.winfo_width() if canvas.winfo_width() > 1 else 500
-        canvas_height = canvas.winfo_height() if canvas.winfo_height() > 1 else 400
-        
-        x = canvas_width // 2
-        y = canvas_height // 2
-        
-        canvas.create_image(x, y, image=photo)
-        
-        # Mantener referencia para evitar garbage collection
-        canvas.image = photo
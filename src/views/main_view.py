@@ -20,6 +20,7 @@ class MainView:
         self.progress_bar = None
         self.status_label = None
         self.merge_option = None
+        self.pending_info = None  # after() que reintenta mostrar metadatos aún no indexados
         
         self.setup_window()
         self.create_widgets()
@@ -276,6 +277,18 @@ class MainView:
             idx = selection[0]
             file_info = self.controller.get_file_info(idx)
             self.show_file_info(file_info)
+            if file_info and file_info.get("pending"):
+                self.schedule_info_retry()
+    
+    def schedule_info_retry(self):
+        """Volver a mostrar la información cuando el índice haya leído el archivo"""
+        if self.pending_info is None:
+            self.pending_info = self.root.after(200, self.retry_file_info)
+    
+    def retry_file_info(self):
+        """Reintento programado de on_file_select"""
+        self.pending_info = None
+        self.on_file_select(None)
     
     def show_file_context_menu(self, event):
         """Mostrar menú contextual en archivo"""
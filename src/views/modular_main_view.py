@@ -15,9 +15,10 @@ class ModularMainView:
         self.controller = None
         
         # Variables para cada módulo
-        self.current_module = "color"  # "color", "pdf", "both"
+        self.current_module = "color"  # "color", "pdf", "both", "split"
         self.files_widgets = {}  # Widget de archivos para cada módulo
         self.output_dirs = {}   # Directorios de salida para cada módulo
+        self.volume_vars = {}   # Límites de volumen (páginas, MB) por módulo
         
         # Variables de progreso
         self.progress_var = None
@@ -80,7 +81,7 @@ class ModularMainView:
         
         # Subtítulo
         subtitle_label = ttk.Label(header_frame, 
-                                  text="3 Módulos Separados • Arrastrar y Soltar • Vista Previa", 
+                                  text="4 Módulos Separados • Arrastrar y Soltar • Vista Previa", 
                                   font=("Arial", 11), foreground="gray")
         subtitle_label.pack()
         
@@ -97,7 +98,8 @@ class ModularMainView:
         modules = [
             ("color", "🎨 Conversión de Colores", "Convertir imágenes y PDFs a blanco y negro o sepia"),
             ("pdf", "📄 Unir PDFs", "Unir múltiples PDFs con orden personalizable"),
-            ("both", "🔄 Conversión + Unión", "Convertir colores Y unir PDFs en un solo proceso")
+            ("both", "🔄 Conversión + Unión", "Convertir colores Y unir PDFs en un solo proceso"),
+            ("split", "✂️ Dividir PDFs", "Extraer rangos de páginas a PDFs separados")
         ]
         
         self.module_buttons = {}
@@ -159,6 +161,8 @@ class ModularMainView:
             self.create_pdf_module()
         elif module_id == "both":
             self.create_both_module()
+        elif module_id == "split":
+            self.create_split_module()
             
     def create_color_module(self):
         """Crear módulo de conversión de colores"""
@@ -309,6 +313,8 @@ class ModularMainView:
         ttk.Checkbutton(options_frame, text="📂 Abrir resultado", 
                        variable=self.pdf_open_output).pack(anchor=tk.W)
         
+        self.create_volume_options(right_frame, "pdf")
+        
         # Información de orden (compacto)
         info_frame = ttk.LabelFrame(right_frame, text="ℹ️ Info", padding="5")
         info_frame.pack(fill=tk.X, pady=(0, 8))
@@ -405,6 +411,18 @@ class ModularMainView:
         ttk.Checkbutton(options_frame, text="📂 Abrir resultado", 
                        variable=self.both_open_output).pack(anchor=tk.W)
         
+        # Tamaño objetivo (p. ej. límite de adjuntos de correo)
+        target_frame = ttk.Frame(options_frame)
+        target_frame.pack(fill=tk.X, pady=(3, 0))
+        
+        self.both_limit_size = tk.BooleanVar()
+        ttk.Checkbutton(target_frame, text="📏 Máx. MB:", 
+                       variable=self.both_limit_size).pack(side=tk.LEFT)
+        self.both_target_size = tk.StringVar(value="20")
+        ttk.Entry(target_frame, textvariable=self.both_target_size, width=5).pack(side=tk.LEFT, padx=(3, 0))
+        
+        self.create_volume_options(right_frame, "both")
+        
         # Botón de procesamiento (MÁS PROMINENTE)
         process_frame = ttk.Frame(right_frame)
         process_frame.pack(fill=tk.X, pady=(8, 0))
@@ -413,10 +431,122 @@ class ModularMainView:
                   command=self.start_both_process,
                   style="Accent.TButton").pack(fill=tk.X, ipady=8)
     
+    def create_split_module(self):
+        """Crear módulo de división de PDFs por rangos de páginas"""
+        # Frame principal del módulo
+        module_frame = ttk.Frame(self.module_content_frame)
+        module_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Título del módulo
+        title_label = ttk.Label(module_frame, 
+                               text="✂️ Módulo: Dividir PDFs", 
+                               font=("Arial", 16, "bold"))
+        title_label.pack(pady=(0, 15))
+        
+        # Frame principal horizontal
+        main_horizontal = ttk.Frame(module_frame)
+        main_horizontal.pack(fill=tk.BOTH, expand=True)
+        
+        # Lado izquierdo - PDFs a dividir
+        left_frame = ttk.LabelFrame(main_horizontal, text="📄 PDFs a Dividir", padding="10")
+        left_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 5))
+        
+        # Botones de archivo
+        file_buttons_frame = ttk.Frame(left_frame)
+        file_buttons_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Button(file_buttons_frame, text="➕ Agregar PDFs", 
+                  command=lambda: self.add_files_to_module("split")).pack(side=tk.LEFT, padx=(0, 10))
+        
+        ttk.Button(file_buttons_frame, text="🗑️ Limpiar", 
+                  command=lambda: self.clear_files_module("split")).pack(side=tk.LEFT)
+        
+        # Widget drag & drop para PDFs
+        self.files_widgets["split"] = DragDropListbox(left_frame, 
+                                                     on_order_change=self.on_files_order_change)
+        self.files_widgets["split"].pack(fill=tk.BOTH, expand=True)
+        
+        # Lado derecho - Configuración
+        right_frame = ttk.LabelFrame(main_horizontal, text="⚙️ Configuración", padding="8")
+        right_frame.pack(side=tk.RIGHT, fill=tk.Y, padx=(5, 0))
+        
+        # Rangos de páginas
+        ranges_frame = ttk.LabelFrame(right_frame, text="Rangos de Páginas", padding="5")
+        ranges_frame.pack(fill=tk.X, pady=(0, 8))
+        
+        self.split_ranges = tk.Text(ranges_frame, width=20, height=5, font=("Arial", 9))
+        self.split_ranges.pack(fill=tk.X)
+        
+        # Directorio de salida
+        output_frame = ttk.LabelFrame(right_frame, text="Directorio de Salida", padding="5")
+        output_frame.pack(fill=tk.X, pady=(0, 8))
+        
+        self.split_output_label = ttk.Label(output_frame, text="No seleccionado", 
+                                           foreground="gray", wraplength=140, font=("Arial", 8))
+        self.split_output_label.pack(pady=(0, 3))
+        
+        ttk.Button(output_frame, text="📂 Directorio", 
+                  command=lambda: self.select_output_dir("split")).pack(fill=tk.X)
+        
+        # Opciones adicionales
+        options_frame = ttk.LabelFrame(right_frame, text="Opciones", padding="5")
+        options_frame.pack(fill=tk.X, pady=(0, 8))
+        
+        self.split_open_output = tk.BooleanVar(value=True)
+        ttk.Checkbutton(options_frame, text="📂 Abrir resultado", 
+                       variable=self.split_open_output).pack(anchor=tk.W)
+        
+        # Información de sintaxis
+        info_frame = ttk.LabelFrame(right_frame, text="ℹ️ Info", padding="5")
+        info_frame.pack(fill=tk.X, pady=(0, 8))
+        
+        info_text = ("Un archivo por línea o ';'\n"
+                     "1-5,8  •  10-  •  cada 50\n"
+                     "Con nombre: cliente_a: 1-40")
+        ttk.Label(info_frame, text=info_text, wraplength=160, 
+                 font=("Arial", 8), foreground="blue").pack()
+        
+        # Botón de procesamiento
+        process_frame = ttk.Frame(right_frame)
+        process_frame.pack(fill=tk.X, pady=(8, 0))
+        
+        ttk.Button(process_frame, text="✂️ DIVIDIR PDFs", 
+                  command=self.start_pdf_split,
+                  style="Accent.TButton").pack(fill=tk.X, ipady=8)
+        
+    def create_volume_options(self, parent, module_id: str):
+        """Crear opciones de división en volúmenes (vacío = sin límite)"""
+        volume_frame = ttk.LabelFrame(parent, text="✂️ Volúmenes", padding="5")
+        volume_frame.pack(fill=tk.X, pady=(0, 8))
+        
+        max_pages = tk.StringVar()
+        max_mb = tk.StringVar()
+        for label, variable in (("Máx. páginas:", max_pages), ("Máx. MB:", max_mb)):
+            row = ttk.Frame(volume_frame)
+            row.pack(fill=tk.X)
+            ttk.Label(row, text=label, font=("Arial", 8)).pack(side=tk.LEFT)
+            ttk.Entry(row, textvariable=variable, width=6).pack(side=tk.RIGHT)
+        
+        self.volume_vars[module_id] = (max_pages, max_mb)
+    
+    def get_volume_params(self, module_id: str) -> Optional[Dict[str, Any]]:
+        """Leer los límites de volumen de un módulo (None si no son válidos)"""
+        max_pages_var, max_mb_var = self.volume_vars[module_id]
+        try:
+            max_pages = int(max_pages_var.get()) if max_pages_var.get().strip() else None
+            max_mb = float(max_mb_var.get().replace(",", ".")) if max_mb_var.get().strip() else None
+        except ValueError:
+            max_pages = max_mb = -1
+        
+        if (max_pages is not None and max_pages <= 0) or (max_mb is not None and max_mb <= 0):
+            messagebox.showwarning("Advertencia", "Los límites de volumen deben ser números positivos")
+            return None
+        return {"volume_max_pages": max_pages, "volume_max_mb": max_mb}
+    
     # Métodos de manejo de archivos
     def add_files_to_module(self, module_id: str):
         """Agregar archivos a un módulo específico"""
-        if module_id == "pdf":
+        if module_id in ("pdf", "split"):
             # Solo PDFs
             file_types = [("PDF files", "*.pdf")]
             title = "Seleccionar PDFs"
@@ -464,6 +594,8 @@ class ModularMainView:
                 self.pdf_output_label.config(text=os.path.basename(directory), foreground="black")
             elif module_id == "both":
                 self.both_output_label.config(text=os.path.basename(directory), foreground="black")
+            elif module_id == "split":
+                self.split_output_label.config(text=os.path.basename(directory), foreground="black")
                 
     def on_files_order_change(self, new_order: List[str]):
         """Callback cuando cambia el orden de archivos"""
@@ -519,6 +651,10 @@ class ModularMainView:
             messagebox.showerror("Error", "Solo se pueden unir archivos PDF")
             return
             
+        volume_params = self.get_volume_params("pdf")
+        if volume_params is None:
+            return
+            
         # Configurar parámetros
         params = {
             "files": files,
@@ -527,6 +663,7 @@ class ModularMainView:
             "delete_originals": self.pdf_delete_originals.get(),
             "open_output": self.pdf_open_output.get()
         }
+        params.update(volume_params)
         
         if self.controller:
             self.controller.start_pdf_merge_module(params)
@@ -546,6 +683,20 @@ class ModularMainView:
             messagebox.showwarning("Advertencia", "Selecciona un directorio de salida")
             return
             
+        target_size_mb = None
+        if self.both_limit_size.get():
+            try:
+                target_size_mb = float(self.both_target_size.get().replace(",", "."))
+            except ValueError:
+                target_size_mb = 0
+            if target_size_mb <= 0:
+                messagebox.showwarning("Advertencia", "Indica un tamaño máximo válido en MB")
+                return
+            
+        volume_params = self.get_volume_params("both")
+        if volume_params is None:
+            return
+            
         # Configurar parámetros
         params = {
             "files": files,
@@ -554,12 +705,45 @@ class ModularMainView:
             "conversion_type": self.both_conversion_type.get(),
             "delete_originals": self.both_delete_originals.get(),
             "delete_intermediates": self.both_delete_intermediates.get(),
-            "open_output": self.both_open_output.get()
+            "open_output": self.both_open_output.get(),
+            "target_size_mb": target_size_mb
         }
+        params.update(volume_params)
         
         if self.controller:
             self.controller.start_both_process_module(params)
     
+    def start_pdf_split(self):
+        """Iniciar división de PDFs"""
+        if not self.files_widgets.get("split"):
+            messagebox.showwarning("Advertencia", "No hay PDFs seleccionados")
+            return
+            
+        files = self.files_widgets["split"].get_file_paths()
+        if not files:
+            messagebox.showwarning("Advertencia", "No hay PDFs seleccionados")
+            return
+            
+        if "split" not in self.output_dirs:
+            messagebox.showwarning("Advertencia", "Selecciona un directorio de salida")
+            return
+            
+        ranges = self.split_ranges.get("1.0", tk.END).strip()
+        if not ranges:
+            messagebox.showwarning("Advertencia", "Indica los rangos de páginas a extraer")
+            return
+            
+        # Configurar parámetros
+        params = {
+            "files": files,
+            "output_dir": self.output_dirs["split"],
+            "ranges": ranges,
+            "open_output": self.split_open_output.get()
+        }
+        
+        if self.controller:
+            self.controller.start_pdf_split_module(params)
+    
     # Métodos de progreso
     def update_progress(self, progress: float, status: str = ""):
         """Actualizar barra de progreso"""
@@ -7,12 +7,16 @@ from tkinter import ttk
 import os
 from typing import List, Optional
 
+from ..models.metadata_index import get_metadata_index
+
 class PDFOrderView:
     def __init__(self, parent: tk.Tk, pdf_files: List[str]):
         self.parent = parent
         self.pdf_files = pdf_files.copy()
         self.result = None
         self.window = None
+        self.metadata_index = get_metadata_index()
+        self.pending_info = None  # after() que reintenta mostrar metadatos aún no indexados
         
         # Widgets
         self.listbox = None
@@ -26,6 +30,9 @@ class PDFOrderView:
     
     def create_window(self):
         """Crear ventana de ordenación"""
+        # Indexar en segundo plano mientras se construye la ventana
+        self.metadata_index.prefetch(self.pdf_files)
+        
         self.window = tk.Toplevel(self.parent)
         self.window.title("📄 Ordenar PDFs")
         self.window.geometry("650x550")
@@ -44,7 +51,7 @@ class PDFOrderView:
         
         # Instrucciones
         instructions = ttk.Label(main_frame, 
-                                text="Selecciona un archivo y usa los botones para cambiar su posición.\n"
+                                text="Selecciona uno o varios archivos (Ctrl/Shift) y usa los botones para moverlos.\n"
                                      "El orden de arriba hacia abajo será el orden en el PDF final.",
                                 font=("Arial", 9), foreground="gray")
         instructions.pack(pady=(0, 15))
@@ -77,7 +84,7 @@ class PDFOrderView:
         listbox_frame = ttk.Frame(list_frame)
         listbox_frame.pack(fill=tk.BOTH, expand=True)
         
-        self.listbox = tk.Listbox(listbox_frame, height=18, font=("Arial", 9))
+        self.listbox = tk.Listbox(listbox_frame, height=18, font=("Arial", 9), selectmode=tk.EXTENDED)
         scrollbar = ttk.Scrollbar(listbox_frame, orient="vertical", command=self.listbox.yview)
         
         self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
@@ -98,7 +105,7 @@ class PDFOrderView:
         ttk.Label(controls_frame, text="🔧 Controles:", font=("Arial", 10, "bold")).pack(pady=(0, 10))
         
         # Botones de movimiento
-        move_frame = ttk.LabelFrame(controls_frame, text="Mover archivo", padding="10")
+        move_frame = ttk.LabelFrame(controls_frame, text="Mover selección", padding="10")
         move_frame.pack(fill=tk.X, pady=(0, 15))
         
         ttk.Button(move_frame, text="⬆️ Subir", command=self.move_up).pack(fill=tk.X, pady=2)
@@ -106,6 +113,18 @@ class PDFOrderView:
         ttk.Button(move_frame, text="⤴️ Al inicio", command=self.move_to_top).pack(fill=tk.X, pady=2)
         ttk.Button(move_frame, text="⤵️ Al final", command=self.move_to_bottom).pack(fill=tk.X, pady=2)
         
+        # Ordenación (páginas y tamaño desde el índice de metadatos)
+        sort_frame = ttk.LabelFrame(controls_frame, text="Ordenar", padding="10")
+        sort_frame.pack(fill=tk.X, pady=(0, 15))
+        
+        sort_buttons = ttk.Frame(sort_frame)
+        sort_buttons.pack(fill=tk.X)
+        for column, (text, key) in enumerate((("🔤 Nombre", "name"), ("📄 Páginas", "pages"),
+                                              ("📏 Tamaño", "size"), ("🔃 Invertir", "reverse"))):
+            ttk.Button(sort_buttons, text=text, width=11,
+                      command=lambda k=key: self.sort_files(k)).grid(row=column // 2, column=column % 2,
+                                                                    padx=1, pady=1, sticky="ew")
+        
         # Información del archivo
         info_frame = ttk.LabelFrame(controls_frame, text="Información", padding="10")
         info_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 15))
@@ -130,65 +149,135 @@ class PDFOrderView:
         count_label.pack(side=tk.LEFT)
     
     def refresh_list(self):
-        """Refrescar lista de archivos"""
+        """Refrescar lista de archivos completa (una sola llamada a Tk)"""
         self.listbox.delete(0, tk.END)
-        for i, pdf_file in enumerate(self.pdf_files):
-            self.listbox.insert(tk.END, f"{i+1}. {os.path.basename(pdf_file)}")
+        self.listbox.insert(tk.END, *self.item_labels(0, len(self.pdf_files) - 1))
+    
+    def item_labels(self, first: int, last: int) -> List[str]:
+        """Textos de las filas first..last (incluidas)"""
+        return [f"{i+1}. {os.path.basename(self.pdf_files[i])}" for i in range(first, last + 1)]
+    
+    def relabel(self, first: int, last: int):
+        """Reescribir solo las filas first..last, las únicas cuyo contenido cambió"""
+        if first > last:
+            return
+        self.listbox.delete(first, last)
+        self.listbox.insert(first, *self.item_labels(first, last))
     
     def get_selected_index(self) -> Optional[int]:
         """Obtener índice seleccionado"""
         selection = self.listbox.curselection()
         return selection[0] if selection else None
     
+    def get_selected_indices(self) -> List[int]:
+        """Obtener índices seleccionados en orden"""
+        return sorted(int(i) for i in self.listbox.curselection())
+    
+    def apply_move(self, new_order: List[str], first: int, last: int, selection: List[int]):
+        """Aplicar un nuevo orden que solo difiere en las filas first..last"""
+        self.pdf_files = new_order
+        self.relabel(first, last)
+        self.select_indices(selection)
+    
+    def select_indices(self, indices: List[int]):
+        """Seleccionar filas y desplazarse hasta la primera"""
+        self.listbox.selection_clear(0, tk.END)
+        for index in indices:
+            self.listbox.selection_set(index)
+        if indices:
+            self.listbox.see(indices[0])
+        self.show_file_info(None)
+    
     def move_up(self):
-        """Mover archivo hacia arriba"""
-        idx = self.get_selected_index()
-        if idx is not None and idx > 0:
-            # Intercambiar archivos
-            self.pdf_files[idx], self.pdf_files[idx - 1] = self.pdf_files[idx - 1], self.pdf_files[idx]
-            
-            # Refrescar lista y mantener selección
-            self.refresh_list()
-            self.listbox.selection_set(idx - 1)
-            self.show_file_info(None)
+        """Mover los archivos seleccionados una posición hacia arriba (en bloque)"""
+        selected = self.get_selected_indices()
+        if not selected or selected[-1] == len(selected) - 1:
+            return  # Ya están todos arriba del todo
+        
+        files = self.pdf_files
+        moved = []
+        blocked = -1  # Las filas seleccionadas pegadas al tope no se mueven
+        for idx in selected:
+            if idx - 1 == blocked:
+                blocked = idx
+                moved.append(idx)
+                continue
+            files[idx - 1], files[idx] = files[idx], files[idx - 1]
+            moved.append(idx - 1)
+        
+        first = min(moved)
+        self.apply_move(files, first, selected[-1], moved)
     
     def move_down(self):
-        """Mover archivo hacia abajo"""
-        idx = self.get_selected_index()
-        if idx is not None and idx < len(self.pdf_files) - 1:
-            # Intercambiar archivos
-            self.pdf_files[idx], self.pdf_files[idx + 1] = self.pdf_files[idx + 1], self.pdf_files[idx]
-            
-            # Refrescar lista y mantener selección
-            self.refresh_list()
-            self.listbox.selection_set(idx + 1)
-            self.show_file_info(None)
+        """Mover los archivos seleccionados una posición hacia abajo (en bloque)"""
+        selected = self.get_selected_indices()
+        count = len(self.pdf_files)
+        if not selected or selected[0] == count - len(selected):
+            return  # Ya están todos abajo del todo
+        
+        files = self.pdf_files
+        moved = []
+        blocked = count
+        for idx in reversed(selected):
+            if idx + 1 == blocked:
+                blocked = idx
+                moved.append(idx)
+                continue
+            files[idx + 1], files[idx] = files[idx], files[idx + 1]
+            moved.append(idx + 1)
+        
+        moved.reverse()
+        self.apply_move(files, selected[0], max(moved), moved)
     
     def move_to_top(self):
-        """Mover archivo al inicio"""
-        idx = self.get_selected_index()
-        if idx is not None and idx > 0:
-            # Mover archivo al inicio
-            file_to_move = self.pdf_files.pop(idx)
-            self.pdf_files.insert(0, file_to_move)
-            
-            # Refrescar lista y mantener selección
-            self.refresh_list()
-            self.listbox.selection_set(0)
-            self.show_file_info(None)
+        """Mover los archivos seleccionados al inicio, conservando su orden"""
+        selected = self.get_selected_indices()
+        if not selected or selected[-1] == len(selected) - 1:
+            return
+        
+        chosen = set(selected)
+        block = [self.pdf_files[i] for i in selected]
+        rest = [f for i, f in enumerate(self.pdf_files[:selected[-1] + 1]) if i not in chosen]
+        new_order = block + rest + self.pdf_files[selected[-1] + 1:]
+        self.apply_move(new_order, 0, selected[-1], list(range(len(block))))
     
     def move_to_bottom(self):
-        """Mover archivo al final"""
-        idx = self.get_selected_index()
-        if idx is not None and idx < len(self.pdf_files) - 1:
-            # Mover archivo al final
-            file_to_move = self.pdf_files.pop(idx)
-            self.pdf_files.append(file_to_move)
-            
-            # Refrescar lista y mantener selección
-            self.refresh_list()
-            self.listbox.selection_set(len(self.pdf_files) - 1)
-            self.show_file_info(None)
+        """Mover los archivos seleccionados al final, conservando su orden"""
+        count = len(self.pdf_files)
+        selected = self.get_selected_indices()
+        if not selected or selected[0] == count - len(selected):
+            return
+        
+        chosen = set(selected)
+        block = [self.pdf_files[i] for i in selected]
+        rest = [self.pdf_files[i] for i in range(selected[0], count) if i not in chosen]
+        new_order = self.pdf_files[:selected[0]] + rest + block
+        self.apply_move(new_order, selected[0], count - 1, list(range(count - len(block), count)))
+    
+    def sort_files(self, key: str):
+        """Ordenar toda la lista por nombre, páginas o tamaño (o invertirla)"""
+        selected = {self.pdf_files[i] for i in self.get_selected_indices()}
+        
+        if key == "reverse":
+            self.pdf_files.reverse()
+        elif key == "name":
+            self.pdf_files.sort(key=lambda path: os.path.basename(path).casefold())
+        elif key == "pages":
+            # Los archivos aún no indexados quedan al final
+            def pages_of(path: str) -> int:
+                metadata = self.metadata_index.get(path, compute=False) or {}
+                pages = metadata.get("pages")
+                return pages if isinstance(pages, int) else float("inf")
+            self.pdf_files.sort(key=pages_of)
+        elif key == "size":
+            # Tamaño de la clave del índice (sin stat por archivo); los no indexados quedan al final
+            def size_of(path: str) -> int:
+                size = self.metadata_index.known_size(path)
+                return size if size is not None else float("inf")
+            self.pdf_files.sort(key=size_of)
+        
+        self.refresh_list()
+        self.select_indices([i for i, path in enumerate(self.pdf_files) if path in selected])
     
     def show_file_info(self, event):
         """Mostrar información del archivo seleccionado"""
@@ -204,20 +293,26 @@ class PDFOrderView:
                 else:
                     size_str = f"{file_size/(1024*1024):.1f} MB"
                 
-                # Información del PDF
-                pages_info = "Desconocido"
-                try:
-                    import PyPDF2
-                    with open(file_path, 'rb') as file:
-                        pdf_reader = PyPDF2.PdfReader(file)
-                        pages_info = str(len(pdf_reader.pages))
-                except:
-                    pass
+                # Información del PDF (sin bloquear: si no está indexado se reintenta)
+                pages_info = "Calculando..."
+                metadata = self.metadata_index.get(file_path, compute=False)
+                if metadata is None:
+                    self.schedule_info_retry()
+                elif "pages" in metadata:
+                    pages_info = str(metadata["pages"])
+                    if metadata.get("page_sizes"):
+                        width, height = metadata["page_sizes"][0]
+                        pages_info += f" ({width:.0f} x {height:.0f} pt)"
+                else:
+                    pages_info = "Desconocido"
                 
                 info_text = f"📄 Archivo:\n{file_name}\n\n"
                 info_text += f"📏 Tamaño:\n{size_str}\n\n"
                 info_text += f"📄 Páginas:\n{pages_info}\n\n"
                 info_text += f"📍 Posición:\n{idx+1} de {len(self.pdf_files)}\n\n"
+                selected_count = len(self.listbox.curselection())
+                if selected_count > 1:
+                    info_text += f"✅ Seleccionados:\n{selected_count} archivos\n\n"
                 info_text += f"📁 Ruta:\n{file_path}"
                 
             except Exception as e:
@@ -228,6 +323,17 @@ class PDFOrderView:
             self.info_text.insert(1.0, info_text)
             self.info_text.config(state=tk.DISABLED)
     
+    def schedule_info_retry(self):
+        """Volver a mostrar la información cuando el índice haya leído el archivo"""
+        if self.pending_info is None:
+            self.pending_info = self.window.after(200, self.retry_file_info)
+    
+    def retry_file_info(self):
+        """Reintento programado de show_file_info"""
+        self.pending_info = None
+        if self.window.winfo_exists():
+            self.show_file_info(None)
+    
     def confirm_order(self):
         """Confirmar orden actual"""
         self.result = self.pdf_files.copy()
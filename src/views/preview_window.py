@@ -0,0 +1,338 @@
+"""
+View: Preview Window
+Ventana de vista previa que renderiza fuera del hilo de Tk
+"""
+import tkinter as tk
+from tkinter import ttk
+import os
+from concurrent.futures import Future
+from typing import Dict, Optional, Tuple
+
+from PIL import ImageTk
+
+from ..models.metadata_index import get_metadata_index
+from ..models.preview_cache import PreviewCache
+from ..models.preview_renderer import get_render_pool, render_preview
+
+
+class PreviewWindow:
+    """Vista previa de un archivo, página a página
+
+    La ventana aparece al instante con un aviso de carga; el render se hace en el
+    pool de procesos y el resultado se recoge con after(). Solo se renderiza la
+    página visible y, en segundo plano, sus vecinas, así que pasar de página suele
+    ser inmediato aunque el documento tenga cientos. Al cerrar la ventana se
+    cancela todo lo pendiente y se ignora cualquier resultado que llegue tarde.
+    """
+
+    # Intervalo de sondeo de los renders en curso
+    POLL_MS = 40
+    # Tamaño del canvas antes de que Tk lo haya dibujado
+    DEFAULT_CANVAS_SIZE = (500, 400)
+    # Margen alrededor de la imagen dentro del canvas
+    MARGIN = 20
+    # Espera tras el último cambio de tamaño antes de volver a renderizar
+    RESIZE_DEBOUNCE_MS = 150
+    # Reintento mientras el índice de metadatos cuenta las páginas
+    PAGE_COUNT_RETRY_MS = 200
+    # Páginas vecinas (hacia delante y hacia atrás) que se renderizan por adelantado
+    PREFETCH_PAGES = 1
+
+    def __init__(self, parent: tk.Misc, file_path: str, cache: PreviewCache):
+        self.parent = parent
+        self.file_path = file_path
+        self.cache = cache
+        self.window = None
+        self.canvas = None
+        self.page_label = None
+        self.nav_buttons = []
+        self.photo = None  # Referencia a la imagen mostrada (evita que la recolecte el GC)
+        self.photo_box: Optional[Tuple[int, int]] = None  # Caja para la que se renderizó
+
+        self.page_index = 0
+        self.page_count: Optional[int] = None  # None hasta que lo indique el índice de metadatos
+        self.jobs: Dict[Tuple, Future] = {}  # clave (ruta, página, caja) -> render en curso
+        self.pending_key: Optional[Tuple] = None  # Render que espera la página visible
+        self.poll_id = None
+        self.resize_id = None  # after() que re-renderiza al terminar de redimensionar
+        self.count_id = None  # after() que reintenta leer el número de páginas
+        self.closed = False
+
+    def show(self):
+        """Abrir la ventana y pedir el render"""
+        self.window = tk.Toplevel(self.parent)
+        self.window.title(f"Vista Previa - {os.path.basename(self.file_path)}")
+        self.window.geometry("600x700")
+        self.window.resizable(True, True)
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+        # También si la ventana se destruye con su ventana padre
+        self.window.bind("<Destroy>", self._on_destroy)
+
+        # Frame principal
+        main_frame = ttk.Frame(self.window, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+
+        # Información del archivo
+        info_text = f"📄 {os.path.basename(self.file_path)}\n📁 {os.path.dirname(self.file_path)}"
+        info_label = ttk.Label(main_frame, text=info_text, font=("Arial", 10))
+        info_label.pack(pady=(0, 10))
+
+        # Navegación entre páginas
+        self.create_navigation(main_frame)
+
+        # Canvas para la imagen
+        self.canvas = tk.Canvas(main_frame, bg="white", relief="sunken", borderwidth=2)
+        self.canvas.pack(fill=tk.BOTH, expand=True)
+        self.canvas.bind("<Configure>", self._on_canvas_configure)
+
+        # Teclado: flechas y Re Pág/Av Pág para pasar página, Inicio/Fin para los extremos
+        for sequence, step in (("<Left>", -1), ("<Prior>", -1), ("<Right>", 1), ("<Next>", 1)):
+            self.window.bind(sequence, lambda e, s=step: self.go_to_page(self.page_index + s))
+        self.window.bind("<Home>", lambda e: self.go_to_page(0))
+        self.window.bind("<End>", lambda e: self.go_to_page(self.last_page()))
+
+        self.update_page_count()
+
+        # Calcular la geometría antes del primer render para usar el tamaño real del canvas
+        self.window.update_idletasks()
+        self.request_render()
+
+    def create_navigation(self, parent):
+        """Crear la barra de navegación entre páginas"""
+        nav_frame = ttk.Frame(parent)
+        nav_frame.pack(fill=tk.X, pady=(0, 8))
+
+        buttons = [
+            ("⏮", lambda: self.go_to_page(0)),
+            ("◀ Anterior", lambda: self.go_to_page(self.page_index - 1)),
+        ]
+        for text, command in buttons:
+            button = ttk.Button(nav_frame, text=text, command=command)
+            button.pack(side=tk.LEFT, padx=(0, 5))
+            self.nav_buttons.append(button)
+
+        self.page_label = ttk.Label(nav_frame, font=("Arial", 10, "bold"))
+        self.page_label.pack(side=tk.LEFT, expand=True)
+
+        buttons = [
+            ("⏭", lambda: self.go_to_page(self.last_page())),
+            ("Siguiente ▶", lambda: self.go_to_page(self.page_index + 1)),
+        ]
+        for text, command in buttons:
+            button = ttk.Button(nav_frame, text=text, command=command)
+            button.pack(side=tk.RIGHT, padx=(5, 0))
+            self.nav_buttons.append(button)
+
+        self.update_navigation()
+
+    def update_page_count(self):
+        """Leer el número de páginas del índice de metadatos sin bloquear la interfaz"""
+        self.count_id = None
+        if self.closed:
+            return
+        metadata = get_metadata_index().get(self.file_path, compute=False)
+        if metadata is None:
+            self.count_id = self.window.after(self.PAGE_COUNT_RETRY_MS, self.update_page_count)
+            return
+
+        self.page_count = max(1, metadata.get("pages") or 1)
+        self.update_navigation()
+        self.prefetch_neighbors()
+
+    def last_page(self) -> int:
+        """Índice de la última página conocida"""
+        return (self.page_count or 1) - 1
+
+    def update_navigation(self):
+        """Actualizar el indicador de página y los botones"""
+        total = self.page_count if self.page_count is not None else "?"
+        self.page_label.configure(text=f"Página {self.page_index + 1} de {total}")
+        state = "normal" if self.page_count and self.page_count > 1 else "disabled"
+        for button in self.nav_buttons:
+            button.configure(state=state)
+
+    def go_to_page(self, page_index: int):
+        """Mostrar otra página (se ignoran las posiciones fuera del documento)"""
+        if self.closed or self.page_count is None:
+            return
+        page_index = max(0, min(page_index, self.last_page()))
+        if page_index == self.page_index:
+            return
+
+        self.page_index = page_index
+        self.update_navigation()
+        self.request_render(keep_current=False)
+
+    def close(self):
+        """Cerrar la ventana cancelando los renders pendientes"""
+        self.closed = True
+        self.cancel_timers()
+        if self.window is not None:
+            self.window.destroy()
+
+    def _on_destroy(self, event):
+        """Cancelar el trabajo pendiente cuando se destruye la ventana"""
+        if event.widget is self.window and not self.closed:
+            self.closed = True
+            self.cancel_timers()
+
+    def cancel_timers(self):
+        """Cancelar renders y after() pendientes"""
+        self.cancel_jobs()
+        for attribute in ("poll_id", "resize_id", "count_id"):
+            after_id = getattr(self, attribute)
+            if after_id is not None and self.window is not None:
+                self.window.after_cancel(after_id)
+            setattr(self, attribute, None)
+
+    def _on_canvas_configure(self, event):
+        """Reagrupar los cambios de tamaño y re-renderizar cuando se detienen"""
+        if self.closed:
+            return
+        if self.resize_id is not None:
+            self.window.after_cancel(self.resize_id)
+        self.resize_id = self.window.after(self.RESIZE_DEBOUNCE_MS, self._on_resize_settled)
+
+    def _on_resize_settled(self):
+        """Ajustar la vista al tamaño final del canvas"""
+        self.resize_id = None
+        if self.closed:
+            return
+        if self.photo is not None and not self.needs_render(self.target_box()):
+            self.display(self.photo, self.photo_box)
+            return
+        self.request_render()
+
+    def needs_render(self, box: Tuple[int, int]) -> bool:
+        """Si la imagen mostrada no corresponde ya a la caja (más de 1 píxel de diferencia)"""
+        width, height = self.photo.width(), self.photo.height()
+        old_width, old_height = self.photo_box
+        # Imagen más pequeña que su caja en ambos ejes: tamaño natural, no crece
+        if width < old_width - 1 and height < old_height - 1:
+            return width > box[0] or height > box[1]
+        scale = min(box[0] / width, box[1] / height)
+        return abs(round(width * scale) - width) > 1 or abs(round(height * scale) - height) > 1
+
+    def canvas_size(self) -> Tuple[int, int]:
+        """Tamaño actual del canvas (el de por defecto si aún no se dibujó)"""
+        width, height = self.canvas.winfo_width(), self.canvas.winfo_height()
+        if width <= 1 or height <= 1:
+            return self.DEFAULT_CANVAS_SIZE
+        return width, height
+
+    def target_box(self) -> Tuple[int, int]:
+        """Caja en píxeles en la que debe caber la imagen"""
+        width, height = self.canvas_size()
+        return max(1, width - self.MARGIN), max(1, height - self.MARGIN)
+
+    def page_key(self, page_index: int) -> Tuple:
+        """Clave de caché de una página al tamaño actual del canvas"""
+        return self.file_path, page_index, self.target_box()
+
+    def request_render(self, keep_current: bool = True):
+        """Mostrar la página actual desde la caché o encargar su render en segundo plano
+
+        keep_current mantiene la imagen anterior mientras llega la nueva (útil al
+        redimensionar); al cambiar de página se muestra el aviso de carga.
+        """
+        key = self.page_key(self.page_index)
+
+        photo = self.cache.get(key)
+        if photo is not None:
+            self.pending_key = None
+            self.display(photo, key[2])
+        else:
+            self.pending_key = key
+            if self.photo is None or not keep_current:
+                self.show_message("⏳ Generando vista previa...", "gray")
+            else:
+                self.display(self.photo, self.photo_box)
+            if not self.submit(key):
+                return
+
+        self.prefetch_neighbors()
+
+    def prefetch_neighbors(self):
+        """Renderizar por adelantado las páginas vecinas y cancelar lo que ya no hace falta"""
+        if self.closed:
+            return
+        wanted = {self.page_key(self.page_index)}
+        if self.page_count is not None:
+            for offset in range(1, self.PREFETCH_PAGES + 1):
+                for page_index in (self.page_index + offset, self.page_index - offset):
+                    if 0 <= page_index < self.page_count:
+                        wanted.add(self.page_key(page_index))
+
+        # Páginas lejanas o a un tamaño antiguo: si aún no empezaron, no se renderizan
+        for key in [k for k in self.jobs if k not in wanted]:
+            self.jobs.pop(key).cancel()
+
+        for key in wanted:
+            if key not in self.cache:
+                self.submit(key)
+
+    def submit(self, key: Tuple) -> bool:
+        """Encargar el render de una clave (si no está ya en curso)"""
+        if key in self.jobs:
+            return True
+        try:
+            self.jobs[key] = get_render_pool().submit(render_preview, key[0], key[2], key[1])
+        except Exception as e:
+            if key == self.pending_key:
+                self.pending_key = None
+                self.show_message(f"Error al generar vista previa:\n{str(e)}", "red")
+            return False
+
+        if self.poll_id is None:
+            self.poll_id = self.window.after(self.POLL_MS, self._poll_render)
+        return True
+
+    def cancel_jobs(self):
+        """Olvidar los renders en curso (los que aún no empezaron no llegan a ejecutarse)"""
+        for future in self.jobs.values():
+            future.cancel()
+        self.jobs.clear()
+        self.pending_key = None
+
+    def _poll_render(self):
+        """Recoger en el hilo de Tk los renders terminados"""
+        self.poll_id = None
+        if self.closed:
+            return
+
+        for key in [k for k, future in self.jobs.items() if future.done()]:
+            future = self.jobs.pop(key)
+            try:
+                image = future.result()
+            except Exception as e:
+                if key == self.pending_key:
+                    self.pending_key = None
+                    self.show_message(f"Error al generar vista previa:\n{str(e)}", "red")
+                continue
+
+            # La PhotoImage solo puede crearse en el hilo de Tk
+            photo = ImageTk.PhotoImage(image)
+            self.cache.put(key, photo)
+            if key == self.pending_key:
+                self.pending_key = None
+                self.display(photo, key[2])
+
+        if self.jobs:
+            self.poll_id = self.window.after(self.POLL_MS, self._poll_render)
+
+    def show_message(self, text: str, color: str):
+        """Mostrar un aviso centrado en el canvas"""
+        width, height = self.canvas_size()
+        self.canvas.delete("all")
+        self.canvas.create_text(width // 2, height // 2, text=text,
+                                font=("Arial", 12), fill=color, justify=tk.CENTER)
+        self.photo = None
+        self.photo_box = None
+
+    def display(self, photo: ImageTk.PhotoImage, box: Tuple[int, int]):
+        """Mostrar imagen centrada en el canvas"""
+        width, height = self.canvas_size()
+        self.canvas.delete("all")
+        self.canvas.create_image(width // 2, height // 2, image=photo)
+        self.photo = photo
+        self.photo_box = box